@@ -1,14 +1,201 @@
 """Backup and recovery for state files."""
 
+import concurrent.futures
+import functools
 import hashlib
+import hmac
+import mmap
+import os
+import re
 import shutil
+import ssl
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # Optional: faster content hash, SHA-256 used otherwise
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Optional: compressed backups
+
+# Read size for hashing/copying (1 MiB keeps syscall count low)
+CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed straight from the page cache via mmap
+MMAP_THRESHOLD = 1 << 20
+
+# mmap'd files up to this size are hashed with one update() call, which
+# releases the GIL for the whole run; larger files go in MMAP_SLICE_SIZE
+# slices (each still well above hashlib's 2 KiB GIL-release threshold)
+MMAP_SINGLE_UPDATE_MAX = 256 << 20
+MMAP_SLICE_SIZE = 4 << 20
+
+# BLAKE3 files at least this large are hashed across all cores
+BLAKE3_PARALLEL_THRESHOLD = 16 * 1024 * 1024
+
+# zstd level for compressed backups (fast, good ratio on JSON)
+ZSTD_LEVEL = 3
+
+# S3 multipart upload tuning (parts are uploaded concurrently)
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+S3_MAX_CONCURRENCY = 10
+S3_MAX_ATTEMPTS = 10
+
+# Background workers for cloud uploads (local backup never waits on S3)
+UPLOAD_WORKERS = 4
+
+# Digests memoized per (path, size, mtime_ns, inode) within the process
+DIGEST_CACHE_SIZE = 64
+
+# Backup name after "<stem>_": timestamp plus .json or .json.zst
+BACKUP_SUFFIX_RE = re.compile(r"\d{4}-\d\d-\d\d_\d\d-\d\d-\d\d\.json(?:\.zst)?")
+
+# Block size used when reading the backup index from the end
+INDEX_READ_BLOCK = 4096
+
+
+def _cpu_has_sha_extensions() -> bool:
+    """Check /proc/cpuinfo for Intel SHA-NI or ARMv8 SHA2 crypto extensions."""
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith(('flags', 'Features')):
+                    flags = line.split(':', 1)[1].split()
+                    return 'sha_ni' in flags or 'sha2' in flags
+    except OSError:
+        pass
+    return False
+
+
+def _select_sha256_backend():
+    """
+    Pick the SHA-256 constructor used for checksums.
+
+    OpenSSL >= 1.1.1 dispatches to SHA-NI / ARMv8 CE on its own, so
+    hashlib is preferred. Older OpenSSL builds fall back to pycryptodome
+    (if installed), which ships its own accelerated implementation.
+
+    Returns:
+        Tuple of (constructor, description)
+    """
+    hw = _cpu_has_sha_extensions()
+
+    if ssl.OPENSSL_VERSION_INFO >= (1, 1, 1):
+        accel = "hardware-accelerated" if hw else "software"
+        return hashlib.sha256, f"hashlib/{ssl.OPENSSL_VERSION} ({accel})"
+
+    try:
+        from Crypto.Hash import SHA256
+        return SHA256.new, "pycryptodome"
+    except ImportError:
+        return hashlib.sha256, f"hashlib/{ssl.OPENSSL_VERSION} (software)"
+
+
+def _preallocate(fd: int, size: int):
+    """Reserve disk extents for a file about to be written (best effort)."""
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return  # e.g. macOS; the write simply allocates as it goes
+
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass  # Filesystem doesn't support it
+
+
+class _HashingWriter:
+    """File-like sink that hashes bytes on their way to the real file."""
+
+    def __init__(self, f, hasher):
+        self._f = f
+        self._hasher = hasher
+
+    def write(self, data) -> int:
+        self._hasher.update(data)
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+
+def _new_hasher(algorithm: str):
+    """Create a hash object for a sidecar algorithm name."""
+    if algorithm == 'blake3':
+        if blake3 is None:
+            raise ValueError("blake3 digest requested but blake3 is not installed")
+        return blake3.blake3()
+    if algorithm == 'sha256':
+        return _sha256()
+    raise ValueError(f"Unknown digest algorithm: {algorithm}")
+
+
+def _file_digest(file_path: Path, algorithm: str) -> bytes:
+    """Calculate the raw digest of a file with the named algorithm."""
+    if algorithm == 'blake3' and blake3 is not None:
+        if os.stat(file_path).st_size >= BLAKE3_PARALLEL_THRESHOLD:
+            # Multi-threaded tree hash straight from a Rust-side mmap
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(str(file_path))
+            return hasher.digest()
+
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            return _mmap_digest(f, _new_hasher(algorithm))
+
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: read/update loop runs in C
+            return hashlib.file_digest(f, lambda: _new_hasher(algorithm)).digest()
+
+        hasher = _new_hasher(algorithm)
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+
+    return hasher.digest()
+
+
+def _mmap_digest(f, hasher) -> bytes:
+    """Hash a large open file via mmap, avoiding read() copies."""
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+
+        with memoryview(mm) as view:
+            if len(view) <= MMAP_SINGLE_UPDATE_MAX:
+                hasher.update(view)
+            else:
+                for offset in range(0, len(view), MMAP_SLICE_SIZE):
+                    hasher.update(view[offset:offset + MMAP_SLICE_SIZE])
+    finally:
+        mm.close()
+
+    return hasher.digest()
+
+
+@functools.lru_cache(maxsize=DIGEST_CACHE_SIZE)
+def _digest_for_version(
+    path: str,
+    algorithm: str,
+    size: int,
+    mtime_ns: int,
+    inode: int
+) -> bytes:
+    """Hash a file; stat fields only serve as the memoization key."""
+    return _file_digest(Path(path), algorithm)
+
+
+_sha256, _sha256_backend = _select_sha256_backend()
+_backend_logged = False
+
 
 class BackupManager:
     """Manages backups of critical state files."""
@@ -18,13 +205,45 @@ class BackupManager:
         backup_dir: str = "backups",
         retention_days: int = 30,
         cloud_enabled: bool = False,
-        s3_bucket: Optional[str] = None
+        s3_bucket: Optional[str] = None,
+        compress: bool = False
     ):
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         self.retention_days = retention_days
         self.cloud_enabled = cloud_enabled
         self.s3_bucket = s3_bucket
+        self.compress = compress
+        self._s3_client = None
+        self._s3_transfer_config = None
+        self._s3_client_lock = threading.Lock()
+        self._upload_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.hash_algorithm = 'blake3' if blake3 is not None else 'sha256'
+
+        if self.compress and zstandard is None:
+            logger.warning("Backup compression requested but zstandard is not installed")
+            self.compress = False
+
+        global _backend_logged
+        if not _backend_logged:
+            if self.hash_algorithm == 'blake3':
+                logger.info("Checksum backend: BLAKE3")
+            else:
+                logger.info(f"Checksum backend: SHA-256 via {_sha256_backend}")
+            _backend_logged = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Wait for pending cloud uploads to finish."""
+        if self._upload_pool is not None:
+            self._upload_pool.shutdown(wait=True)
+            self._upload_pool = None
 
     def backup_state_file(self, state_file_path: str):
         """
@@ -41,23 +260,40 @@ class BackupManager:
         # Generate backup filename
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         backup_filename = f"{state_file.stem}_{timestamp}{state_file.suffix}"
+        if self.compress:
+            backup_filename += '.zst'
         backup_path = self.backup_dir / backup_filename
 
-        # Copy file
-        shutil.copy2(state_file, backup_path)
+        # Copy (or compress) file and generate checksum in a single pass
+        if self.compress:
+            digest = self._compress_with_checksum(state_file, backup_path)
+        else:
+            digest = self._copy_with_checksum(state_file, backup_path)
+        checksum = f"{self.hash_algorithm}:{digest}"
+        checksum_path = self._checksum_path(backup_path)
 
-        # Generate checksum
-        checksum = self._calculate_checksum(backup_path)
-        checksum_path = backup_path.with_suffix('.json.sha256')
+        # Second line lets verify skip rehashing an untouched backup
+        st = os.stat(backup_path)
+        self._write_atomic(checksum_path, (
+            f"{checksum}  {backup_path.name}\n"
+            f"# size={st.st_size} mtime_ns={st.st_mtime_ns} inode={st.st_ino}\n"
+        ).encode('utf-8'))
 
-        with open(checksum_path, 'w') as f:
-            f.write(f"{checksum}  {backup_path.name}\n")
+        # Record in per-stem index so restore can find it without a glob
+        with open(self._index_path(state_file.stem), 'a') as idx:
+            idx.write(f"{timestamp}\t{backup_filename}\t{checksum}\n")
 
         logger.info(f"✓ State backup created: {backup_path.name}")
 
-        # Upload to cloud (if enabled)
+        # Upload to cloud in the background (if enabled)
         if self.cloud_enabled:
-            self._upload_to_cloud(backup_path)
+            if self._upload_pool is None:
+                self._upload_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=UPLOAD_WORKERS,
+                    thread_name_prefix="backup-upload"
+                )
+            future = self._upload_pool.submit(self._upload_to_cloud, backup_path)
+            future.add_done_callback(self._log_upload_result)
 
         # Clean old backups
         self._cleanup_old_backups(state_file.stem)
@@ -79,67 +315,413 @@ class BackupManager:
         """
         state_file = Path(state_file_path)
 
-        # Find backup to restore
-        if backup_timestamp:
-            backup_pattern = f"{state_file.stem}_{backup_timestamp}*.json"
-        else:
-            backup_pattern = f"{state_file.stem}_*.json"
+        # Find backup to restore (index first, directory glob as fallback)
+        backup_to_restore = self._find_indexed_backup(
+            state_file.stem, backup_timestamp
+        )
+
+        if backup_to_restore is None:
+            timestamp_pos = len(state_file.stem) + 1
+            candidates = (
+                entry for entry in self._iter_backups(state_file.stem)
+                if not backup_timestamp
+                or entry.name.startswith(backup_timestamp, timestamp_pos)
+            )
 
-        backups = sorted(self.backup_dir.glob(backup_pattern), reverse=True)
+            # Timestamped names sort chronologically; one max() pass, no stat
+            latest = max(candidates, key=lambda entry: entry.name, default=None)
 
-        if not backups:
-            logger.error(f"No backups found for {state_file_path}")
-            return False
+            if latest is None:
+                logger.error(f"No backups found for {state_file_path}")
+                return False
 
-        backup_to_restore = backups[0]
+            backup_to_restore = Path(latest.path)
 
         # Verify checksum
         if not self._verify_checksum(backup_to_restore):
             logger.error(f"Checksum verification failed for {backup_to_restore}")
             return False
 
-        # Restore file
-        shutil.copy2(backup_to_restore, state_file)
+        # Restore file (already verified, so no hashing needed on the copy)
+        if backup_to_restore.name.endswith('.zst'):
+            self._decompress(backup_to_restore, state_file)
+        else:
+            self._kernel_copy(backup_to_restore, state_file)
         logger.info(f"✓ State restored from backup: {backup_to_restore.name}")
         return True
 
-    def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of file."""
-        sha256 = hashlib.sha256()
+    def _iter_backups(
+        self,
+        state_file_stem: str,
+        entries: Optional[list] = None
+    ) -> Iterator[os.DirEntry]:
+        """
+        Yield directory entries for a state file's backups.
 
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
+        Args:
+            state_file_stem: Stem of the backed-up state file
+            entries: Pre-scanned backup_dir entries (scanned here if None)
+        """
+        if entries is None:
+            with os.scandir(self.backup_dir) as it:
+                entries = list(it)
+
+        prefix = f"{state_file_stem}_"
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and BACKUP_SUFFIX_RE.fullmatch(name, len(prefix)):
+                yield entry
+
+    def _index_path(self, state_file_stem: str) -> Path:
+        """Path of the append-only backup index for a state file."""
+        return self.backup_dir / f"{state_file_stem}.index"
+
+    def _read_index_reversed(self, index_path: Path) -> Iterator[str]:
+        """Yield index lines newest-first, reading the file from the end."""
+        with open(index_path, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            remainder = b''
+
+            while position > 0:
+                read_size = min(INDEX_READ_BLOCK, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b'\n')
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        yield line.decode('utf-8')
+
+            if remainder:
+                yield remainder.decode('utf-8')
+
+    def _find_indexed_backup(
+        self,
+        state_file_stem: str,
+        backup_timestamp: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Find the newest indexed backup, optionally matching a timestamp prefix.
+
+        Returns:
+            Path to backup, or None if the index has no usable entry
+        """
+        index_path = self._index_path(state_file_stem)
+        if not index_path.exists():
+            return None
+
+        for line in self._read_index_reversed(index_path):
+            fields = line.split('\t')
+            if len(fields) < 2:
+                continue  # Torn/partial line
+
+            timestamp, backup_filename = fields[0], fields[1]
+            if backup_timestamp and not timestamp.startswith(backup_timestamp):
+                continue
+
+            backup_path = self.backup_dir / backup_filename
+            if backup_path.exists():
+                return backup_path
+
+        return None
+
+    def _copy_with_checksum(self, src: Path, dst: Path) -> str:
+        """
+        Copy src to dst while hashing, so the data is only read once.
+
+        Args:
+            src: File to copy
+            dst: Destination path (overwritten)
+
+        Returns:
+            Hex digest of the copied bytes (using self.hash_algorithm)
+        """
+        hasher = self._hasher()
+
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            _preallocate(fdst.fileno(), os.fstat(fsrc.fileno()).st_size)
+            for chunk in iter(lambda: fsrc.read(CHUNK_SIZE), b''):
+                fdst.write(chunk)
+                hasher.update(chunk)
+
+        shutil.copystat(src, dst)
+        return hasher.hexdigest()
+
+    def _compress_with_checksum(self, src: Path, dst: Path) -> str:
+        """
+        zstd-compress src into dst, hashing the compressed bytes as written.
+
+        Returns:
+            Hex digest of dst's contents (using self.hash_algorithm)
+        """
+        hasher = self._hasher()
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            sink = _HashingWriter(fdst, hasher)
+            with compressor.stream_writer(sink, closefd=False) as writer:
+                for chunk in iter(lambda: fsrc.read(CHUNK_SIZE), b''):
+                    writer.write(chunk)
+
+        shutil.copystat(src, dst)
+        return hasher.hexdigest()
+
+    def _decompress(self, src: Path, dst: Path):
+        """Decompress a .zst backup into dst, preserving metadata."""
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to restore {src.name}")
+
+        decompressor = zstandard.ZstdDecompressor()
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            decompressor.copy_stream(fsrc, fdst, read_size=CHUNK_SIZE, write_size=CHUNK_SIZE)
+
+        shutil.copystat(src, dst)
+
+    def _write_atomic(self, path: Path, data: bytes):
+        """
+        Write a small file so it appears complete or not at all.
+
+        Uses an anonymous O_TMPFILE linked into place on Linux, falling back
+        to a temp file + rename elsewhere (or if the target already exists).
+        """
+        if hasattr(os, 'O_TMPFILE'):
+            try:
+                fd = os.open(path.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+            except OSError:
+                fd = None  # Filesystem doesn't support O_TMPFILE
+
+            if fd is not None:
+                try:
+                    os.write(fd, data)
+                    os.fsync(fd)
+                    os.link(f"/proc/self/fd/{fd}", path)
+                    return
+                except OSError:
+                    pass  # e.g. target exists or no /proc
+                finally:
+                    os.close(fd)
+
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(path)
+
+    def _hasher(self):
+        """Create a hash object for the configured content hash."""
+        return _new_hasher(self.hash_algorithm)
+
+    @staticmethod
+    def _checksum_path(backup_path: Path) -> Path:
+        """Path of the digest sidecar for a backup."""
+        return backup_path.with_name(f"{backup_path.name}.digest")
+
+    def _kernel_copy(self, src: Path, dst: Path):
+        """
+        Copy src to dst in kernel space, preserving metadata like copy2.
+
+        Tries copy_file_range (Linux >= 4.5), then sendfile, then falls
+        back to shutil.copyfile.
+        """
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            _preallocate(fdst.fileno(), remaining)
+            copied = False
+
+            for copy_fn in (
+                getattr(os, 'copy_file_range', None),
+                getattr(os, 'sendfile', None),
+            ):
+                if copy_fn is None:
+                    continue
+                try:
+                    while remaining > 0:
+                        if copy_fn is os.sendfile:
+                            sent = copy_fn(fdst.fileno(), fsrc.fileno(), None, remaining)
+                        else:
+                            sent = copy_fn(fsrc.fileno(), fdst.fileno(), remaining)
+                        if sent == 0:
+                            break
+                        remaining -= sent
+                    copied = True
+                    break
+                except OSError:
+                    # Unsupported here (e.g. cross-filesystem); try next method
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+                    remaining = os.fstat(fsrc.fileno()).st_size
+
+        if not copied:
+            shutil.copyfile(src, dst)
+
+        shutil.copystat(src, dst)
+
+    def _calculate_checksum(self, file_path: Path, algorithm: Optional[str] = None) -> str:
+        """Calculate checksum of file (defaults to self.hash_algorithm)."""
+        return self._calculate_checksum_bytes(file_path, algorithm).hex()
+
+    def _calculate_checksum_bytes(
+        self,
+        file_path: Path,
+        algorithm: Optional[str] = None
+    ) -> bytes:
+        """Calculate raw digest of file (defaults to self.hash_algorithm)."""
+        return _file_digest(file_path, algorithm or self.hash_algorithm)
 
-        return sha256.hexdigest()
 
     def _verify_checksum(self, backup_path: Path) -> bool:
         """Verify backup file integrity."""
-        checksum_path = backup_path.with_suffix('.json.sha256')
+        checksum_path = self._checksum_path(backup_path)
 
         if not checksum_path.exists():
-            return False  # No checksum = can't verify
+            # Backups from before the .digest sidecar carry a bare SHA-256
+            checksum_path = backup_path.with_suffix('.json.sha256')
+            if not checksum_path.exists():
+                return False  # No checksum = can't verify
 
-        # Read stored checksum
-        with open(checksum_path, 'r') as f:
-            stored_checksum = f.read().split()[0]
+        # Read stored checksum ("<algorithm>:<hex>", or bare hex = sha256)
+        with open(checksum_path, 'rb') as f:
+            sidecar = f.read()
 
-        # Calculate current checksum
-        current_checksum = self._calculate_checksum(backup_path)
+        try:
+            token = sidecar.split(None, 1)[0].decode('ascii')
+            algorithm, _, stored_hex = token.rpartition(':')
+            algorithm = algorithm or 'sha256'
+            stored_checksum = bytes.fromhex(stored_hex)
+        except (IndexError, ValueError):
+            return False  # Corrupt sidecar
+
+        st = os.stat(backup_path)
+        if self._sidecar_stat_matches(sidecar, st):
+            return True  # Untouched since backup; digest already recorded
+
+        # Calculate current checksum (memoized per file version)
+        try:
+            current_checksum = _digest_for_version(
+                str(backup_path), algorithm, st.st_size, st.st_mtime_ns, st.st_ino
+            )
+        except ValueError as e:
+            logger.error(f"Cannot verify {backup_path.name}: {e}")
+            return False
 
-        return stored_checksum == current_checksum
+        return hmac.compare_digest(stored_checksum, current_checksum)
+
+    @staticmethod
+    def _sidecar_stat_matches(sidecar: bytes, st: os.stat_result) -> bool:
+        """Check the sidecar's size/mtime/inode line against a fresh stat."""
+        lines = sidecar.split(b'\n')
+        if len(lines) < 2 or not lines[1].startswith(b'# '):
+            return False  # Older sidecar without metadata
+
+        recorded = dict(
+            field.split(b'=', 1) for field in lines[1][2:].split() if b'=' in field
+        )
+        return (
+            recorded.get(b'size') == str(st.st_size).encode()
+            and recorded.get(b'mtime_ns') == str(st.st_mtime_ns).encode()
+            and recorded.get(b'inode') == str(st.st_ino).encode()
+        )
 
     def _cleanup_old_backups(self, state_file_stem: str):
         """Delete backups older than retention period."""
-        cutoff_date = datetime.now() - timedelta(days=self.retention_days)
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).timestamp()
+
+        # Single directory pass; DirEntry.stat() reuses scandir's metadata
+        with os.scandir(self.backup_dir) as it:
+            entries = list(it)
+        names = {entry.name for entry in entries}
+        removed = set()
+        expired_paths = []
+
+        for entry in self._iter_backups(state_file_stem, entries):
+            name = entry.name
+            if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                removed.add(name)
+                expired_paths.append(entry.path)
+                # Also delete checksum (current and legacy sidecars)
+                for checksum_name in (f"{name}.digest", f"{name}.sha256"):
+                    if checksum_name in names:
+                        expired_paths.append(os.path.join(self.backup_dir, checksum_name))
+
+        if not removed:
+            return
 
-        for backup_file in self.backup_dir.glob(f"{state_file_stem}_*.json"):
-            if backup_file.stat().st_mtime < cutoff_date.timestamp():
-                backup_file.unlink()
-                # Also delete checksum
-                checksum_file = backup_file.with_suffix('.json.sha256')
-                if checksum_file.exists():
-                    checksum_file.unlink()
+        for path in expired_paths:
+            os.unlink(path)
+
+        self._prune_index(state_file_stem, removed)
+
+        # One directory sync makes all the unlinks (and index swap) durable
+        self._fsync_backup_dir()
+
+    def _fsync_backup_dir(self):
+        """fsync the backup directory itself (no-op where unsupported)."""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return  # Windows
+
+        dir_fd = os.open(self.backup_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def _prune_index(self, state_file_stem: str, removed: set):
+        """Drop index entries for deleted backups (single rewrite)."""
+        index_path = self._index_path(state_file_stem)
+        if not index_path.exists():
+            return
+
+        kept = []
+        with open(index_path, 'r') as f:
+            for line in f:
+                fields = line.split('\t')
+                if len(fields) >= 2 and fields[1] in removed:
+                    continue
+                kept.append(line)
+
+        temp_path = index_path.with_suffix('.index.tmp')
+        with open(temp_path, 'w') as f:
+            f.writelines(kept)
+        temp_path.replace(index_path)
+
+    def _get_s3_client(self):
+        """
+        Get cached S3 client and multipart transfer config (created lazily).
+
+        Returns:
+            Tuple of (boto3 S3 client, TransferConfig)
+        """
+        with self._s3_client_lock:  # Upload workers may race to create it
+            if self._s3_client is None:
+                import boto3
+                from boto3.s3.transfer import TransferConfig
+                from botocore.config import Config
+
+                # One client shared by every upload worker's part threads
+                self._s3_client = boto3.client(
+                    's3',
+                    config=Config(
+                        max_pool_connections=S3_MAX_CONCURRENCY * UPLOAD_WORKERS,
+                        retries={'max_attempts': S3_MAX_ATTEMPTS, 'mode': 'adaptive'}
+                    )
+                )
+                self._s3_transfer_config = TransferConfig(
+                    multipart_threshold=S3_MULTIPART_THRESHOLD,
+                    multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+                    max_concurrency=S3_MAX_CONCURRENCY,
+                    use_threads=True
+                )
+
+        return self._s3_client, self._s3_transfer_config
+
+    @staticmethod
+    def _log_upload_result(future: concurrent.futures.Future):
+        """Log uploads that failed outside _upload_to_cloud's own handling."""
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Cloud backup failed: {error}")
 
     def _upload_to_cloud(self, backup_path: Path):
         """Upload backup to S3 (optional)."""
@@ -147,12 +729,12 @@ class BackupManager:
             return
 
         try:
-            import boto3
-            s3 = boto3.client('s3')
+            s3, transfer_config = self._get_s3_client()
             s3.upload_file(
                 str(backup_path),
                 self.s3_bucket,
-                f"dalio-lite-backups/{backup_path.name}"
+                f"dalio-lite-backups/{backup_path.name}",
+                Config=transfer_config
             )
             logger.info(f"✓ Backup uploaded to S3: {self.s3_bucket}")
         except Exception as e:
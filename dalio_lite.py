@@ -14,13 +14,24 @@ License: MIT
 """
 
 import os
+import copy
+import functools
+import importlib.util
 import yaml
 import logging
+from logging.handlers import MemoryHandler, RotatingFileHandler
 import time
+import re
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, List
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
 import json
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -32,19 +43,62 @@ from metrics_collector import metrics
 from backup_manager import BackupManager
 from transaction_log import TransactionLogger
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 try:
-    from alpaca.trading.client import TradingClient
-    from alpaca.trading.requests import MarketOrderRequest
-    from alpaca.trading.enums import OrderSide, TimeInForce
-    from alpaca.data.historical import StockHistoricalDataClient
-    from alpaca.data.requests import StockLatestQuoteRequest
-    ALPACA_AVAILABLE = True
+    from send_notification import send_daily_summary, send_circuit_breaker_alert
+    EMAIL_AVAILABLE = True
 except ImportError:
-    ALPACA_AVAILABLE = False
+    EMAIL_AVAILABLE = False
+
+# alpaca-py (and the pydantic/websockets stack behind it) is imported inside
+# the methods that use it so config-only commands start fast; find_spec only
+# locates the package without importing it. The alpaca names are no longer
+# re-exported: import OrderSide etc. from alpaca.trading.enums, not dalio_lite
+ALPACA_AVAILABLE = importlib.util.find_spec("alpaca") is not None
+if not ALPACA_AVAILABLE:
     print("⚠️  alpaca-py not installed. Run: pip install alpaca-py")
 
+if TYPE_CHECKING:
+    from alpaca.trading.enums import OrderSide
+
+try:
+    import orjson  # C JSON encoder, ~5x faster than json.dumps
+except ImportError:
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # LibYAML C binding
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a YAML file (mtime_ns/size key the cache so edits invalidate it)"""
+    with open(path, 'r') as f:
+        return yaml.load(f.read(), Loader=YamlLoader)
+
+
+def _json_dumps(data, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON (orjson when installed, else stdlib json)"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    # Same bytes as orjson: compact separators unless indented, raw UTF-8
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+# Concurrent order submissions per phase (Alpaca rate limit headroom)
+MAX_ORDER_WORKERS = 4
+
+# Error substrings that mean retrying an order cannot succeed
+_NON_RETRYABLE_RE = re.compile(r'401|403|404|400|insufficient|invalid symbol', re.IGNORECASE)
+
 
 class OrderStatus(Enum):
     """Order execution status."""
@@ -54,7 +108,7 @@ class OrderStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OrderResult:
     """Result of order execution attempt."""
     ticker: str
@@ -64,6 +118,8 @@ class OrderResult:
     order_id: Optional[str] = None
     error_message: Optional[str] = None
     retry_count: int = 0
+    # Set when _execute_order builds the result, i.e. when the order finished
+    completed_at: str = field(default_factory=lambda: datetime.now().isoformat())
 
     def to_dict(self):
         """Convert to dictionary for JSON serialization."""
@@ -74,10 +130,39 @@ class OrderResult:
             'status': self.status.value,
             'order_id': self.order_id,
             'error_message': self.error_message,
-            'retry_count': self.retry_count
+            'retry_count': self.retry_count,
+            'timestamp': self.completed_at
         }
 
 
+class AccountSnapshot:
+    """
+    Numeric view of an Alpaca account.
+
+    Alpaca returns money fields as strings; each one is parsed to float on
+    first access and reused after that.
+    """
+
+    def __init__(self, account):
+        self._account = account
+
+    @functools.cached_property
+    def portfolio_value(self) -> float:
+        return float(self._account.portfolio_value)
+
+    @functools.cached_property
+    def equity(self) -> float:
+        return float(self._account.equity)
+
+    @functools.cached_property
+    def last_equity(self) -> float:
+        return float(self._account.last_equity)
+
+    @functools.cached_property
+    def cash(self) -> float:
+        return float(self._account.cash)
+
+
 class DalioLite:
     """
     Simplified All Weather portfolio manager
@@ -92,6 +177,13 @@ class DalioLite:
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize Dalio Lite system"""
         self.config = self._load_config(config_path)
+        self._target_tickers = list(self.config['allocation'].keys())
+        self._target_pcts = np.array(
+            list(self.config['allocation'].values()), dtype=np.float64
+        )
+        # Per-thread: the dashboard shares one DalioLite across sessions, and
+        # each session's checks run on its own script thread
+        self._broker_local = threading.local()
         self._setup_logging()
         self._setup_broker()
         self.last_rebalance = self._load_last_rebalance_date()
@@ -114,18 +206,20 @@ class DalioLite:
 
         self.logger.info("="*60)
         self.logger.info("DALIO LITE INITIALIZED")
-        self.logger.info(f"Mode: {'PAPER TRADING' if self.config['mode']['paper_trading'] else 'LIVE TRADING'}")
-        self.logger.info(f"Target Allocation: {self.config['allocation']}")
-        self.logger.info(f"Concurrency control: ENABLED (lock timeout: 30s)")
-        self.logger.info(f"Metrics collection: ENABLED")
-        self.logger.info(f"Automatic backups: ENABLED (30-day retention)")
-        self.logger.info(f"Transaction logging: ENABLED")
+        self.logger.info("Mode: %s", 'PAPER TRADING' if self.config['mode']['paper_trading'] else 'LIVE TRADING')
+        self.logger.info("Target Allocation: %s", self.config['allocation'])
+        self.logger.info("Concurrency control: ENABLED (lock timeout: 30s)")
+        self.logger.info("Metrics collection: ENABLED")
+        self.logger.info("Automatic backups: ENABLED (30-day retention)")
+        self.logger.info("Transaction logging: ENABLED")
         self.logger.info("="*60)
 
     def _load_config(self, config_path: str) -> dict:
-        """Load configuration from YAML file"""
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        """Load configuration from YAML file (parsed once per file version)"""
+        st = os.stat(config_path)
+        config = copy.deepcopy(
+            _parse_yaml_file(os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
+        )
 
         # Validate allocation sums to 1.0
         total = sum(config['allocation'].values())
@@ -142,22 +236,45 @@ class DalioLite:
         # Create logs directory
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
 
+        # Rotating log file, written in batches: INFO lines are buffered and
+        # flushed every 256 records, on any WARNING+, after each daily check
+        # or rebalance (_flush_logs), and at exit
+        log_format = '%(asctime)s | %(levelname)s | %(message)s'
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=self.config['logging'].get('max_bytes', 10 * 1024 * 1024),
+            backupCount=self.config['logging'].get('backup_count', 5)
+        )
+        file_handler.setFormatter(logging.Formatter(log_format))
+        buffered_handler = MemoryHandler(
+            capacity=256, flushLevel=logging.WARNING, target=file_handler
+        )
+
         # Configure logger
         logging.basicConfig(
             level=log_level,
-            format='%(asctime)s | %(levelname)s | %(message)s',
+            format=log_format,
             handlers=[
-                logging.FileHandler(log_file),
+                buffered_handler,
                 logging.StreamHandler()
             ]
         )
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _flush_logs():
+        """Write any buffered log records to disk"""
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
     def _setup_broker(self):
         """Initialize broker connection (Alpaca)"""
         if not ALPACA_AVAILABLE:
             raise ImportError("alpaca-py required. Install: pip install alpaca-py")
 
+        from alpaca.trading.client import TradingClient
+        from alpaca.data.historical import StockHistoricalDataClient
+
         # Get API keys from environment
         api_key = os.getenv('ALPACA_API_KEY')
         secret_key = os.getenv('ALPACA_SECRET_KEY')
@@ -182,14 +299,31 @@ class DalioLite:
             secret_key=secret_key
         )
 
+        # Share one keep-alive connection pool across both clients
+        self._http_session = self._create_http_session()
+        for client in (self.trading_client, self.data_client):
+            if hasattr(client, '_session'):
+                client._session = self._http_session
+
         # Verify connection
         try:
             account = self.trading_client.get_account()
-            self.logger.info(f"Connected to Alpaca: ${float(account.cash):.2f} cash, "
-                           f"${float(account.portfolio_value):.2f} total value")
+            self.logger.info("Connected to Alpaca: $%.2f cash, $%.2f total value",
+                             float(account.cash), float(account.portfolio_value))
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Alpaca: {e}")
 
+    @staticmethod
+    def _create_http_session():
+        """HTTP session with a small keep-alive pool (alpaca-py retries itself)"""
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+
+        session = Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        session.mount('https://', adapter)
+        return session
+
     def _load_last_rebalance_date(self) -> Optional[datetime]:
         """Load last rebalance timestamp from state file"""
         state_file = Path("state/last_rebalance.json")
@@ -199,8 +333,22 @@ class DalioLite:
                 return datetime.fromisoformat(data['timestamp'])
         return None
 
-    def _save_rebalance_date(self, timestamp: datetime):
-        """Save rebalance timestamp to state file (atomic write with backup)"""
+    def _save_rebalance_date(self, timestamp: datetime, durable: Optional[bool] = None):
+        """
+        Save rebalance timestamp to state file (atomic write with backup)
+
+        The rename is always atomic, so readers never see a torn file. fsync
+        is opt-in (config: state.durable_writes): without it, a power loss
+        right after the rename can only roll back to the previous timestamp,
+        costing at most one extra "is it time to rebalance?" check.
+
+        Args:
+            timestamp: Rebalance time to persist
+            durable: fsync file and directory (None = use config setting)
+        """
+        if durable is None:
+            durable = self.config.get('state', {}).get('durable_writes', False)
+
         state_file = Path("state/last_rebalance.json")
         temp_file = Path("state/.last_rebalance.json.tmp")
 
@@ -208,18 +356,75 @@ class DalioLite:
         state_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Write to temp file first (atomic operation)
-        with open(temp_file, 'w') as f:
-            json.dump({'timestamp': timestamp.isoformat()}, f)
-            f.flush()
-            os.fsync(f.fileno())  # Ensure written to disk
+        with open(temp_file, 'wb') as f:
+            f.write(_json_dumps({'timestamp': timestamp.isoformat()}))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())  # Ensure written to disk
 
         # Atomic rename (replaces old file)
         temp_file.replace(state_file)
 
+        if durable and hasattr(os, 'O_DIRECTORY'):
+            # Make the rename itself durable
+            dir_fd = os.open(state_file.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
         # Create backup
         self.backup_manager.backup_state_file(str(state_file))
 
-        self.logger.debug(f"State saved and backed up: {timestamp.isoformat()}")
+        self.logger.debug("State saved and backed up: %s", timestamp)
+
+    @property
+    def _broker_cache(self) -> Optional[dict]:
+        """This thread's broker read cache (None outside a check)"""
+        return getattr(self._broker_local, 'cache', None)
+
+    @_broker_cache.setter
+    def _broker_cache(self, cache: Optional[dict]):
+        self._broker_local.cache = cache
+
+    @contextmanager
+    def _broker_read_cache(self):
+        """
+        Memoize get_account()/get_all_positions() for one check.
+
+        Nested use (rebalance inside a daily check) starts from a fresh
+        cache; the outermost block turns caching off again on exit.
+        """
+        outermost = self._broker_cache is None
+        self._broker_cache = {}
+        try:
+            yield
+        finally:
+            if outermost:
+                self._broker_cache = None
+
+    def _get_account_cached(self) -> AccountSnapshot:
+        """Account from the broker (cached while a check is running)"""
+        cache = self._broker_cache
+        if cache is None:
+            return AccountSnapshot(self.trading_client.get_account())
+        if 'account' not in cache:
+            cache['account'] = AccountSnapshot(self.trading_client.get_account())
+        return cache['account']
+
+    def _get_positions_cached(self):
+        """Positions from the broker (cached while a check is running)"""
+        cache = self._broker_cache
+        if cache is None:
+            return self.trading_client.get_all_positions()
+        if 'positions' not in cache:
+            cache['positions'] = self.trading_client.get_all_positions()
+        return cache['positions']
+
+    def _invalidate_broker_cache(self):
+        """Drop cached broker reads (e.g. after an order changes positions)"""
+        if self._broker_cache is not None:
+            self._broker_cache.clear()
 
     def get_current_positions(self) -> Dict[str, float]:
         """
@@ -228,14 +433,14 @@ class DalioLite:
         Returns:
             Dict mapping ticker -> percentage (0.0 to 1.0)
         """
-        account = self.trading_client.get_account()
-        portfolio_value = float(account.portfolio_value)
+        account = self._get_account_cached()
+        portfolio_value = account.portfolio_value
 
         if portfolio_value == 0:
             self.logger.warning("Portfolio value is $0 - no positions")
             return {}
 
-        positions = self.trading_client.get_all_positions()
+        positions = self._get_positions_cached()
 
         current = {}
         for position in positions:
@@ -251,22 +456,43 @@ class DalioLite:
 
         return current
 
-    def calculate_drift(self) -> Dict[str, float]:
+    def calculate_drift(self, current: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Calculate drift from target allocation
 
+        Args:
+            current: Positions from get_current_positions() (None = fetch)
+
         Returns:
             Dict mapping ticker -> drift amount (negative = underweight)
         """
-        current = self.get_current_positions()
-        target = self.config['allocation']
+        if current is None:
+            current = self.get_current_positions()
 
-        drift = {}
-        for ticker, target_pct in target.items():
-            current_pct = current.get(ticker, 0.0)
-            drift[ticker] = current_pct - target_pct
+        current_arr = np.fromiter(
+            (current.get(ticker, 0.0) for ticker in self._target_tickers),
+            dtype=np.float64,
+            count=len(self._target_tickers)
+        )
+        drift_arr = current_arr - self._target_pcts
+
+        return dict(zip(self._target_tickers, drift_arr.tolist()))
 
-        return drift
+    @staticmethod
+    def _drift_array(drift: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Split a drift dict into (tickers, abs drift) arrays"""
+        tickers = np.array(list(drift.keys()))
+        abs_drift = np.abs(np.fromiter(drift.values(), dtype=np.float64, count=len(drift)))
+        return tickers, abs_drift
+
+    def _rebalance_cooldown(self) -> Optional[str]:
+        """Reason string if the last rebalance is too recent, else None"""
+        if self.last_rebalance:
+            min_days = self.config['rebalancing']['min_days_between']
+            days_since = (datetime.now() - self.last_rebalance).days
+            if days_since < min_days:
+                return f"Only {days_since} days since last rebalance (min: {min_days})"
+        return None
 
     def needs_rebalancing(self) -> Tuple[bool, str]:
         """
@@ -276,20 +502,18 @@ class DalioLite:
             (needs_rebalance: bool, reason: str)
         """
         # Check minimum time between rebalances
-        if self.last_rebalance:
-            min_days = self.config['rebalancing']['min_days_between']
-            days_since = (datetime.now() - self.last_rebalance).days
-            if days_since < min_days:
-                return False, f"Only {days_since} days since last rebalance (min: {min_days})"
+        cooldown = self._rebalance_cooldown()
+        if cooldown:
+            return False, cooldown
 
         # Check drift threshold
-        drift = self.calculate_drift()
-        max_drift = max(abs(d) for d in drift.values())
+        tickers, abs_drift = self._drift_array(self.calculate_drift())
+        max_drift = float(abs_drift.max())
         threshold = self.config['rebalancing']['drift_threshold']
 
         if max_drift > threshold:
             # Find which ticker(s) triggered
-            triggers = [t for t, d in drift.items() if abs(d) > threshold]
+            triggers = tickers[abs_drift > threshold].tolist()
             return True, f"Drift {max_drift:.1%} exceeds threshold {threshold:.1%} ({', '.join(triggers)})"
 
         return False, f"All positions within {threshold:.1%} of target (max drift: {max_drift:.1%})"
@@ -301,8 +525,8 @@ class DalioLite:
         Returns:
             Dict mapping ticker -> $ amount to buy (positive) or sell (negative)
         """
-        account = self.trading_client.get_account()
-        portfolio_value = float(account.portfolio_value)
+        account = self._get_account_cached()
+        portfolio_value = account.portfolio_value
 
         current = self.get_current_positions()
         target = self.config['allocation']
@@ -337,12 +561,12 @@ class DalioLite:
         Returns:
             True if successful, False otherwise
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         metrics.increment("rebalance_total")
 
         # Check if lock already held (called from run_daily_check)
-        if self.lock_manager.is_locked:
-            # Lock already held (nested call)
+        if self.lock_manager.is_locked():
+            # Lock already held (nested call) - run_daily_check flushes metrics
             return self._execute_rebalance_impl(dry_run, start_time)
         else:
             # Lock not held (direct call from Dashboard)
@@ -350,144 +574,166 @@ class DalioLite:
                 with self.lock_manager.acquire():
                     return self._execute_rebalance_impl(dry_run, start_time)
             except RuntimeError as e:
-                self.logger.error(f"Rebalance aborted: {e}")
+                self.logger.error("Rebalance aborted: %s", e)
                 metrics.increment("rebalance_failed")
-                metrics.flush()
                 return False
+            finally:
+                # Single metrics write per rebalance; flush buffered log lines so
+                # a long-lived caller (dashboard) sees them in logs/ right away
+                metrics.flush()
+                self._flush_logs()
 
     def _execute_rebalance_impl(self, dry_run: bool = False, start_time: float = None) -> bool:
         """Internal implementation of rebalance (called within lock context)"""
-        if start_time is None:
-            start_time = time.time()
+        from alpaca.trading.enums import OrderSide
 
-        self.logger.info("="*60)
-        self.logger.info("EXECUTING REBALANCE")
-        self.logger.info("="*60)
+        # Broker reads are cached for the duration of the rebalance
+        with self._broker_read_cache():
+            if start_time is None:
+                start_time = time.perf_counter()
 
-        # Calculate orders
-        orders = self.calculate_rebalance_orders()
+            self.logger.info("="*60)
+            self.logger.info("EXECUTING REBALANCE")
+            self.logger.info("="*60)
 
-        # Log plan
-        self.logger.info("Rebalance Plan:")
-        total_buys = sum(amt for amt in orders.values() if amt > 0)
-        total_sells = abs(sum(amt for amt in orders.values() if amt < 0))
+            # Calculate orders
+            orders = self.calculate_rebalance_orders()
+
+            # Partition once: largest sells first, then largest buys first
+            sells = sorted(((t, -amt) for t, amt in orders.items() if amt < 0),
+                           key=itemgetter(1), reverse=True)
+            buys = sorted(((t, amt) for t, amt in orders.items() if amt > 0),
+                          key=itemgetter(1), reverse=True)
+
+            # Log plan
+            self.logger.info("Rebalance Plan:")
+            total_buys = sum(amt for _, amt in buys)
+            total_sells = sum(amt for _, amt in sells)
+
+            for ticker, amount in orders.items():
+                if amount == 0:
+                    self.logger.info("  %s: No change", ticker)
+                elif amount > 0:
+                    self.logger.info("  %s: BUY $%.2f", ticker, amount)
+                else:
+                    self.logger.info("  %s: SELL $%.2f", ticker, -amount)
 
-        for ticker, amount in orders.items():
-            if amount == 0:
-                self.logger.info(f"  {ticker}: No change")
-            elif amount > 0:
-                self.logger.info(f"  {ticker}: BUY ${amount:.2f}")
-            else:
-                self.logger.info(f"  {ticker}: SELL ${abs(amount):.2f}")
+            self.logger.info("Total to sell: $%.2f", total_sells)
+            self.logger.info("Total to buy: $%.2f", total_buys)
 
-        self.logger.info(f"Total to sell: ${total_sells:.2f}")
-        self.logger.info(f"Total to buy: ${total_buys:.2f}")
+            if dry_run:
+                self.logger.info("DRY RUN - No orders executed")
+                return True
 
-        if dry_run:
-            self.logger.info("DRY RUN - No orders executed")
-            return True
+            # Begin transaction logging
+            tx_id = self.transaction_logger.begin_transaction(
+                operation="rebalance",
+                target_orders=orders
+            )
 
-        # Begin transaction logging
-        tx_id = self.transaction_logger.begin_transaction(
-            operation="rebalance",
-            target_orders=orders
-        )
+            # Track results (written to the transaction log once per phase)
+            sell_results = []
+            buy_results = []
+            unlogged = []
+            all_success = True
 
-        # Track results
-        sell_results = []
-        buy_results = []
-        all_success = True
+            try:
+                # One quote request for every ticker we're about to trade
+                quotes = self._prefetch_quotes([t for t, _ in sells + buys])
 
-        try:
-            # Execute SELL orders first (free up cash)
-            self.logger.info("\n📤 Executing SELL orders...")
-            for ticker, amount in sorted(orders.items(), key=lambda x: x[1]):
-                if amount < 0:  # Sell
-                    result = self._execute_order(ticker, abs(amount), OrderSide.SELL)
+                # Execute SELL orders first (free up cash)
+                self.logger.info("\n📤 Executing SELL orders...")
+                for result in self._submit_orders(sells, OrderSide.SELL, quotes):
                     sell_results.append(result)
-                    self.transaction_logger.record_order(tx_id, result.to_dict())
+                    unlogged.append(result.to_dict())
 
                     if result.status != OrderStatus.SUCCESS:
-                        self.logger.error(f"SELL order failed: {ticker}")
+                        self.logger.error("SELL order failed: %s", result.ticker)
                         all_success = False
                         # Continue to next order (don't abort all sells)
 
-            # Execute BUY orders second (use freed cash)
-            self.logger.info("\n📥 Executing BUY orders...")
-            for ticker, amount in sorted(orders.items(), key=lambda x: x[1], reverse=True):
-                if amount > 0:  # Buy
-                    result = self._execute_order(ticker, amount, OrderSide.BUY)
+                self.transaction_logger.record_orders_batch(tx_id, unlogged)
+                unlogged = []
+
+                # Execute BUY orders second (use freed cash)
+                self.logger.info("\n📥 Executing BUY orders...")
+                for result in self._submit_orders(buys, OrderSide.BUY, quotes):
                     buy_results.append(result)
-                    self.transaction_logger.record_order(tx_id, result.to_dict())
+                    unlogged.append(result.to_dict())
 
                     if result.status != OrderStatus.SUCCESS:
-                        self.logger.error(f"BUY order failed: {ticker}")
+                        self.logger.error("BUY order failed: %s", result.ticker)
                         all_success = False
                         # Continue to next order
 
-            # Reconciliation check
-            self.logger.info("\n🔍 Reconciliation Check...")
-            reconciliation_notes = self._reconcile_orders(orders, sell_results + buy_results)
+                self.transaction_logger.record_orders_batch(tx_id, unlogged)
+                unlogged = []
 
-            if all_success:
-                # Update state only if ALL orders succeeded
-                self.last_rebalance = datetime.now()
-                self._save_rebalance_date(self.last_rebalance)
+                # Reconciliation check
+                self.logger.info("\n🔍 Reconciliation Check...")
+                reconciliation_notes = self._reconcile_orders(orders, sell_results + buy_results)
 
-                self.transaction_logger.complete_transaction(tx_id, "completed", reconciliation_notes)
+                if all_success:
+                    # Update state only if ALL orders succeeded
+                    self.last_rebalance = datetime.now()
+                    self._save_rebalance_date(self.last_rebalance)
 
-                metrics.increment("rebalance_success")
-                duration = time.time() - start_time
-                metrics.record_duration("rebalance_duration_seconds", duration)
-                self._update_metrics()
-                metrics.flush()
+                    self.transaction_logger.complete_transaction(tx_id, "completed", reconciliation_notes)
 
-                self.logger.info("✅ Rebalance COMPLETE - All orders succeeded")
-                self._notify("Portfolio rebalanced successfully")
+                    metrics.increment("rebalance_success")
+                    duration = time.perf_counter() - start_time
+                    metrics.record_duration("rebalance_duration_seconds", duration)
+                    self._update_metrics()
 
-            else:
-                # Partial failure
-                self.transaction_logger.complete_transaction(tx_id, "partial", reconciliation_notes)
+                    self.logger.info("✅ Rebalance COMPLETE - All orders succeeded")
+                    self._notify("Portfolio rebalanced successfully")
 
-                metrics.increment("rebalance_partial")
-                metrics.flush()
+                else:
+                    # Partial failure
+                    self.transaction_logger.complete_transaction(tx_id, "partial", reconciliation_notes)
 
-                self.logger.warning("⚠️ Rebalance PARTIAL - Some orders failed")
-                self.logger.warning(f"Transaction ID: {tx_id}")
-                self.logger.warning("Review transaction log for details")
+                    metrics.increment("rebalance_partial")
 
-                self._notify(
-                    f"⚠️ Rebalance partially failed. "
-                    f"Some orders did not execute. "
-                    f"Transaction ID: {tx_id}. "
-                    f"Portfolio may require manual adjustment."
-                )
+                    self.logger.warning("⚠️ Rebalance PARTIAL - Some orders failed")
+                    self.logger.warning("Transaction ID: %s", tx_id)
+                    self.logger.warning("Review transaction log for details")
 
-                # Don't update last_rebalance (allow retry on next check)
+                    self._notify(
+                        f"⚠️ Rebalance partially failed. "
+                        f"Some orders did not execute. "
+                        f"Transaction ID: {tx_id}. "
+                        f"Portfolio may require manual adjustment."
+                    )
 
-            self.logger.info("="*60)
-            return all_success
+                    # Don't update last_rebalance (allow retry on next check)
 
-        except Exception as e:
-            # Unexpected error during rebalance
-            self.logger.exception(f"❌ Rebalance FAILED with unexpected error: {e}")
+                self.logger.info("="*60)
+                return all_success
 
-            self.transaction_logger.complete_transaction(
-                tx_id,
-                "failed",
-                f"Unexpected error: {e}"
-            )
+            except Exception as e:
+                # Unexpected error during rebalance
+                self.logger.exception("❌ Rebalance FAILED with unexpected error: %s", e)
 
-            metrics.increment("rebalance_failed")
-            metrics.flush()
+                # Keep orders that went out before the failure in the audit trail
+                if unlogged:
+                    self.transaction_logger.record_orders_batch(tx_id, unlogged)
 
-            self._notify(
-                f"❌ Rebalance failed: {e}. "
-                f"Transaction ID: {tx_id}. "
-                f"Manual review required."
-            )
+                self.transaction_logger.complete_transaction(
+                    tx_id,
+                    "failed",
+                    f"Unexpected error: {e}"
+                )
+
+                metrics.increment("rebalance_failed")
+
+                self._notify(
+                    f"❌ Rebalance failed: {e}. "
+                    f"Transaction ID: {tx_id}. "
+                    f"Manual review required."
+                )
+
+                return False
 
-            return False
 
     def _reconcile_orders(
         self,
@@ -506,12 +752,12 @@ class DalioLite:
         """
         notes = []
 
-        # Group results by ticker
-        results_by_ticker = {}
+        # Group results by ticker and tally statuses in one pass
+        results_by_ticker = defaultdict(list)
+        status_counts = Counter()
         for result in results:
-            if result.ticker not in results_by_ticker:
-                results_by_ticker[result.ticker] = []
             results_by_ticker[result.ticker].append(result)
+            status_counts[result.status] += 1
 
         # Check each target order
         for ticker, target_amount in target_orders.items():
@@ -534,24 +780,40 @@ class DalioLite:
                 )
 
         # Summary
-        total_success = sum(1 for r in results if r.status == OrderStatus.SUCCESS)
-        total_failed = sum(1 for r in results if r.status == OrderStatus.FAILED)
+        total_success = status_counts[OrderStatus.SUCCESS]
+        total_failed = status_counts[OrderStatus.FAILED]
 
         summary = f"\n📊 Summary: {total_success} succeeded, {total_failed} failed"
         notes.insert(0, summary)
 
         return "\n".join(notes)
 
-    def _update_metrics(self):
-        """Update gauge metrics with current state"""
+    def _update_metrics(
+        self,
+        account: Optional[AccountSnapshot] = None,
+        drift: Optional[Dict[str, float]] = None
+    ):
+        """
+        Update gauge metrics with current state
+
+        Args:
+            account: Account the caller already fetched (None = fetch)
+            drift: Drift the caller already computed (None = compute)
+        """
         try:
+            # Drift first: it reads the account too, so the gauge below is served
+            # from the broker read cache rather than another API call
+            if drift is None:
+                drift = self.calculate_drift()
+            if account is None:
+                account = self._get_account_cached()
+
             # Portfolio value
-            account = self.trading_client.get_account()
-            metrics.set_gauge("portfolio_value_usd", float(account.portfolio_value))
+            metrics.set_gauge("portfolio_value_usd", account.portfolio_value)
 
             # Max drift
-            drift = self.calculate_drift()
-            max_drift = max(abs(d) for d in drift.values())
+            _, abs_drift = self._drift_array(drift)
+            max_drift = float(abs_drift.max())
             metrics.set_gauge("drift_max_pct", max_drift * 100)
 
             # Days since last rebalance
@@ -559,14 +821,85 @@ class DalioLite:
                 days_since = (datetime.now() - self.last_rebalance).days
                 metrics.set_gauge("days_since_rebalance", days_since)
         except Exception as e:
-            self.logger.warning(f"Failed to update metrics: {e}")
+            self.logger.warning("Failed to update metrics: %s", e)
+
+    def _prefetch_quotes(self, tickers: List[str]) -> Dict[str, object]:
+        """
+        Fetch latest quotes for all tickers in a single request.
+
+        Args:
+            tickers: Stock symbols to quote
+
+        Returns:
+            Dict mapping ticker -> quote (empty if the batch request failed)
+        """
+        if not tickers:
+            return {}
+
+        from alpaca.data.requests import StockLatestQuoteRequest
+
+        metrics.increment("api_calls_total")
+        try:
+            quote_request = StockLatestQuoteRequest(symbol_or_symbols=tickers)
+            return dict(self.data_client.get_stock_latest_quote(quote_request))
+        except Exception as e:
+            # Orders fall back to fetching their own quote
+            self.logger.warning("Batch quote fetch failed: %s", e)
+            return {}
+
+    def _submit_orders(
+        self,
+        batch: List[Tuple[str, float]],
+        side: 'OrderSide',
+        quote_cache: Optional[Dict[str, object]] = None
+    ):
+        """
+        Execute one phase of orders, yielding results in batch order.
+
+        Metrics are persisted in the background after each order (coalesced
+        by metrics.request_flush), so a crash mid-rebalance still leaves the
+        completed orders on disk.
+
+        Orders for different tickers are independent, so unless
+        rebalancing.parallel_orders is false they are submitted from a small
+        thread pool (capped to stay under Alpaca's rate limit).
+
+        Args:
+            batch: (ticker, amount_usd) pairs, all on the same side
+            side: OrderSide.BUY or OrderSide.SELL
+            quote_cache: Prefetched quotes passed through to _execute_order
+        """
+        parallel = self.config['rebalancing'].get('parallel_orders', True)
+
+        if not parallel or len(batch) < 2:
+            results = (
+                self._execute_order(ticker, amount, side, quote_cache=quote_cache)
+                for ticker, amount in batch
+            )
+            yield from self._after_orders(results)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(batch), MAX_ORDER_WORKERS)) as pool:
+            yield from self._after_orders(pool.map(
+                lambda order: self._execute_order(*order, side, quote_cache=quote_cache),
+                batch
+            ))
+
+    def _after_orders(self, results):
+        """Per-result bookkeeping, run on the calling thread (which owns the broker cache)"""
+        for result in results:
+            if result.status == OrderStatus.SUCCESS:
+                self._invalidate_broker_cache()  # Positions/cash have changed
+            metrics.request_flush()
+            yield result
 
     def _execute_order(
         self,
         ticker: str,
         amount_usd: float,
-        side: OrderSide,
-        max_retries: int = 3
+        side: 'OrderSide',
+        max_retries: int = 3,
+        quote_cache: Optional[Dict[str, object]] = None
     ) -> OrderResult:
         """
         Execute a single market order with retry logic.
@@ -576,11 +909,17 @@ class DalioLite:
             amount_usd: Dollar amount to trade
             side: OrderSide.BUY or OrderSide.SELL
             max_retries: Number of retry attempts (default: 3)
+            quote_cache: Prefetched quotes from _prefetch_quotes (first attempt
+                only; retries fetch a fresh quote)
 
         Returns:
             OrderResult with status and details
         """
-        start_time = time.time()
+        from alpaca.data.requests import StockLatestQuoteRequest
+        from alpaca.trading.enums import OrderSide, TimeInForce
+        from alpaca.trading.requests import MarketOrderRequest
+
+        start_time = time.perf_counter()
         last_error = None
 
         metrics.increment("orders_executed")
@@ -589,9 +928,11 @@ class DalioLite:
         for attempt in range(max_retries + 1):
             try:
                 # Get current price
-                quote_request = StockLatestQuoteRequest(symbol_or_symbols=[ticker])
-                quotes = self.data_client.get_stock_latest_quote(quote_request)
-                price = float(quotes[ticker].ask_price if side == OrderSide.BUY else quotes[ticker].bid_price)
+                quote = quote_cache.get(ticker) if quote_cache and attempt == 0 else None
+                if quote is None:
+                    quote_request = StockLatestQuoteRequest(symbol_or_symbols=[ticker])
+                    quote = self.data_client.get_stock_latest_quote(quote_request)[ticker]
+                price = float(quote.ask_price if side == OrderSide.BUY else quote.bid_price)
 
                 # Create order request
                 order_data = MarketOrderRequest(
@@ -605,12 +946,12 @@ class DalioLite:
                 order = self.trading_client.submit_order(order_data)
 
                 self.logger.info(
-                    f"✓ Order SUCCESS: {side.name} ${amount_usd:.2f} of {ticker} "
-                    f"(order_id: {order.id}, attempt: {attempt + 1}/{max_retries + 1})"
+                    "✓ Order SUCCESS: %s $%.2f of %s (order_id: %s, attempt: %d/%d)",
+                    side.name, amount_usd, ticker, order.id, attempt + 1, max_retries + 1
                 )
 
                 metrics.increment("orders_success")
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter() - start_time) * 1000
                 metrics.record_duration("order_execution_duration_ms", duration_ms)
 
                 return OrderResult(
@@ -625,8 +966,8 @@ class DalioLite:
             except Exception as e:
                 last_error = str(e)
                 self.logger.warning(
-                    f"✗ Order FAILED: {side.name} {ticker} - {e} "
-                    f"(attempt: {attempt + 1}/{max_retries + 1})"
+                    "✗ Order FAILED: %s %s - %s (attempt: %d/%d)",
+                    side.name, ticker, e, attempt + 1, max_retries + 1
                 )
 
                 # Check if error is retryable
@@ -634,12 +975,12 @@ class DalioLite:
                     if attempt < max_retries:
                         # Exponential backoff: 1s, 2s, 4s
                         backoff = 2 ** attempt
-                        self.logger.info(f"Retrying in {backoff}s...")
+                        self.logger.info("Retrying in %ds...", backoff)
                         time.sleep(backoff)
                         continue
                 else:
                     # Non-retryable error (e.g., symbol not found)
-                    self.logger.error(f"Non-retryable error, skipping retries")
+                    self.logger.error("Non-retryable error, skipping retries")
                     break
 
         # All retries exhausted or non-retryable error
@@ -671,28 +1012,9 @@ class DalioLite:
         - 400 bad request (invalid order)
         - Insufficient buying power
         """
-        error_str = str(error).lower()
-
-        # Non-retryable patterns (check first - takes precedence)
-        non_retryable_patterns = [
-            "401", "403", "404", "400",
-            "insufficient", "invalid symbol"
-        ]
-
-        if any(pattern in error_str for pattern in non_retryable_patterns):
-            return False
-
-        # Retryable patterns
-        retryable_patterns = [
-            "timeout", "503", "500", "502", "429",
-            "connection", "network"
-        ]
-
-        if any(pattern in error_str for pattern in retryable_patterns):
-            return True
-
-        # Default: assume retryable (conservative approach)
-        return True
+        # Non-retryable patterns take precedence; anything else (timeouts,
+        # 5xx, 429, connection errors, unknown) is assumed retryable
+        return _NON_RETRYABLE_RE.search(str(error)) is None
 
     def check_circuit_breakers(self) -> Tuple[bool, str]:
         """
@@ -701,14 +1023,14 @@ class DalioLite:
         Returns:
             (triggered: bool, reason: str)
         """
-        account = self.trading_client.get_account()
+        account = self._get_account_cached()
         triggered = False
         reason = "All circuit breakers clear"
 
         # Check drawdown from high water mark (simplified - just check vs. initial)
         # In production, track high water mark over time
-        equity = float(account.equity)
-        initial_equity = float(account.last_equity)  # Previous day close
+        equity = account.equity
+        initial_equity = account.last_equity  # Previous day close
 
         if initial_equity > 0:
             daily_return = (equity - initial_equity) / initial_equity
@@ -729,8 +1051,9 @@ class DalioLite:
 
         This should be called by a cron job or scheduler daily
         """
-        # Record AutoPilot execution
+        # Record AutoPilot execution (ISO for display, epoch for health checks)
         metrics.set_timestamp("autopilot_last_run")
+        metrics.set_epoch("autopilot_last_run")
 
         # Acquire lock before any state operations
         try:
@@ -739,51 +1062,64 @@ class DalioLite:
 
         except RuntimeError as e:
             # Lock acquisition failed (timeout)
-            self.logger.error(f"Daily check aborted: {e}")
+            self.logger.error("Daily check aborted: %s", e)
             self._notify(f"Daily check failed: {e}")
             metrics.increment("daily_check_failed")
             return
 
         finally:
-            # Always flush metrics
+            # Always flush metrics and buffered log lines
             metrics.flush()
+            self._flush_logs()
 
     def _run_daily_check_impl(self, dry_run: bool = False):
         """Internal implementation of daily check (called within lock context)"""
-        self.logger.info("\n" + "="*60)
-        self.logger.info(f"DAILY CHECK - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        self.logger.info("="*60)
+        with self._broker_read_cache():
+            self.logger.info("\n" + "="*60)
+            self.logger.info("DAILY CHECK - %s", datetime.now().strftime('%Y-%m-%d %H:%M'))
+            self.logger.info("="*60)
 
-        # 1. Check circuit breakers
-        triggered, reason = self.check_circuit_breakers()
-        if triggered:
-            self.logger.warning(f"🛑 CIRCUIT BREAKER TRIGGERED: {reason}")
-            self.logger.warning("Halting rebalancing. Manual review required.")
-            self._notify(f"Circuit breaker triggered: {reason}")
-            return
-        else:
-            self.logger.info(f"✓ Risk check: {reason}")
+            # 1. Check circuit breakers
+            triggered, reason = self.check_circuit_breakers()
+            if triggered:
+                self.logger.warning("🛑 CIRCUIT BREAKER TRIGGERED: %s", reason)
+                self.logger.warning("Halting rebalancing. Manual review required.")
+                self._notify(f"Circuit breaker triggered: {reason}")
+                return
+            else:
+                self.logger.info("✓ Risk check: %s", reason)
+
+            # 2. Skip position fetch entirely while in the rebalance cooldown
+            cooldown = self._rebalance_cooldown()
+            if cooldown:
+                self.logger.info("✓ No rebalancing needed: %s", cooldown)
+                self.logger.info("="*60 + "\n")
+                return
+
+            # 3. Get current state
+            current = self.get_current_positions()
+            drift = self.calculate_drift(current)
+            self.logger.info("\nCurrent Allocation:")
+            for ticker, pct in current.items():
+                target_pct = self.config['allocation'][ticker]
+                self.logger.info("  %s: %5.1f%% (target: %.1f%%, drift: %+.1f%%)",
+                                 ticker, pct * 100, target_pct * 100, drift[ticker] * 100)
+
+            # 4. Check if rebalancing needed
+            needs_rebal, reason = self.needs_rebalancing()
+            self.logger.info("\nRebalance Check: %s", reason)
+
+            if needs_rebal:
+                self.logger.info("🔄 Rebalancing required")
+                self.execute_rebalance(dry_run=dry_run)
+                self._notify("Portfolio rebalanced")
+            else:
+                self.logger.info("✓ No rebalancing needed")
+                # Keep gauges fresh from what this check already fetched
+                self._update_metrics(drift=drift)
 
-        # 2. Get current state
-        current = self.get_current_positions()
-        self.logger.info("\nCurrent Allocation:")
-        for ticker, pct in current.items():
-            target_pct = self.config['allocation'][ticker]
-            drift = pct - target_pct
-            self.logger.info(f"  {ticker}: {pct:6.1%} (target: {target_pct:.1%}, drift: {drift:+.1%})")
-
-        # 3. Check if rebalancing needed
-        needs_rebal, reason = self.needs_rebalancing()
-        self.logger.info(f"\nRebalance Check: {reason}")
-
-        if needs_rebal:
-            self.logger.info("🔄 Rebalancing required")
-            self.execute_rebalance(dry_run=dry_run)
-            self._notify("Portfolio rebalanced")
-        else:
-            self.logger.info("✓ No rebalancing needed")
+            self.logger.info("="*60 + "\n")
 
-        self.logger.info("="*60 + "\n")
 
     def _notify(self, message: str):
         """Send notification"""
@@ -799,12 +1135,15 @@ class DalioLite:
                 f.write(f"{datetime.now().isoformat()} | {message}\n")
         elif method == 'email':
             # Send email notification
+            if not EMAIL_AVAILABLE:
+                self.logger.warning("Email notifications unavailable (send_notification not importable)")
+                return
             try:
-                from send_notification import send_daily_summary, send_circuit_breaker_alert
-                account = self.trading_client.get_account()
-                portfolio_value = float(account.portfolio_value)
-                daily_change = ((float(account.equity) - float(account.last_equity)) /
-                               float(account.last_equity) * 100) if float(account.last_equity) > 0 else 0
+                account = self._get_account_cached()
+                portfolio_value = account.portfolio_value
+                last_equity = account.last_equity
+                daily_change = ((account.equity - last_equity) /
+                               last_equity * 100) if last_equity > 0 else 0
 
                 if "rebalanced" in message.lower():
                     send_daily_summary("healthy", portfolio_value, daily_change, rebalanced=True)
@@ -813,27 +1152,32 @@ class DalioLite:
                 else:
                     send_daily_summary("healthy", portfolio_value, daily_change, rebalanced=False)
             except Exception as e:
-                self.logger.warning(f"Failed to send email notification: {e}")
+                self.logger.warning("Failed to send email notification: %s", e)
 
-    def generate_performance_report(self) -> dict:
-        """Generate performance metrics"""
-        account = self.trading_client.get_account()
+    def generate_performance_report(self, pretty: bool = False) -> dict:
+        """
+        Generate performance metrics
+
+        Args:
+            pretty: Indent the saved report (default is compact JSON)
+        """
+        account = self._get_account_cached()
 
         report = {
             'timestamp': datetime.now().isoformat(),
-            'portfolio_value': float(account.portfolio_value),
-            'cash': float(account.cash),
-            'equity': float(account.equity),
+            'portfolio_value': account.portfolio_value,
+            'cash': account.cash,
+            'equity': account.equity,
             'positions': self.get_current_positions(),
         }
 
         # Save report
         report_file = Path(f"reports/report_{datetime.now().strftime('%Y%m%d')}.json")
         report_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(report_file, 'wb') as f:
+            f.write(_json_dumps(report, indent=pretty))
 
-        self.logger.info(f"Performance report saved: {report_file}")
+        self.logger.info("Performance report saved: %s", report_file)
 
         return report
 
@@ -846,13 +1190,14 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Calculate but do not execute orders')
     parser.add_argument('--force-rebalance', action='store_true', help='Force rebalancing regardless of drift')
     parser.add_argument('--report', action='store_true', help='Generate performance report')
+    parser.add_argument('--pretty', action='store_true', help='Save the report as indented JSON')
     args = parser.parse_args()
 
     # Initialize system
     dalio = DalioLite()
 
     if args.report:
-        report = dalio.generate_performance_report()
+        report = dalio.generate_performance_report(pretty=args.pretty)
         print(json.dumps(report, indent=2))
     elif args.force_rebalance:
         dalio.execute_rebalance(dry_run=args.dry_run)
@@ -4,9 +4,7 @@ Beautiful, modern interface for your All Weather portfolio
 """
 
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
@@ -26,244 +24,442 @@ st.set_page_config(
 )
 
 # Premium custom CSS
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
+@st.cache_resource
+def _load_css() -> str:
+    """Theme <style> block, read from disk once per server process"""
+    css = (Path(__file__).parent / "assets" / "styles.css").read_text()
+    return f"<style>\n{css}</style>"
 
-    /* Global styles */
-    * {
-        font-family: 'Inter', sans-serif !important;
-    }
 
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
+# Streamlit drops anything not re-emitted on a rerun, so inject every time
+st.markdown(_load_css(), unsafe_allow_html=True)
 
-    /* Main content area */
-    .main {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    }
 
-    /* Content container */
-    .block-container {
-        padding: 2rem 3rem;
-        max-width: 1400px;
-        background: white;
-        border-radius: 20px;
-        margin: 2rem auto;
-        box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-    }
+@st.cache_resource(show_spinner=False)
+def _get_dalio():
+    """One DalioLite (and Alpaca connection) per server process, shared by every session
 
-    /* Headers */
-    h1 {
-        font-size: 3rem !important;
-        font-weight: 700 !important;
-        color: #5a67d8 !important;
-        margin-bottom: 0.5rem !important;
-    }
+    Sessions run on their own script threads; DalioLite keeps its per-check
+    broker cache thread-local so one session's check can't reset or fill
+    another's.
+    """
+    from dalio_lite import DalioLite
+    return DalioLite()
 
-    h2 {
-        font-size: 1.5rem !important;
-        font-weight: 600 !important;
-        color: #2d3748 !important;
-        margin-top: 2rem !important;
-    }
 
-    h3 {
-        font-size: 1.2rem !important;
-        font-weight: 600 !important;
-        color: #4a5568 !important;
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_account_snapshot(_client):
+    """Account numbers for the hero/metrics (reused across reruns for 30s)"""
+    account = _client.get_account()
+    return {
+        "portfolio_value": float(account.portfolio_value),
+        "cash": float(account.cash),
+        "equity": float(account.equity),
+        "last_equity": float(account.last_equity),
     }
 
-    /* Paragraph text - ensure visibility */
-    p, div, span {
-        color: #2d3748 !important;
-    }
 
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem 1rem;
-    }
+@st.cache_data(ttl=30, show_spinner=False)
+def _current_positions(_dalio, nonce):
+    """get_current_positions(); nonce changes after trades to force a refetch"""
+    return _dalio.get_current_positions()
 
-    [data-testid="stSidebar"] * {
-        color: white !important;
-    }
 
-    /* Buttons */
-    .stButton > button {
-        width: 100%;
-        border-radius: 12px !important;
-        padding: 0.75rem 1.5rem !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-        border: none !important;
-        transition: all 0.3s ease !important;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
+@st.cache_data(ttl=30, show_spinner=False)
+def _needs_rebalancing(_dalio, nonce):
+    """needs_rebalancing(); nonce changes after trades to force a refetch"""
+    return _dalio.needs_rebalancing()
 
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-    }
 
-    /* Primary button */
-    .stButton > button[kind="primary"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        color: white !important;
-    }
+@st.cache_data(ttl=30, show_spinner=False)
+def _circuit_breakers(_dalio, nonce):
+    """check_circuit_breakers(); nonce changes after trades to force a refetch"""
+    return _dalio.check_circuit_breakers()
 
-    /* Secondary button */
-    .stButton > button:not([kind="primary"]) {
-        background: white !important;
-        color: #667eea !important;
-        border: 2px solid #667eea !important;
-    }
 
-    /* Metric cards */
-    [data-testid="stMetricValue"] {
-        font-size: 2rem !important;
-        font-weight: 700 !important;
-        color: #2d3748 !important;
-    }
+@st.cache_data(max_entries=8, show_spinner=False)
+def _load_json(path, mtime_ns):
+    """Parsed JSON file; mtime_ns keys the cache so edits are picked up"""
+    with open(path, 'r') as f:
+        return json.load(f)
 
-    [data-testid="stMetricLabel"] {
-        font-size: 0.875rem !important;
-        font-weight: 600 !important;
-        color: #718096 !important;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
 
-    [data-testid="stMetricDelta"] {
-        font-size: 1rem !important;
-        font-weight: 600 !important;
-    }
+GOALS_FILE = Path("state/goals.json")
 
-    /* Info boxes */
-    .stAlert {
-        border-radius: 12px !important;
-        border: none !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1) !important;
-    }
 
-    /* Success box */
-    .stSuccess {
-        background: linear-gradient(135deg, #48bb78 0%, #38a169 100%) !important;
-        color: white !important;
-    }
+def _mtime_ns(path: Path) -> int:
+    """File mtime for cache keys (0 if the file doesn't exist yet)"""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
 
-    /* Info box */
-    .stInfo {
-        background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%) !important;
-        color: white !important;
-    }
 
-    /* Warning box */
-    .stWarning {
-        background: linear-gradient(135deg, #ed8936 0%, #dd6b20 100%) !important;
-        color: white !important;
-    }
+@st.cache_resource(max_entries=1)
+def _goal_tracker(goals_mtime_ns):
+    """GoalTracker, rebuilt only when the goals file changes (e.g. on the Goals page)"""
+    return GoalTracker(state_file=str(GOALS_FILE))
 
-    /* Error box */
-    .stError {
-        background: linear-gradient(135deg, #f56565 0%, #e53e3e 100%) !important;
-        color: white !important;
-    }
 
-    /* Dataframe */
-    .stDataFrame {
-        border-radius: 12px;
-        overflow: hidden;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    }
+def _celebrate():
+    """Balloons at most once per action, and only if the user wants them"""
+    if st.session_state.get("celebrate", True) and not st.session_state.get("_balloons_fired"):
+        st.balloons()
+        st.session_state._balloons_fired = True
 
-    /* Text area */
-    .stTextArea textarea {
-        border-radius: 12px !important;
-        border: 2px solid #e2e8f0 !important;
-        font-family: 'Monaco', monospace !important;
-        font-size: 0.875rem !important;
-    }
 
-    /* Expander */
-    .streamlit-expanderHeader {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white !important;
-        border-radius: 12px;
-        font-weight: 600;
-    }
+def _rerun_with_flash(message):
+    """Full-app rerun after a trade, carrying the confirmation over to the next run
 
-    /* Custom cards */
-    .metric-card {
-        background: white;
-        border-radius: 16px;
-        padding: 1.5rem;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        border: 1px solid #e2e8f0;
-        transition: all 0.3s ease;
-    }
+    The hero, metrics and sidebar counters were drawn with pre-trade numbers,
+    and a rerun drops whatever this run has output, so _show_flash re-emits
+    the message (and balloons) at the top of the next run instead.
+    """
+    st.session_state._flash = message
+    st.session_state._flash_celebrate = True
+    st.rerun(scope="app")
 
-    .metric-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 12px 40px rgba(0,0,0,0.15);
-    }
 
-    .status-badge {
-        display: inline-block;
-        padding: 0.5rem 1rem;
-        border-radius: 9999px;
-        font-weight: 600;
-        font-size: 0.875rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
+def _show_flash():
+    """Message (and balloons) left by _rerun_with_flash, shown once"""
+    message = st.session_state.pop("_flash", None)
+    if message:
+        st.success(message)
+    if st.session_state.pop("_flash_celebrate", False):
+        _celebrate()
 
-    .status-success {
-        background: #c6f6d5;
-        color: #22543d;
-    }
 
-    .status-warning {
-        background: #feebc8;
-        color: #7c2d12;
-    }
+def _invalidate_broker_views():
+    """Drop cached broker data after anything that may have traded"""
+    _fetch_account_snapshot.clear()
+    st.session_state.cache_nonce += 1
 
-    .status-error {
-        background: #fed7d7;
-        color: #742a2a;
-    }
 
-    .status-info {
-        background: #bee3f8;
-        color: #2c5282;
-    }
+# Hero "Total Portfolio Value" markup, filled per rerun with str.format_map
+_HERO_TMPL = """
+    <div style='text-align: center; padding: 2rem 0 1rem 0;'>
+        <div style='font-size: 1rem; color: #718096; margin-bottom: 0.5rem;'>Total Portfolio Value</div>
+        <div style='font-size: 4rem; font-weight: 700; color: #5a67d8;'>
+            ${portfolio_value:,.0f}
+        </div>
+        <div style='font-size: 1.2rem; color: {color}; margin-top: 0.5rem;'>
+            {sign}{daily_pl:,.2f} ({daily_pl_pct:+.2f}%) today
+        </div>
+    </div>
+    """
 
-    /* Pulse animation for live status */
-    @keyframes pulse {
-        0%, 100% {
-            opacity: 1;
-        }
-        50% {
-            opacity: 0.5;
-        }
-    }
 
-    .pulse {
-        animation: pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite;
-    }
+# Non-connected landing page: hero plus the three "Get Started" cards in one element
+_LANDING_HTML = """
+<div style='text-align: center; padding: 3rem 0;'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>🚀</div>
+    <h2 style='font-size: 2rem; margin-bottom: 1rem;'>Get Started in 3 Easy Steps</h2>
+</div>
+<div style='display: flex; flex-wrap: wrap; gap: 1rem; margin-bottom: 1rem;'>
+    <div class='metric-card' style='flex: 1 1 0; min-width: 200px;'>
+        <div style='font-size: 2.5rem; text-align: center; margin-bottom: 1rem;'>1️⃣</div>
+        <h3 style='text-align: center; margin-bottom: 1rem;'>Setup API Keys</h3>
+        <p style='text-align: center; color: #718096;'>Add your Alpaca API keys to the .env file</p>
+    </div>
+    <div class='metric-card' style='flex: 1 1 0; min-width: 200px;'>
+        <div style='font-size: 2.5rem; text-align: center; margin-bottom: 1rem;'>2️⃣</div>
+        <h3 style='text-align: center; margin-bottom: 1rem;'>Connect</h3>
+        <p style='text-align: center; color: #718096;'>Click "Connect to Alpaca" in the sidebar</p>
+    </div>
+    <div class='metric-card' style='flex: 1 1 0; min-width: 200px;'>
+        <div style='font-size: 2.5rem; text-align: center; margin-bottom: 1rem;'>3️⃣</div>
+        <h3 style='text-align: center; margin-bottom: 1rem;'>Run &amp; Relax</h3>
+        <p style='text-align: center; color: #718096;'>Let the system manage your portfolio automatically</p>
+    </div>
+</div>
+"""
+
+
+# Shared Plotly styling (built once per process, not per rerun)
+_PIE_COLORS = ('#667eea', '#764ba2', '#f6ad55', '#fc8181')
+_PIE_MARKER = {"colors": _PIE_COLORS}
+_PIE_TEXTFONT = {"size": 14, "color": '#2d3748', "family": 'Inter'}
+_INTRO_PIE_TEXTFONT = {**_PIE_TEXTFONT, "size": 16}
+_PIE_LAYOUT = {
+    "height": 350,
+    "showlegend": True,
+    "legend": {"orientation": "v", "yanchor": "middle", "y": 0.5, "xanchor": "left", "x": 1.1},
+    "transition_duration": 0,
+}
+_INTRO_PIE_LAYOUT = {
+    "title": "Target Allocation",
+    "height": 300,
+    "showlegend": False,
+    "paper_bgcolor": 'rgba(0,0,0,0)',
+    "plot_bgcolor": 'rgba(0,0,0,0)',
+}
+_STATIC_PLOT_CONFIG = {"staticPlot": True, "displayModeBar": False}
+_INTERACTIVE_PLOT_CONFIG = {"displayModeBar": False}
+
+
+@st.cache_resource
+def _intro_pie():
+    """Static target-allocation pie for the not-connected landing page"""
+    import plotly.graph_objects as go  # Deferred: heavy import, only needed for charts
+
+    fig = go.Figure(data=[go.Pie(
+        labels=['VTI<br>40%', 'TLT<br>30%', 'GLD<br>20%', 'DBC<br>10%'],
+        values=[40, 30, 20, 10],
+        hole=0.4,
+        marker=_PIE_MARKER,
+        textfont=_INTRO_PIE_TEXTFONT
+    )])
+    fig.update_layout(**_INTRO_PIE_LAYOUT)
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def _allocation_pie(items, title):
+    """Allocation pie for ((ticker, fraction), ...); built once per distinct input"""
+    import plotly.graph_objects as go  # Deferred: heavy import, only needed for charts
+
+    fig = go.Figure(data=[go.Pie(
+        labels=[f"{k}<br>{v:.1%}" for k, v in items],
+        values=[v for _, v in items],
+        hole=0.4,
+        marker=_PIE_MARKER,
+        textfont=_PIE_TEXTFONT
+    )])
+    # Same uirevision across rebuilds lets Plotly.js update slices in place
+    fig.update_layout(**_PIE_LAYOUT, title=title, uirevision=title)
+    return fig
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _tail_lines(path, mtime_ns, n=30, blocksize=4096):
+    """Last n lines of a file, read backwards from the end (mtime_ns keys the cache)"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b''
+        while pos > 0 and buf.count(b'\n') <= n:
+            read = min(blocksize, pos)
+            pos -= read
+            f.seek(pos)
+            buf = f.read(read) + buf
+    return b"".join(buf.splitlines(keepends=True)[-n:]).decode('utf-8', errors='replace')
+
+
+# Display formats for the allocation details table (percent columns hold 0-100)
+ALLOCATION_COLUMNS = {
+    'Current $': st.column_config.NumberColumn(format="$%,d"),
+    'Current %': st.column_config.NumberColumn(format="%.1f%%"),
+    'Target %': st.column_config.NumberColumn(format="%.1f%%"),
+    'Drift': st.column_config.NumberColumn(format="%+.1f%%"),
+}
+
+
+# ========================================
+# PAGE SECTIONS - Fragments rerun on their own, so a click inside one
+# section doesn't refetch or rebuild the others
+# ========================================
+
+@st.fragment
+def _goal_progress_section(portfolio_value):
+    """Goal progress bar under the hero value (rendered after it, never blocks it)"""
+    try:
+        tracker = _goal_tracker(_mtime_ns(GOALS_FILE))
+        progress = tracker.get_goal_progress(portfolio_value)
+
+        if progress.get("has_goal"):
+            # Goal progress bar
+            progress_pct = progress['progress_percentage']
+            st.markdown(f"""
+            <div style='background: linear-gradient(135deg, rgba(102, 126, 234, 0.1), rgba(118, 75, 162, 0.1)); padding: 1rem; border-radius: 12px; margin: 1rem 0;'>
+                <div style='font-size: 0.875rem; color: #4a5568; margin-bottom: 0.5rem;'>
+                    🎯 Goal: {progress['goal_name']} • Target: ${progress['target_amount']:,.0f} by {progress['target_year']}
+                </div>
+                <div style='background: #e2e8f0; height: 8px; border-radius: 4px; overflow: hidden;'>
+                    <div style='background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); height: 100%; width: {min(100, progress_pct):.1f}%;'></div>
+                </div>
+                <div style='font-size: 0.875rem; color: #718096; margin-top: 0.5rem;'>
+                    {progress_pct:.1f}% complete • {progress['years_remaining']} years remaining
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            # No goal - show CTA
+            st.info("🎯 **Set a financial goal** to see your progress here. Visit the Goals page to get started.", icon="💡")
+
+    except Exception:
+        # Silently fail if goal tracking isn't available
+        pass
+
+
+@st.fragment
+def _key_metrics_section(cash, equity, last_check):
+    """Cash / Equity / Last Check row, driven only by the values passed in"""
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric(
+            "💵 Cash Available",
+            f"${cash:,.2f}",
+            help="Available cash for trading"
+        )
+
+    with col2:
+        st.metric(
+            "📊 Total Equity",
+            f"${equity:,.2f}",
+            help="Current equity value"
+        )
+
+    with col3:
+        # Show last check time if available
+        if last_check:
+            last_check_time = last_check.strftime("%I:%M %p")
+            st.metric(
+                "🕐 Last Check",
+                last_check_time,
+                help="When the system last ran a rebalance check"
+            )
+        else:
+            st.metric(
+                "🕐 Last Check",
+                "Never",
+                help="Run your first daily check to start automated management"
+            )
+
+
+@st.fragment
+def _allocation_section(dalio, portfolio_value):
+    """Portfolio Allocation expander (collapsed by default)"""
+    with st.expander("📊 **Portfolio Allocation** - See current vs. target breakdown", expanded=False):
+        try:
+            current_positions = _current_positions(dalio, st.session_state.cache_nonce)
+            target_allocation = dalio.config['allocation']
+
+            # Non-zero holdings, rounded so sub-0.01% jitter reuses the cached figure;
+            # empty on day one, which skips Plotly entirely
+            held = tuple((k, round(v, 4)) for k, v in current_positions.items() if v > 1e-9)
+
+            # Two-column layout for charts
+            chart_col1, chart_col2 = st.columns(2)
+
+            with chart_col1:
+                # Current allocation pie chart
+                if held:
+                    st.plotly_chart(
+                        _allocation_pie(held, "Current Allocation"),
+                        width='stretch',
+                        config=_INTERACTIVE_PLOT_CONFIG
+                    )
+                else:
+                    st.info("📭 No positions yet - run your first rebalance!")
+
+            with chart_col2:
+                # Target allocation pie chart
+                items = tuple(target_allocation.items())
+                st.plotly_chart(
+                    _allocation_pie(items, "Target Allocation"),
+                    width='stretch',
+                    config=_STATIC_PLOT_CONFIG
+                )
+
+            # Allocation comparison table
+            st.markdown("### Allocation Details")
+
+            import pandas as pd  # Deferred until the table is actually built
+
+            # Numeric columns; Streamlit formats them client-side (and sorts numerically)
+            tickers = list(target_allocation)
+            target = np.fromiter(target_allocation.values(), dtype=np.float64, count=len(tickers))
+            current = np.fromiter(
+                (current_positions.get(t, 0.0) for t in tickers), dtype=np.float64, count=len(tickers)
+            )
+            drift = current - target
+
+            df = pd.DataFrame({
+                'Ticker': tickers,
+                'Current $': np.rint(portfolio_value * current).astype(np.int64),
+                'Current %': current * 100,
+                'Target %': target * 100,
+                'Drift': drift * 100,
+                'Status': np.where(np.abs(drift) > 0.10, '🔴', '🟢'),
+            })
+            st.dataframe(
+                df,
+                width='stretch',
+                hide_index=True,
+                column_config=ALLOCATION_COLUMNS
+            )
+
+        except Exception as e:
+            message, severity = translate_exception(e, context="Loading portfolio data")
+            handle_error_display(message, severity)
+
+
+@st.fragment
+def _system_status_section(dalio):
+    """System Status expander (collapsed by default)"""
+    with st.expander("📏 **System Status** - Check rebalance needs", expanded=False):
+        try:
+            needs_rebal, reason = _needs_rebalancing(dalio, st.session_state.cache_nonce)
+
+            if needs_rebal:
+                st.markdown("<div class='status-badge status-error'>🔴 REBALANCE NEEDED</div>", unsafe_allow_html=True)
+                st.info(reason)
+            else:
+                st.markdown("<div class='status-badge status-success'>🟢 ON TARGET</div>", unsafe_allow_html=True)
+                st.info(reason)
+
+            # Circuit breakers
+            triggered, cb_reason = _circuit_breakers(dalio, st.session_state.cache_nonce)
+            st.markdown("**Circuit Breakers:**")
+            if triggered:
+                st.markdown("<div class='status-badge status-error'>🛑 TRIGGERED</div>", unsafe_allow_html=True)
+                st.warning(cb_reason)
+            else:
+                st.markdown("<div class='status-badge status-success'>✅ ALL CLEAR</div>", unsafe_allow_html=True)
+
+        except Exception as e:
+            message, severity = translate_exception(e, context="Checking system status")
+            handle_error_display(message, severity)
+
+
+@st.fragment
+def _advanced_actions_section(dalio):
+    """Advanced Actions expander (collapsed by default)"""
+    with st.expander("⚙️ **Advanced Actions** - Force rebalance and manual controls", expanded=False):
+        st.warning("**⚠️ Warning:** Force Rebalance bypasses all safety checks and circuit breakers")
+
+        if st.button("⚡ FORCE REBALANCE", use_container_width=True):
+            with st.spinner("⚡ Executing rebalance..."):
+                st.session_state._balloons_fired = False
+                try:
+                    dalio.execute_rebalance(dry_run=False)
+                    _invalidate_broker_views()
+                    st.session_state.execution_count += 1
+                    # A fragment rerun would leave the hero, metrics and allocation
+                    # (rendered outside this fragment) showing pre-trade positions
+                    _rerun_with_flash("✅ Rebalance complete!")
+                except Exception as e:
+                    message, severity = translate_exception(e, context="Executing force rebalance")
+                    handle_error_display(message, severity)
+
+
+@st.fragment
+def _recent_activity_section():
+    """Recent Activity log expander (collapsed by default)"""
+    with st.expander("📜 **Recent Activity** - View system logs", expanded=False):
+        log_file = Path("logs/dalio_lite.log")
+        if log_file.exists():
+            try:
+                log_text = _tail_lines(str(log_file), log_file.stat().st_mtime_ns)
+                st.text_area("Log Output", log_text, height=250, help="Last 30 lines from system log", label_visibility="collapsed")
+
+            except Exception as e:
+                message, severity = translate_exception(e, context="Reading log file")
+                handle_error_display(message, severity)
+        else:
+            st.info("📭 No activity yet - run your first check to see logs!")
 
-    /* Separator */
-    hr {
-        margin: 2rem 0;
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, #e2e8f0, transparent);
-    }
-</style>
-""", unsafe_allow_html=True)
 
 # Initialize session state
 if 'connected' not in st.session_state:
@@ -274,11 +470,12 @@ if 'last_check' not in st.session_state:
     st.session_state.last_check = None
 if 'execution_count' not in st.session_state:
     st.session_state.execution_count = 0
+if 'cache_nonce' not in st.session_state:
+    st.session_state.cache_nonce = 0
 
 # Sidebar
 with st.sidebar:
-    st.markdown("### ⚙️ SETTINGS")
-    st.markdown("---")
+    st.markdown("### ⚙️ SETTINGS\n\n---")
 
     # Connection status
     env_file = Path(".env")
@@ -290,9 +487,8 @@ with st.sidebar:
         if not st.session_state.connected:
             if st.button("🔌 CONNECT TO ALPACA", type="primary"):
                 try:
-                    from dalio_lite import DalioLite
                     with st.spinner("Connecting..."):
-                        st.session_state.dalio = DalioLite()
+                        st.session_state.dalio = _get_dalio()
                         st.session_state.connected = True
                     st.rerun()
                 except Exception as e:
@@ -305,45 +501,49 @@ with st.sidebar:
             if st.button("🔌 DISCONNECT"):
                 st.session_state.connected = False
                 st.session_state.dalio = None
+                # The DalioLite is shared with other sessions, so only drop this
+                # session's handle and the cached account numbers
+                _invalidate_broker_views()
                 st.rerun()
 
     else:
         st.markdown("<div class='status-badge status-error'>❌ ENV FILE MISSING</div>", unsafe_allow_html=True)
         st.warning("Create .env file with Alpaca API keys")
 
-    st.markdown("---")
-
-    # Mode indicator
+    # Mode indicator + AutoPilot status: contiguous HTML/markdown goes out as one element
+    sidebar_parts = ["---"]
     if st.session_state.connected and st.session_state.dalio:
         mode = st.session_state.dalio.config['mode']['paper_trading']
         if mode:
-            st.markdown("<div class='status-badge status-info'>📄 PAPER TRADING</div>", unsafe_allow_html=True)
+            sidebar_parts.append("<div class='status-badge status-info'>📄 PAPER TRADING</div>")
         else:
-            st.markdown("<div class='status-badge status-error'>🚨 LIVE TRADING</div>", unsafe_allow_html=True)
-
-    st.markdown("---")
+            sidebar_parts.append("<div class='status-badge status-error'>🚨 LIVE TRADING</div>")
+    sidebar_parts += ["---", "### 🤖 AUTO-PILOT"]
 
     # AutoPilot status
-    st.markdown("### 🤖 AUTO-PILOT")
     autopilot_status_file = Path("state/autopilot_status.json")
+    autopilot_enabled = False
     if autopilot_status_file.exists():
         try:
-            with open(autopilot_status_file, 'r') as f:
-                autopilot_status = json.load(f)
+            autopilot_status = _load_json(str(autopilot_status_file), autopilot_status_file.stat().st_mtime_ns)
 
             if autopilot_status.get('enabled'):
-                st.markdown("<div class='status-badge status-success pulse'>🟢 ENABLED</div>", unsafe_allow_html=True)
-                st.markdown(f"**Schedule:** Daily at {autopilot_status.get('schedule', 'N/A')}")
+                autopilot_enabled = True
+                sidebar_parts.append("<div class='status-badge status-success pulse'>🟢 ENABLED</div>")
+                sidebar_parts.append(f"**Schedule:** Daily at {autopilot_status.get('schedule', 'N/A')}")
                 if autopilot_status.get('notifications'):
-                    st.markdown(f"📧 {autopilot_status.get('email', 'Email enabled')}")
-
-                st.info("✨ System runs automatically. You'll receive email notifications.")
+                    sidebar_parts.append(f"📧 {autopilot_status.get('email', 'Email enabled')}")
             else:
-                st.markdown("<div class='status-badge status-warning'>⏸️ DISABLED</div>", unsafe_allow_html=True)
+                sidebar_parts.append("<div class='status-badge status-warning'>⏸️ DISABLED</div>")
         except:
-            st.markdown("<div class='status-badge status-warning'>⏸️ NOT CONFIGURED</div>", unsafe_allow_html=True)
+            sidebar_parts.append("<div class='status-badge status-warning'>⏸️ NOT CONFIGURED</div>")
+        st.markdown("\n\n".join(sidebar_parts), unsafe_allow_html=True)
+
+        if autopilot_enabled:
+            st.info("✨ System runs automatically. You'll receive email notifications.")
     else:
-        st.markdown("<div class='status-badge status-warning'>⏸️ NOT CONFIGURED</div>", unsafe_allow_html=True)
+        sidebar_parts.append("<div class='status-badge status-warning'>⏸️ NOT CONFIGURED</div>")
+        st.markdown("\n\n".join(sidebar_parts), unsafe_allow_html=True)
         st.warning("Enable Auto-Pilot for hands-free portfolio management")
 
         if st.button("🚀 ENABLE AUTO-PILOT", type="primary", use_container_width=True):
@@ -358,17 +558,18 @@ with st.sidebar:
             This will schedule daily checks and email notifications.
             """)
 
-    st.markdown("---")
-
     # Quick stats
-    st.markdown("### 📊 SESSION STATS")
+    st.markdown("---\n\n### 📊 SESSION STATS")
     if st.session_state.last_check:
         st.metric("Last Check", st.session_state.last_check.strftime("%H:%M:%S"))
     st.metric("Actions", st.session_state.execution_count)
+    st.checkbox("Celebrate successes", value=True, key="celebrate")
 
-    st.markdown("---")
-    st.markdown("### 🎯 TARGET ALLOCATION")
     st.markdown("""
+    ---
+
+    ### 🎯 TARGET ALLOCATION
+
     - 📈 **VTI** - 40%
     - 📊 **TLT** - 30%
     - 🥇 **GLD** - 20%
@@ -395,44 +596,8 @@ if st.session_state.connected:
 
 # Main content
 if not st.session_state.connected:
-    # Hero section for non-connected state
-    st.markdown("""
-    <div style='text-align: center; padding: 3rem 0;'>
-        <div style='font-size: 4rem; margin-bottom: 1rem;'>🚀</div>
-        <h2 style='font-size: 2rem; margin-bottom: 1rem;'>Get Started in 3 Easy Steps</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown("""
-        <div class='metric-card'>
-            <div style='font-size: 2.5rem; text-align: center; margin-bottom: 1rem;'>1️⃣</div>
-            <h3 style='text-align: center; margin-bottom: 1rem;'>Setup API Keys</h3>
-            <p style='text-align: center; color: #718096;'>Add your Alpaca API keys to the .env file</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("""
-        <div class='metric-card'>
-            <div style='font-size: 2.5rem; text-align: center; margin-bottom: 1rem;'>2️⃣</div>
-            <h3 style='text-align: center; margin-bottom: 1rem;'>Connect</h3>
-            <p style='text-align: center; color: #718096;'>Click "Connect to Alpaca" in the sidebar</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown("""
-        <div class='metric-card'>
-            <div style='font-size: 2.5rem; text-align: center; margin-bottom: 1rem;'>3️⃣</div>
-            <h3 style='text-align: center; margin-bottom: 1rem;'>Run & Relax</h3>
-            <p style='text-align: center; color: #718096;'>Let the system manage your portfolio automatically</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    st.markdown("<br>", unsafe_allow_html=True)
+    # Hero + three step cards as one static element (flexbox instead of st.columns)
+    st.html(_LANDING_HTML)
 
     # What is Dalio Lite section
     st.markdown("---")
@@ -458,34 +623,28 @@ if not st.session_state.connected:
 
     with col2:
         # Simple allocation chart
-        fig = go.Figure(data=[go.Pie(
-            labels=['VTI<br>40%', 'TLT<br>30%', 'GLD<br>20%', 'DBC<br>10%'],
-            values=[40, 30, 20, 10],
-            hole=0.4,
-            marker=dict(colors=['#667eea', '#764ba2', '#f6ad55', '#fc8181']),
-            textfont=dict(size=16, color='#2d3748', family='Inter')
-        )])
-        fig.update_layout(
-            title="Target Allocation",
-            height=300,
-            showlegend=False,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
+        st.plotly_chart(
+            _intro_pie(),
+            width='stretch',
+            config=_STATIC_PLOT_CONFIG
         )
-        st.plotly_chart(fig, width='stretch')
 
 else:
     # Connected state - Full dashboard with progressive disclosure
     dalio = st.session_state.dalio
 
+    # Confirmation from a trade on the previous run
+    _show_flash()
+
     # Fetch account data
     try:
-        account = dalio.trading_client.get_account()
-        portfolio_value = float(account.portfolio_value)
-        cash = float(account.cash)
-        equity = float(account.equity)
-        daily_pl = float(account.equity) - float(account.last_equity)
-        daily_pl_pct = (daily_pl / float(account.last_equity) * 100) if float(account.last_equity) > 0 else 0
+        account = _fetch_account_snapshot(dalio.trading_client)
+        portfolio_value = account["portfolio_value"]
+        cash = account["cash"]
+        equity = account["equity"]
+        last_equity = account["last_equity"]
+        daily_pl = equity - last_equity
+        daily_pl_pct = (daily_pl / last_equity * 100) if last_equity > 0 else 0
 
     except Exception as e:
         message, severity = translate_exception(e, context="Fetching account data")
@@ -501,46 +660,16 @@ else:
     # ========================================
 
     # Large portfolio value display
-    st.markdown(f"""
-    <div style='text-align: center; padding: 2rem 0 1rem 0;'>
-        <div style='font-size: 1rem; color: #718096; margin-bottom: 0.5rem;'>Total Portfolio Value</div>
-        <div style='font-size: 4rem; font-weight: 700; color: #5a67d8;'>
-            ${portfolio_value:,.0f}
-        </div>
-        <div style='font-size: 1.2rem; color: {'#48bb78' if daily_pl >= 0 else '#f56565'}; margin-top: 0.5rem;'>
-            {'+' if daily_pl >= 0 else ''}{daily_pl:,.2f} ({daily_pl_pct:+.2f}%) today
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HERO_TMPL.format_map({
+        'portfolio_value': portfolio_value,
+        'color': '#48bb78' if daily_pl >= 0 else '#f56565',
+        'sign': '+' if daily_pl >= 0 else '',
+        'daily_pl': daily_pl,
+        'daily_pl_pct': daily_pl_pct,
+    }), unsafe_allow_html=True)
 
     # Goal progress (if goal exists)
-    try:
-        tracker = GoalTracker()
-        progress = tracker.get_goal_progress(portfolio_value)
-
-        if progress.get("has_goal"):
-            # Goal progress bar
-            progress_pct = progress['progress_percentage']
-            st.markdown(f"""
-            <div style='background: linear-gradient(135deg, rgba(102, 126, 234, 0.1), rgba(118, 75, 162, 0.1)); padding: 1rem; border-radius: 12px; margin: 1rem 0;'>
-                <div style='font-size: 0.875rem; color: #4a5568; margin-bottom: 0.5rem;'>
-                    🎯 Goal: {progress['goal_name']} • Target: ${progress['target_amount']:,.0f} by {progress['target_year']}
-                </div>
-                <div style='background: #e2e8f0; height: 8px; border-radius: 4px; overflow: hidden;'>
-                    <div style='background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); height: 100%; width: {min(100, progress_pct):.1f}%;'></div>
-                </div>
-                <div style='font-size: 0.875rem; color: #718096; margin-top: 0.5rem;'>
-                    {progress_pct:.1f}% complete • {progress['years_remaining']} years remaining
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            # No goal - show CTA
-            st.info("🎯 **Set a financial goal** to see your progress here. Visit the Goals page to get started.", icon="💡")
-
-    except Exception:
-        # Silently fail if goal tracking isn't available
-        pass
+    _goal_progress_section(portfolio_value)
 
     st.markdown("---")
 
@@ -548,37 +677,7 @@ else:
     # KEY METRICS - Reduced to 3 most important
     # ========================================
 
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.metric(
-            "💵 Cash Available",
-            f"${cash:,.2f}",
-            help="Available cash for trading"
-        )
-
-    with col2:
-        st.metric(
-            "📊 Total Equity",
-            f"${equity:,.2f}",
-            help="Current equity value"
-        )
-
-    with col3:
-        # Show last check time if available
-        if 'last_check' in st.session_state and st.session_state.last_check:
-            last_check_time = st.session_state.last_check.strftime("%I:%M %p")
-            st.metric(
-                "🕐 Last Check",
-                last_check_time,
-                help="When the system last ran a rebalance check"
-            )
-        else:
-            st.metric(
-                "🕐 Last Check",
-                "Never",
-                help="Run your first daily check to start automated management"
-            )
+    _key_metrics_section(cash, equity, st.session_state.get('last_check'))
 
     st.markdown("---")
 
@@ -593,13 +692,13 @@ else:
     with action_col1:
         if st.button("🔄 RUN DAILY CHECK", type="primary", use_container_width=True, help="Check if rebalancing is needed and execute if necessary"):
             with st.spinner("🔄 Running daily check..."):
+                st.session_state._balloons_fired = False
                 try:
                     dalio.run_daily_check(dry_run=False)
+                    _invalidate_broker_views()
                     st.session_state.last_check = datetime.now()
                     st.session_state.execution_count += 1
-                    st.success("✅ Daily check complete!")
-                    st.balloons()
-                    st.rerun()
+                    _rerun_with_flash("✅ Daily check complete!")
                 except Exception as e:
                     message, severity = translate_exception(e, context="Running daily check")
                     handle_error_display(message, severity)
@@ -612,7 +711,6 @@ else:
                     st.session_state.last_check = datetime.now()
                     st.session_state.execution_count += 1
                     st.success("✅ Dry run complete!")
-                    st.rerun()
                 except Exception as e:
                     message, severity = translate_exception(e, context="Running dry run")
                     handle_error_display(message, severity)
@@ -634,140 +732,10 @@ else:
     # DETAILED SECTIONS - All in Expanders (Progressive Disclosure)
     # ========================================
 
-    # Portfolio Allocation Details (Collapsed by default)
-    with st.expander("📊 **Portfolio Allocation** - See current vs. target breakdown", expanded=False):
-        try:
-            current_positions = dalio.get_current_positions()
-            target_allocation = dalio.config['allocation']
-
-            # Two-column layout for charts
-            chart_col1, chart_col2 = st.columns(2)
-
-            with chart_col1:
-                # Current allocation pie chart
-                if sum(current_positions.values()) > 0:
-                    fig = go.Figure(data=[go.Pie(
-                        labels=[f"{k}<br>{v:.1%}" for k, v in current_positions.items()],
-                        values=list(current_positions.values()),
-                        hole=0.4,
-                        marker=dict(colors=['#667eea', '#764ba2', '#f6ad55', '#fc8181']),
-                        textfont=dict(size=14, color='#2d3748', family='Inter')
-                    )])
-                    fig.update_layout(
-                        title="Current Allocation",
-                        height=350,
-                        showlegend=True,
-                        legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.1)
-                    )
-                    st.plotly_chart(fig, width='stretch')
-                else:
-                    st.info("📭 No positions yet - run your first rebalance!")
-
-            with chart_col2:
-                # Target allocation pie chart
-                fig = go.Figure(data=[go.Pie(
-                    labels=[f"{k}<br>{v:.1%}" for k, v in target_allocation.items()],
-                    values=list(target_allocation.values()),
-                    hole=0.4,
-                    marker=dict(colors=['#667eea', '#764ba2', '#f6ad55', '#fc8181']),
-                    textfont=dict(size=14, color='#2d3748', family='Inter')
-                )])
-                fig.update_layout(
-                    title="Target Allocation",
-                    height=350,
-                    showlegend=True,
-                    legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.1)
-                )
-                st.plotly_chart(fig, width='stretch')
-
-            # Allocation comparison table
-            st.markdown("### Allocation Details")
-
-            allocation_data = []
-            for ticker in target_allocation.keys():
-                current_pct = current_positions.get(ticker, 0.0)
-                target_pct = target_allocation[ticker]
-                drift = current_pct - target_pct
-                drift_pct = (drift / target_pct * 100) if target_pct > 0 else 0
-
-                # Calculate dollar values
-                current_value = portfolio_value * current_pct
-                target_value = portfolio_value * target_pct
-
-                allocation_data.append({
-                    'Ticker': ticker,
-                    'Current $': f"${current_value:,.0f}",
-                    'Current %': f"{current_pct:.1%}",
-                    'Target %': f"{target_pct:.1%}",
-                    'Drift': f"{drift:+.1%}",
-                    'Status': '🔴' if abs(drift) > 0.10 else '🟢'
-                })
-
-            df = pd.DataFrame(allocation_data)
-            st.dataframe(df, width='stretch', hide_index=True)
-
-        except Exception as e:
-            message, severity = translate_exception(e, context="Loading portfolio data")
-            handle_error_display(message, severity)
-
-    # System Status (Collapsed by default)
-    with st.expander("📏 **System Status** - Check rebalance needs", expanded=False):
-        try:
-            needs_rebal, reason = dalio.needs_rebalancing()
-
-            if needs_rebal:
-                st.markdown("<div class='status-badge status-error'>🔴 REBALANCE NEEDED</div>", unsafe_allow_html=True)
-                st.info(reason)
-            else:
-                st.markdown("<div class='status-badge status-success'>🟢 ON TARGET</div>", unsafe_allow_html=True)
-                st.info(reason)
-
-            # Circuit breakers
-            triggered, cb_reason = dalio.check_circuit_breakers()
-            st.markdown("**Circuit Breakers:**")
-            if triggered:
-                st.markdown("<div class='status-badge status-error'>🛑 TRIGGERED</div>", unsafe_allow_html=True)
-                st.warning(cb_reason)
-            else:
-                st.markdown("<div class='status-badge status-success'>✅ ALL CLEAR</div>", unsafe_allow_html=True)
-
-        except Exception as e:
-            message, severity = translate_exception(e, context="Checking system status")
-            handle_error_display(message, severity)
-
-    # Advanced Actions (Collapsed by default)
-    with st.expander("⚙️ **Advanced Actions** - Force rebalance and manual controls", expanded=False):
-        st.warning("**⚠️ Warning:** Force Rebalance bypasses all safety checks and circuit breakers")
-
-        if st.button("⚡ FORCE REBALANCE", use_container_width=True):
-            with st.spinner("⚡ Executing rebalance..."):
-                try:
-                    dalio.execute_rebalance(dry_run=False)
-                    st.session_state.execution_count += 1
-                    st.success("✅ Rebalance complete!")
-                    st.balloons()
-                    st.rerun()
-                except Exception as e:
-                    message, severity = translate_exception(e, context="Executing force rebalance")
-                    handle_error_display(message, severity)
-
-    # Recent Activity Log (Collapsed by default)
-    with st.expander("📜 **Recent Activity** - View system logs", expanded=False):
-        log_file = Path("logs/dalio_lite.log")
-        if log_file.exists():
-            try:
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    recent_lines = lines[-30:]
-
-                log_text = "".join(recent_lines)
-                st.text_area("Log Output", log_text, height=250, help="Last 30 lines from system log", label_visibility="collapsed")
-
-            except Exception as e:
-                message, severity = translate_exception(e, context="Reading log file")
-                handle_error_display(message, severity)
-        else:
-            st.info("📭 No activity yet - run your first check to see logs!")
+    _allocation_section(dalio, portfolio_value)
+    _system_status_section(dalio)
+    _advanced_actions_section(dalio)
+    _recent_activity_section()
 
 # Footer
 st.markdown("---")
@@ -14,8 +14,9 @@ Usage:
         handle_error_display(message, severity)
 """
 
+import re
 from enum import Enum
-from typing import Tuple
+from typing import FrozenSet, NamedTuple
 import streamlit as st
 from alpaca.common.exceptions import APIError
 
@@ -28,7 +29,230 @@ class ErrorSeverity(Enum):
     CRITICAL = "critical"
 
 
-def translate_exception(exception: Exception, context: str = "") -> Tuple[str, ErrorSeverity]:
+class ErrorResponse(NamedTuple):
+    """Translated error: unpacks as (message, severity) like a plain tuple"""
+    message: str
+    severity: ErrorSeverity
+
+
+# Shared responses for fixed messages; only branches that interpolate build one per call
+_MSG_401 = ErrorResponse(
+    "🔐 **Invalid API credentials**\n\n"
+    "Your Alpaca API keys appear to be invalid or expired.\n\n"
+    "**What to do:**\n"
+    "1. Go to the **Setup Guide** page (in the sidebar)\n"
+    "2. Verify your API keys in the Alpaca dashboard\n"
+    "3. Update your credentials in the `.env` file\n"
+    "4. Restart the application\n\n"
+    "💡 *Tip: Make sure you're using Paper Trading keys if testing.*",
+    ErrorSeverity.ERROR
+)
+
+_MSG_429 = ErrorResponse(
+    "⏱️ **Rate limit reached**\n\n"
+    "We've made too many requests to Alpaca in a short time.\n\n"
+    "**What to do:**\n"
+    "- Wait 60 seconds and refresh the page\n"
+    "- This is temporary and will resolve automatically\n\n"
+    "💡 *This helps protect your account and keeps the service stable.*",
+    ErrorSeverity.WARNING
+)
+
+_MSG_SERVER_ERROR = ErrorResponse(
+    "🌐 **Alpaca service temporarily unavailable**\n\n"
+    "Alpaca's servers are experiencing issues. This is not a problem with Dalio Lite.\n\n"
+    "**What to do:**\n"
+    "- Wait a few minutes and refresh\n"
+    "- Check [Alpaca status page](https://status.alpaca.markets/) for updates\n"
+    "- Your portfolio data is safe\n\n"
+    "💡 *Market data and trading may resume shortly.*",
+    ErrorSeverity.WARNING
+)
+
+_MSG_MARKET_CLOSED = ErrorResponse(
+    "🕒 **Market is currently closed**\n\n"
+    "You attempted an action that requires the market to be open.\n\n"
+    "**U.S. Market Hours:**\n"
+    "- Monday-Friday: 9:30 AM - 4:00 PM ET\n"
+    "- Closed on weekends and holidays\n\n"
+    "💡 *You can still view your portfolio and plan strategies while markets are closed.*",
+    ErrorSeverity.INFO
+)
+
+_MSG_INSUFFICIENT_FUNDS = ErrorResponse(
+    "💰 **Insufficient funds**\n\n"
+    "Your account doesn't have enough buying power for this action.\n\n"
+    "**What to do:**\n"
+    "- Check your available buying power in the dashboard\n"
+    "- For paper trading: Reset your paper account in Alpaca dashboard\n"
+    "- For live trading: Add funds to your account\n\n"
+    "💡 *Your current portfolio value and buying power are shown on the dashboard.*",
+    ErrorSeverity.WARNING
+)
+
+_MSG_PERMISSION = ErrorResponse(
+    "🔒 **File access denied**\n\n"
+    "The application doesn't have permission to access a required file.\n\n"
+    "**What to do:**\n"
+    "1. Check file permissions in the `state/` directory\n"
+    "2. Ensure the application has write access\n"
+    "3. Try restarting the application\n\n"
+    "🔧 *This usually happens after deployment or permission changes.*",
+    ErrorSeverity.ERROR
+)
+
+_MSG_NETWORK = ErrorResponse(
+    "📡 **Connection issue**\n\n"
+    "We're having trouble connecting to Alpaca's servers.\n\n"
+    "**What to do:**\n"
+    "1. Check your internet connection\n"
+    "2. Refresh the page in 30 seconds\n"
+    "3. If the problem persists, check [Alpaca status](https://status.alpaca.markets/)\n\n"
+    "💡 *Your portfolio data is cached and remains safe.*",
+    ErrorSeverity.WARNING
+)
+
+_MSG_JSON = ErrorResponse(
+    "⚠️ **Configuration file corrupted**\n\n"
+    "A settings file appears to be corrupted or improperly formatted.\n\n"
+    "**What to do:**\n"
+    "1. Check the `state/` directory for `.json` files\n"
+    "2. The file may need to be reset to defaults\n"
+    "3. Backup and delete the problematic file - it will be recreated\n\n"
+    "🔧 *Your portfolio data at Alpaca is safe - this only affects local settings.*",
+    ErrorSeverity.WARNING
+)
+
+# Alpaca status codes with a fixed message (5xx is handled as a range)
+_API_STATUS_MESSAGES = {401: _MSG_401, 429: _MSG_429}
+
+
+# Message keywords that drive classification, gathered in one pass over the
+# message. Category precedence stays in the code below, not in match order.
+_ERROR_KEYWORDS = re.compile(
+    r"(?P<network>connection|network|timeout)"
+    r"|(?P<funds>insufficient|buying power)"
+    r"|(?P<market>market)"
+    r"|(?P<closed>closed|not open)"
+    r"|(?P<decode>decode)",
+    re.IGNORECASE
+)
+
+
+def _message_keywords(exception: Exception) -> FrozenSet[str]:
+    return frozenset(m.lastgroup for m in _ERROR_KEYWORDS.finditer(str(exception)))
+
+
+def _is_json_error(exception: Exception, keywords: FrozenSet[str]) -> bool:
+    return "decode" in keywords or "json" in str(type(exception)).lower()
+
+
+def _handle_api_error(exception: Exception, keywords: FrozenSet[str]) -> ErrorResponse:
+    """Translate an Alpaca APIError (status code first, then message patterns)"""
+    status_code = exception.status_code
+
+    # Authentication (401) and rate limiting (429)
+    fixed = _API_STATUS_MESSAGES.get(status_code)
+    if fixed is not None:
+        return fixed
+
+    # Server errors (500, 502, 503, 504)
+    if status_code is not None and status_code >= 500:
+        return _MSG_SERVER_ERROR
+
+    # Market closed (403 or specific message patterns)
+    if "market" in keywords and "closed" in keywords:
+        return _MSG_MARKET_CLOSED
+
+    # Insufficient funds
+    if "funds" in keywords:
+        return _MSG_INSUFFICIENT_FUNDS
+
+    if "network" in keywords:
+        return _MSG_NETWORK
+
+    if _is_json_error(exception, keywords):
+        return _MSG_JSON
+
+    # Generic Alpaca API error
+    return ErrorResponse(
+        "🔌 **API communication error**\n\n"
+        "We encountered an issue communicating with Alpaca.\n\n"
+        "**What to do:**\n"
+        "- Refresh the page\n"
+        "- Check the Setup Guide to verify your configuration\n"
+        "- Visit [Alpaca status](https://status.alpaca.markets/) for service updates\n\n"
+        f"🔧 *Error code: {status_code if status_code is not None else 'unknown'}*",
+        ErrorSeverity.ERROR
+    )
+
+
+def _permission_handler(exception: Exception) -> ErrorResponse:
+    return _MSG_PERMISSION
+
+
+def _file_not_found_handler(exception: Exception) -> ErrorResponse:
+    return ErrorResponse(
+        "📁 **Configuration file missing**\n\n"
+        "A required configuration file wasn't found.\n\n"
+        "**What to do:**\n"
+        "1. Check that all files from setup are present\n"
+        "2. Review the Setup Guide for required files\n"
+        "3. The file may need to be created: check the documentation\n\n"
+        f"🔧 *Missing file: {getattr(exception, 'filename', 'unknown')}*",
+        ErrorSeverity.ERROR
+    )
+
+
+def _key_handler(exception: Exception) -> ErrorResponse:
+    missing_key = str(exception).strip("'\"")
+    return ErrorResponse(
+        "⚙️ **Configuration incomplete**\n\n"
+        f"Required setting is missing: `{missing_key}`\n\n"
+        "**What to do:**\n"
+        "1. Review the Setup Guide in the sidebar\n"
+        "2. Check your `.env` file for required variables\n"
+        "3. Ensure all setup steps are completed\n\n"
+        "🔧 *This usually happens during initial setup.*",
+        ErrorSeverity.ERROR
+    )
+
+
+def _value_handler(exception: Exception) -> ErrorResponse:
+    return ErrorResponse(
+        "📊 **Invalid data encountered**\n\n"
+        "The application received data in an unexpected format.\n\n"
+        "**What to do:**\n"
+        "- Refresh the page\n"
+        "- If this persists, check your recent inputs\n"
+        "- Try clearing your browser cache\n\n"
+        f"🔧 *Technical detail: {str(exception)[:100]}*",
+        ErrorSeverity.WARNING
+    )
+
+
+# Exception class -> handler, looked up along type(exception).__mro__.
+# File errors are checked before the JSON heuristic, data errors after it
+# (JSONDecodeError is a ValueError and must not be reported as bad input).
+_FILE_HANDLERS = {
+    PermissionError: _permission_handler,
+    FileNotFoundError: _file_not_found_handler,
+}
+_DATA_HANDLERS = {
+    KeyError: _key_handler,
+    ValueError: _value_handler,
+}
+
+
+def _lookup_handler(handlers: dict, exc_type: type):
+    for klass in exc_type.__mro__:
+        handler = handlers.get(klass)
+        if handler is not None:
+            return handler
+    return None
+
+
+def translate_exception(exception: Exception, context: str = "") -> ErrorResponse:
     """
     Translate technical exception to user-friendly message.
 
@@ -37,174 +261,34 @@ def translate_exception(exception: Exception, context: str = "") -> Tuple[str, E
         context: Additional context about where the error occurred
 
     Returns:
-        Tuple of (user_friendly_message, severity_level)
+        ErrorResponse(message, severity); unpacks as (user_friendly_message, severity_level)
     """
+    keywords = _message_keywords(exception)
 
-    # Alpaca API Authentication Errors (401)
-    if isinstance(exception, APIError) and exception.status_code == 401:
-        return (
-            "🔐 **Invalid API credentials**\n\n"
-            "Your Alpaca API keys appear to be invalid or expired.\n\n"
-            "**What to do:**\n"
-            "1. Go to the **Setup Guide** page (in the sidebar)\n"
-            "2. Verify your API keys in the Alpaca dashboard\n"
-            "3. Update your credentials in the `.env` file\n"
-            "4. Restart the application\n\n"
-            "💡 *Tip: Make sure you're using Paper Trading keys if testing.*",
-            ErrorSeverity.ERROR
-        )
-
-    # Alpaca API Rate Limiting (429)
-    if isinstance(exception, APIError) and exception.status_code == 429:
-        return (
-            "⏱️ **Rate limit reached**\n\n"
-            "We've made too many requests to Alpaca in a short time.\n\n"
-            "**What to do:**\n"
-            "- Wait 60 seconds and refresh the page\n"
-            "- This is temporary and will resolve automatically\n\n"
-            "💡 *This helps protect your account and keeps the service stable.*",
-            ErrorSeverity.WARNING
-        )
-
-    # Alpaca API Server Errors (500, 502, 503, 504)
-    if isinstance(exception, APIError) and exception.status_code >= 500:
-        return (
-            "🌐 **Alpaca service temporarily unavailable**\n\n"
-            "Alpaca's servers are experiencing issues. This is not a problem with Dalio Lite.\n\n"
-            "**What to do:**\n"
-            "- Wait a few minutes and refresh\n"
-            "- Check [Alpaca status page](https://status.alpaca.markets/) for updates\n"
-            "- Your portfolio data is safe\n\n"
-            "💡 *Market data and trading may resume shortly.*",
-            ErrorSeverity.WARNING
-        )
-
-    # Alpaca API Market Closed (403 or specific message patterns)
+    # Alpaca API errors (APIError is resolved at call time so it can be swapped in tests)
     if isinstance(exception, APIError):
-        error_message = str(exception).lower()
-        if "market" in error_message and ("closed" in error_message or "not open" in error_message):
-            return (
-                "🕒 **Market is currently closed**\n\n"
-                "You attempted an action that requires the market to be open.\n\n"
-                "**U.S. Market Hours:**\n"
-                "- Monday-Friday: 9:30 AM - 4:00 PM ET\n"
-                "- Closed on weekends and holidays\n\n"
-                "💡 *You can still view your portfolio and plan strategies while markets are closed.*",
-                ErrorSeverity.INFO
-            )
-
-    # Alpaca Insufficient Funds
-    if isinstance(exception, APIError):
-        error_message = str(exception).lower()
-        if "insufficient" in error_message or "buying power" in error_message:
-            return (
-                "💰 **Insufficient funds**\n\n"
-                "Your account doesn't have enough buying power for this action.\n\n"
-                "**What to do:**\n"
-                "- Check your available buying power in the dashboard\n"
-                "- For paper trading: Reset your paper account in Alpaca dashboard\n"
-                "- For live trading: Add funds to your account\n\n"
-                "💡 *Your current portfolio value and buying power are shown on the dashboard.*",
-                ErrorSeverity.WARNING
-            )
-
-    # Network/Connection Errors
-    if "connection" in str(exception).lower() or "network" in str(exception).lower() or "timeout" in str(exception).lower():
-        return (
-            "📡 **Connection issue**\n\n"
-            "We're having trouble connecting to Alpaca's servers.\n\n"
-            "**What to do:**\n"
-            "1. Check your internet connection\n"
-            "2. Refresh the page in 30 seconds\n"
-            "3. If the problem persists, check [Alpaca status](https://status.alpaca.markets/)\n\n"
-            "💡 *Your portfolio data is cached and remains safe.*",
-            ErrorSeverity.WARNING
-        )
-
-    # File Permission Errors
-    if isinstance(exception, PermissionError):
-        return (
-            "🔒 **File access denied**\n\n"
-            "The application doesn't have permission to access a required file.\n\n"
-            "**What to do:**\n"
-            "1. Check file permissions in the `state/` directory\n"
-            "2. Ensure the application has write access\n"
-            "3. Try restarting the application\n\n"
-            "🔧 *This usually happens after deployment or permission changes.*",
-            ErrorSeverity.ERROR
-        )
+        return _handle_api_error(exception, keywords)
 
-    # File Not Found Errors
-    if isinstance(exception, FileNotFoundError):
-        return (
-            "📁 **Configuration file missing**\n\n"
-            "A required configuration file wasn't found.\n\n"
-            "**What to do:**\n"
-            "1. Check that all files from setup are present\n"
-            "2. Review the Setup Guide for required files\n"
-            "3. The file may need to be created: check the documentation\n\n"
-            f"🔧 *Missing file: {getattr(exception, 'filename', 'unknown')}*",
-            ErrorSeverity.ERROR
-        )
-
-    # JSON Decode Errors (corrupted state files)
-    if "json" in str(type(exception)).lower() or "decode" in str(exception).lower():
-        return (
-            "⚠️ **Configuration file corrupted**\n\n"
-            "A settings file appears to be corrupted or improperly formatted.\n\n"
-            "**What to do:**\n"
-            "1. Check the `state/` directory for `.json` files\n"
-            "2. The file may need to be reset to defaults\n"
-            "3. Backup and delete the problematic file - it will be recreated\n\n"
-            "🔧 *Your portfolio data at Alpaca is safe - this only affects local settings.*",
-            ErrorSeverity.WARNING
-        )
+    if "network" in keywords:
+        return _MSG_NETWORK
 
-    # Key Errors (missing configuration)
-    if isinstance(exception, KeyError):
-        missing_key = str(exception).strip("'\"")
-        return (
-            "⚙️ **Configuration incomplete**\n\n"
-            f"Required setting is missing: `{missing_key}`\n\n"
-            "**What to do:**\n"
-            "1. Review the Setup Guide in the sidebar\n"
-            "2. Check your `.env` file for required variables\n"
-            "3. Ensure all setup steps are completed\n\n"
-            "🔧 *This usually happens during initial setup.*",
-            ErrorSeverity.ERROR
-        )
+    exc_type = type(exception)
+    handler = _lookup_handler(_FILE_HANDLERS, exc_type)
+    if handler is not None:
+        return handler(exception)
 
-    # Value Errors (invalid input/data)
-    if isinstance(exception, ValueError):
-        return (
-            "📊 **Invalid data encountered**\n\n"
-            "The application received data in an unexpected format.\n\n"
-            "**What to do:**\n"
-            "- Refresh the page\n"
-            "- If this persists, check your recent inputs\n"
-            "- Try clearing your browser cache\n\n"
-            f"🔧 *Technical detail: {str(exception)[:100]}*",
-            ErrorSeverity.WARNING
-        )
+    if _is_json_error(exception, keywords):
+        return _MSG_JSON
 
-    # Generic Alpaca API Error
-    if isinstance(exception, APIError):
-        return (
-            "🔌 **API communication error**\n\n"
-            "We encountered an issue communicating with Alpaca.\n\n"
-            "**What to do:**\n"
-            "- Refresh the page\n"
-            "- Check the Setup Guide to verify your configuration\n"
-            "- Visit [Alpaca status](https://status.alpaca.markets/) for service updates\n\n"
-            f"🔧 *Error code: {getattr(exception, 'status_code', 'unknown')}*",
-            ErrorSeverity.ERROR
-        )
+    handler = _lookup_handler(_DATA_HANDLERS, exc_type)
+    if handler is not None:
+        return handler(exception)
 
     # Fallback for unknown errors
-    error_type = type(exception).__name__
+    error_type = exc_type.__name__
     error_message = str(exception)[:200]  # Limit length
 
-    return (
+    return ErrorResponse(
         "❌ **Something unexpected happened**\n\n"
         "We encountered an error we didn't anticipate.\n\n"
         "**What to do:**\n"
@@ -217,6 +301,15 @@ def translate_exception(exception: Exception, context: str = "") -> Tuple[str, E
     )
 
 
+# Severity -> (Streamlit alert function name, icon)
+_DISPLAY_STYLES = {
+    ErrorSeverity.INFO: ("info", "ℹ️"),
+    ErrorSeverity.WARNING: ("warning", "⚠️"),
+    ErrorSeverity.ERROR: ("error", "❌"),
+    ErrorSeverity.CRITICAL: ("error", "🚨"),
+}
+
+
 def handle_error_display(message: str, severity: ErrorSeverity, context: str = "") -> None:
     """
     Display error message in Streamlit UI with appropriate styling.
@@ -226,18 +319,18 @@ def handle_error_display(message: str, severity: ErrorSeverity, context: str = "
         severity: Error severity level
         context: Optional additional context to display
     """
+    display = _DISPLAY_STYLES.get(severity)
+    if display is None:
+        return
 
     if context:
-        message = f"**Context:** {context}\n\n{message}"
-
-    if severity == ErrorSeverity.INFO:
-        st.info(message, icon="ℹ️")
-    elif severity == ErrorSeverity.WARNING:
-        st.warning(message, icon="⚠️")
-    elif severity == ErrorSeverity.ERROR:
-        st.error(message, icon="❌")
-    elif severity == ErrorSeverity.CRITICAL:
-        st.error(message, icon="🚨")
+        # Separate caption so the (multi-KB) message is passed through uncopied
+        st.caption(f"**Context:** {context}")
+
+    method, icon = display
+    getattr(st, method)(message, icon=icon)
+
+    if severity == ErrorSeverity.CRITICAL:
         # For critical errors, also show in sidebar
         with st.sidebar:
             st.error("**Critical Error** - Check main page", icon="🚨")
@@ -263,10 +356,32 @@ def safe_execute(func, context: str = "", fallback=None, show_error: bool = True
             fallback={}
         )
     """
+    if not show_error:
+        return try_execute(func, fallback)
+
     try:
         return func()
     except Exception as e:
-        if show_error:
-            message, severity = translate_exception(e, context=context)
-            handle_error_display(message, severity, context=context)
+        message, severity = translate_exception(e, context=context)
+        handle_error_display(message, severity, context=context)
+        return fallback
+
+
+def try_execute(func, fallback=None):
+    """
+    Execute a function silently, returning fallback on any exception.
+
+    The quiet counterpart of safe_execute for polling/refresh paths where
+    nobody will see the error: no translation or display work is done.
+
+    Args:
+        func: Callable to execute
+        fallback: Value to return if function fails (default: None)
+
+    Returns:
+        Result of func() if successful, fallback value if error occurs
+    """
+    try:
+        return func()
+    except Exception:
         return fallback
@@ -18,12 +18,21 @@ Usage:
     progress = tracker.get_goal_progress(current_portfolio_value=75000)
 """
 
+import copy
+import functools
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Set, Tuple
 from enum import Enum
 
+import numpy as np
+
+try:
+    import orjson  # C JSON parser/encoder for the goals state file
+except ImportError:
+    orjson = None
+
 
 class GoalType(Enum):
     """Supported financial goal types"""
@@ -35,6 +44,94 @@ class GoalType(Enum):
     CUSTOM = "custom"
 
 
+_VALID_GOAL_TYPES = frozenset(g.value for g in GoalType)
+_CUSTOM_GOAL_VALUE = GoalType.CUSTOM.value
+
+_DEFAULT_GOAL_NAMES = {
+    "retirement": "Retirement Fund",
+    "house": "Home Down Payment",
+    "education": "Education Fund",
+    "financial_independence": "Financial Independence",
+    "wealth_building": "Wealth Building",
+    "custom": "Financial Goal"
+}
+
+
+# State directories already created by this process (skips mkdir on later inits)
+_ENSURED_DIRS: Set[Path] = set()
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_goals_file(path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a goals file (mtime_ns/size key the cache so edits invalidate it)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=256)
+def _projection_core(
+    current_amount: float,
+    years: int,
+    target_amount: float,
+    annual_return: float,
+    monthly_contribution: float
+) -> Tuple[float, float, float, bool, float, float, float]:
+    """
+    Pure compound-interest math behind GoalTracker.calculate_projection.
+
+    Every input is part of the cache key, so Streamlit reruns with the same
+    portfolio value and assumptions are a dict hit instead of recomputation.
+
+    Returns:
+        (total_fv, fv_no_contributions, fv_contributions, on_track,
+         shortfall, surplus, required_monthly)
+    """
+    monthly_return = annual_return / 12
+    months = years * 12
+
+    # Compound growth factors, computed once and reused below
+    growth_annual = (1.0 + annual_return) ** years
+    if monthly_return > 0:
+        # Future value of $1/month: ((1 + r)^n - 1) / r
+        annuity_factor = ((1.0 + monthly_return) ** months - 1.0) / monthly_return
+    else:
+        annuity_factor = months
+
+    # Calculate future value without contributions
+    fv_no_contributions = current_amount * growth_annual
+
+    # Calculate future value of contributions
+    if monthly_contribution > 0:
+        fv_contributions = monthly_contribution * annuity_factor
+    else:
+        fv_contributions = monthly_contribution * months
+
+    # Total future value
+    total_fv = fv_no_contributions + fv_contributions
+
+    # Calculate if on track
+    on_track = total_fv >= target_amount
+    shortfall = max(0, target_amount - total_fv)
+    surplus = max(0, total_fv - target_amount)
+
+    # Calculate required monthly contribution to reach goal
+    if fv_no_contributions < target_amount:
+        # Need contributions to reach goal
+        remaining_needed = target_amount - fv_no_contributions
+        required_monthly = remaining_needed / annuity_factor
+    else:
+        # Already on track without contributions
+        required_monthly = 0
+
+    return (
+        total_fv, fv_no_contributions, fv_contributions, on_track,
+        shortfall, surplus, max(0, required_monthly)
+    )
+
+
 class GoalTracker:
     """
     Manages user financial goals and projections.
@@ -51,23 +148,26 @@ class GoalTracker:
             state_file: Path to JSON file storing goal state
         """
         self.state_file = Path(state_file)
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        parent = self.state_file.parent
+        if parent not in _ENSURED_DIRS:
+            parent.mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(parent)
         self.goals = self._load_goals()
 
     def _load_goals(self) -> Dict:
-        """Load goals from state file."""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                # If file is corrupted, return empty state
-                return self._empty_state()
-        else:
+        """Load goals from state file (parsed once per file version)."""
+        try:
+            st = self.state_file.stat()
+            return copy.deepcopy(
+                _parse_goals_file(str(self.state_file.resolve()), st.st_mtime_ns, st.st_size)
+            )
+        except (json.JSONDecodeError, IOError):
+            # Missing or corrupted file: return empty state
             return self._empty_state()
 
     def _empty_state(self) -> Dict:
         """Return empty goal state structure."""
+        timestamp = datetime.now().isoformat()
         return {
             "primary_goal": None,
             "secondary_goals": [],
@@ -76,15 +176,29 @@ class GoalTracker:
                 "monthly_contribution": 0,
                 "inflation_rate": 0.03
             },
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": timestamp,
+            "updated_at": timestamp
         }
 
-    def _save_goals(self) -> None:
-        """Save goals to state file."""
-        self.goals["updated_at"] = datetime.now().isoformat()
-        with open(self.state_file, 'w') as f:
-            json.dump(self.goals, f, indent=2)
+    def _save_goals(self, now: Optional[datetime] = None) -> None:
+        """Save goals to state file (one compact write, then atomic rename)."""
+        self.goals["updated_at"] = (now or datetime.now()).isoformat()
+        if orjson is not None:
+            payload = orjson.dumps(self.goals)
+        else:
+            payload = json.dumps(self.goals, separators=(",", ":")).encode()
+        temp_file = self.state_file.with_name(f".{self.state_file.name}.tmp")
+        try:
+            f = open(temp_file, 'wb')
+        except FileNotFoundError:
+            # State directory removed since it was ensured; recreate it
+            temp_file.parent.mkdir(parents=True, exist_ok=True)
+            f = open(temp_file, 'wb')
+        with f:
+            f.write(payload)
+        temp_file.replace(self.state_file)
+        # A rewrite within the same mtime tick must not serve the old parse
+        _parse_goals_file.cache_clear()
 
     def set_primary_goal(
         self,
@@ -107,14 +221,13 @@ class GoalTracker:
         Returns:
             Dictionary with goal details and initial projections
         """
-        # Validate goal type
-        try:
-            GoalType(goal_type)
-        except ValueError:
-            goal_type = GoalType.CUSTOM.value
+        # Validate goal type (unknown types become custom goals)
+        if goal_type not in _VALID_GOAL_TYPES:
+            goal_type = _CUSTOM_GOAL_VALUE
 
-        # Calculate years until goal
-        current_year = datetime.now().year
+        # Calculate years until goal (one clock read for the whole operation)
+        now = datetime.now()
+        current_year = now.year
         years_to_goal = target_year - current_year
 
         if years_to_goal <= 0:
@@ -128,7 +241,7 @@ class GoalTracker:
             "target_year": target_year,
             "years_to_goal": years_to_goal,
             "current_amount": current_amount,
-            "created_at": datetime.now().isoformat()
+            "created_at": now.isoformat()
         }
 
         # Calculate initial projection
@@ -142,21 +255,13 @@ class GoalTracker:
 
         # Save as primary goal
         self.goals["primary_goal"] = goal
-        self._save_goals()
+        self._save_goals(now)
 
         return goal
 
     def _default_goal_name(self, goal_type: str) -> str:
         """Generate default name for goal type."""
-        names = {
-            "retirement": "Retirement Fund",
-            "house": "Home Down Payment",
-            "education": "Education Fund",
-            "financial_independence": "Financial Independence",
-            "wealth_building": "Wealth Building",
-            "custom": "Financial Goal"
-        }
-        return names.get(goal_type, "Financial Goal")
+        return _DEFAULT_GOAL_NAMES.get(goal_type, "Financial Goal")
 
     def calculate_projection(
         self,
@@ -185,41 +290,10 @@ class GoalTracker:
             monthly_contribution = self.goals["assumptions"]["monthly_contribution"]
 
         annual_return = self.goals["assumptions"]["annual_return_rate"]
-        monthly_return = annual_return / 12
-        months = years * 12
-
-        # Calculate future value without contributions
-        fv_no_contributions = current_amount * ((1 + annual_return) ** years)
-
-        # Calculate future value of contributions
-        if monthly_contribution > 0 and monthly_return > 0:
-            fv_contributions = monthly_contribution * (
-                ((1 + monthly_return) ** months - 1) / monthly_return
-            )
-        else:
-            fv_contributions = monthly_contribution * months
-
-        # Total future value
-        total_fv = fv_no_contributions + fv_contributions
-
-        # Calculate if on track
-        on_track = total_fv >= target_amount
-        shortfall = max(0, target_amount - total_fv)
-        surplus = max(0, total_fv - target_amount)
-
-        # Calculate required monthly contribution to reach goal
-        if current_amount * ((1 + annual_return) ** years) < target_amount:
-            # Need contributions to reach goal
-            remaining_needed = target_amount - (current_amount * ((1 + annual_return) ** years))
-            if monthly_return > 0:
-                required_monthly = remaining_needed / (
-                    ((1 + monthly_return) ** months - 1) / monthly_return
-                )
-            else:
-                required_monthly = remaining_needed / months
-        else:
-            # Already on track without contributions
-            required_monthly = 0
+        (total_fv, fv_no_contributions, fv_contributions, on_track,
+         shortfall, surplus, required_monthly) = _projection_core(
+            current_amount, years, target_amount, annual_return, monthly_contribution
+        )
 
         return {
             "target_amount": target_amount,
@@ -229,12 +303,87 @@ class GoalTracker:
             "on_track": on_track,
             "shortfall": shortfall,
             "surplus": surplus,
-            "required_monthly_contribution": max(0, required_monthly),
+            "required_monthly_contribution": required_monthly,
             "years_to_goal": years,
             "annual_return_assumed": annual_return,
             "monthly_contribution": monthly_contribution
         }
 
+    def calculate_projection_batch(
+        self,
+        current_amounts,
+        years,
+        target_amounts,
+        monthly_contributions=None,
+        annual_returns=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_projection for what-if sweeps.
+
+        Inputs are array-likes broadcast against each other, so e.g. a grid of
+        contributions x return rates is evaluated in one pass instead of a
+        Python loop over calculate_projection.
+
+        Args:
+            current_amounts: Starting portfolio values
+            years: Years until goal
+            target_amounts: Target dollar amounts
+            monthly_contributions: Monthly contributions (default: assumption)
+            annual_returns: Annual return rates (default: assumption)
+
+        Returns:
+            Dictionary of element-wise np.ndarray projection fields
+        """
+        if monthly_contributions is None:
+            monthly_contributions = self.goals["assumptions"]["monthly_contribution"]
+        if annual_returns is None:
+            annual_returns = self.goals["assumptions"]["annual_return_rate"]
+
+        current, years, target, contribution, annual_return = np.broadcast_arrays(
+            np.asarray(current_amounts, dtype=float),
+            np.asarray(years),
+            np.asarray(target_amounts, dtype=float),
+            np.asarray(monthly_contributions, dtype=float),
+            np.asarray(annual_returns, dtype=float)
+        )
+
+        monthly_return = annual_return / 12
+        months = years * 12
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth_annual = np.power(1.0 + annual_return, years)
+            annuity_factor = np.where(
+                monthly_return > 0,
+                (np.power(1.0 + monthly_return, months) - 1.0) / monthly_return,
+                months
+            )
+
+            fv_no_contributions = current * growth_annual
+            fv_contributions = np.where(
+                contribution > 0, contribution * annuity_factor, contribution * months
+            )
+            total_fv = fv_no_contributions + fv_contributions
+
+            required_monthly = np.where(
+                fv_no_contributions < target,
+                (target - fv_no_contributions) / annuity_factor,
+                0.0
+            )
+
+        return {
+            "target_amount": target,
+            "projected_amount": total_fv,
+            "growth_from_current": fv_no_contributions - current,
+            "growth_from_contributions": fv_contributions,
+            "on_track": total_fv >= target,
+            "shortfall": np.maximum(0, target - total_fv),
+            "surplus": np.maximum(0, total_fv - target),
+            "required_monthly_contribution": np.maximum(0, required_monthly),
+            "years_to_goal": years,
+            "annual_return_assumed": annual_return,
+            "monthly_contribution": contribution
+        }
+
     def get_goal_progress(self, current_portfolio_value: float) -> Dict:
         """
         Get current progress toward primary goal.
@@ -313,20 +462,21 @@ class GoalTracker:
         Returns:
             Dictionary with goal details
         """
+        now = datetime.now()
         goal = {
             "goal_type": goal_type,
             "goal_name": goal_name or self._default_goal_name(goal_type),
             "target_amount": target_amount,
             "target_year": target_year,
-            "years_to_goal": target_year - datetime.now().year,
-            "created_at": datetime.now().isoformat()
+            "years_to_goal": target_year - now.year,
+            "created_at": now.isoformat()
         }
 
         if "secondary_goals" not in self.goals:
             self.goals["secondary_goals"] = []
 
         self.goals["secondary_goals"].append(goal)
-        self._save_goals()
+        self._save_goals(now)
 
         return goal
 
@@ -1,194 +1,224 @@
 """Health check system for operational status."""
 
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
-from metrics_collector import metrics
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Dict, NamedTuple, Tuple, Union
+from metrics_collector import metrics, read_metrics
 from pathlib import Path
 
+# Default metrics snapshot written by MetricsCollector
+_METRICS_PATH = Path("monitoring/metrics.json")
+
+# Upper bound for a whole check_all run; a check still running past it is reported as a warning
+CHECK_TIMEOUT_SECONDS = 5.0
+
+# Shared across check_all calls (threads are spawned on first use, then reused)
+_CHECK_POOL = ThreadPoolExecutor(max_workers=5, thread_name_prefix="health-check")
+
+
+class CheckResult(NamedTuple):
+    """Outcome of one check; the message is only formatted by format_result()."""
+    status: str
+    template: str
+    args: tuple = ()
+
+
+def format_result(result: CheckResult) -> Dict:
+    """Render a check result as {"status", "message"} for display."""
+    message = result.template.format(*result.args) if result.args else result.template
+    return {"status": result.status, "message": message}
+
+
+# Message templates (filled in by format_result)
+_TMPL_FAILED = "Check failed: {}"
+_TMPL_TIMEOUT = "Check timed out after {:.0f}s"
+_TMPL_AUTOPILOT_OVERDUE = "AutoPilot last ran {:.1f} hours ago (expected: daily)"
+_TMPL_AUTOPILOT_LATE = "AutoPilot last ran {:.1f} hours ago"
+_TMPL_AUTOPILOT_OK = "Last ran {:.1f} hours ago"
+_TMPL_SUCCESS_RATE = "Success rate: {:.1f}% ({}/{})"
+_TMPL_CIRCUIT_BREAKER = "Circuit breaker triggered {} times"
+_TMPL_API_ERRORS = "API error rate: {:.1f}% ({}/{})"
+_TMPL_DRIFT_HIGH = "Max drift: {:.1f}% (should rebalance)"
+_TMPL_DRIFT_STALE = "{} days since last rebalance"
+_TMPL_DRIFT_OK = "Drift: {:.1f}%, Last rebalance: {} days ago"
+
+# Fixed-message results, shared instead of rebuilt on every check
+_NO_METRICS_FILE = CheckResult("warning", "No metrics file found")
+_AUTOPILOT_NEVER_RUN = CheckResult("warning", "AutoPilot never run")
+_NO_REBALANCES = CheckResult("healthy", "No rebalances yet")
+_NO_CIRCUIT_BREAKER = CheckResult("healthy", "No circuit breaker activations")
+
 
 class HealthChecker:
     """Check system health and raise alerts."""
 
+    # (result key, method) for every check run by check_all
+    _CHECKS = (
+        ("autopilot", "_check_autopilot"),
+        ("rebalance_success_rate", "_check_rebalance_success_rate"),
+        ("circuit_breaker", "_check_circuit_breaker"),
+        ("api_errors", "_check_api_errors"),
+        ("drift", "_check_drift"),
+    )
+
+    def __init__(self, metrics_file: Union[str, Path] = _METRICS_PATH):
+        self._metrics_path = Path(metrics_file)
+
     def check_all(self) -> Tuple[str, Dict]:
         """
         Run all health checks.
 
+        metrics.json (plus any newer delta log entries) is read and parsed
+        once and the result is shared by every check. Checks run concurrently,
+        so latency is the slowest check rather than the sum (bounded by
+        CHECK_TIMEOUT_SECONDS).
+
         Returns:
             (status, details) where status is "healthy", "warning", or "critical"
         """
-        checks = {
-            "autopilot": self._check_autopilot(),
-            "rebalance_success_rate": self._check_rebalance_success_rate(),
-            "circuit_breaker": self._check_circuit_breaker(),
-            "api_errors": self._check_api_errors(),
-            "drift": self._check_drift()
-        }
-
-        # Aggregate status
-        if any(c["status"] == "critical" for c in checks.values()):
-            overall_status = "critical"
-        elif any(c["status"] == "warning" for c in checks.values()):
-            overall_status = "warning"
-        else:
-            overall_status = "healthy"
+        results = self._results()
+        checks = {name: format_result(result) for name, result in results.items()}
+        return self._overall_status(results), checks
 
-        return overall_status, checks
-
-    def _check_autopilot(self) -> Dict:
+    def _results(self) -> Dict[str, CheckResult]:
+        """Unformatted result of every check, in _CHECKS order."""
+        now = datetime.now()
+        try:
+            data = read_metrics(self._metrics_path)
+        except Exception as e:
+            return self._unreadable_metrics(e)
+        return self._run_checks(data, now)
+
+    @staticmethod
+    def _overall_status(results: Dict[str, CheckResult]) -> str:
+        """Aggregate status: critical beats warning beats healthy."""
+        statuses = {result.status for result in results.values()}
+        if "critical" in statuses:
+            return "critical"
+        elif "warning" in statuses:
+            return "warning"
+        return "healthy"
+
+    def _run_checks(self, data: Dict, now: datetime) -> Dict[str, CheckResult]:
+        """Run every check on the shared pool, keeping _CHECKS order in the result."""
+        futures = {
+            name: _CHECK_POOL.submit(getattr(self, method), data, now)
+            for name, method in self._CHECKS
+        }
+        deadline = time.monotonic() + CHECK_TIMEOUT_SECONDS
+
+        checks = {}
+        for name, future in futures.items():
+            try:
+                checks[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                checks[name] = CheckResult("warning", _TMPL_TIMEOUT, (CHECK_TIMEOUT_SECONDS,))
+        return checks
+
+    @classmethod
+    def _unreadable_metrics(cls, error: Exception) -> Dict[str, CheckResult]:
+        """Results for every check when metrics.json is missing or unparsable."""
+        failed = CheckResult("warning", _TMPL_FAILED, (error,))
+        checks = {name: failed for name, _ in cls._CHECKS}
+        if isinstance(error, FileNotFoundError):
+            checks["autopilot"] = _NO_METRICS_FILE
+        return checks
+
+    def _check_autopilot(self, data: Dict, now: datetime) -> CheckResult:
         """Check if AutoPilot is running on schedule."""
         try:
-            # Load metrics
-            metrics_file = Path("monitoring/metrics.json")
-            if not metrics_file.exists():
-                return {"status": "warning", "message": "No metrics file found"}
-
-            with open(metrics_file, 'r') as f:
-                data = json.load(f)
-
-            last_run_str = data.get("autopilot_last_run")
-            if not last_run_str:
-                return {"status": "warning", "message": "AutoPilot never run"}
+            last_run_epoch = data.get("autopilot_last_run_epoch")
+            if last_run_epoch is not None:
+                hours_since = (time.time() - last_run_epoch) / 3600
+            else:
+                # Metrics written before the epoch gauge existed only carry the ISO string
+                last_run_str = data.get("autopilot_last_run")
+                if not last_run_str:
+                    return _AUTOPILOT_NEVER_RUN
 
-            last_run = datetime.fromisoformat(last_run_str)
-            hours_since = (datetime.now() - last_run).total_seconds() / 3600
+                last_run = datetime.fromisoformat(last_run_str)
+                hours_since = (now - last_run).total_seconds() / 3600
 
             if hours_since > 48:  # 2 days
-                return {
-                    "status": "critical",
-                    "message": f"AutoPilot last ran {hours_since:.1f} hours ago (expected: daily)"
-                }
+                return CheckResult("critical", _TMPL_AUTOPILOT_OVERDUE, (hours_since,))
             elif hours_since > 30:  # 1.25 days
-                return {
-                    "status": "warning",
-                    "message": f"AutoPilot last ran {hours_since:.1f} hours ago"
-                }
+                return CheckResult("warning", _TMPL_AUTOPILOT_LATE, (hours_since,))
             else:
-                return {
-                    "status": "healthy",
-                    "message": f"Last ran {hours_since:.1f} hours ago"
-                }
+                return CheckResult("healthy", _TMPL_AUTOPILOT_OK, (hours_since,))
 
         except Exception as e:
-            return {"status": "warning", "message": f"Check failed: {e}"}
+            return CheckResult("warning", _TMPL_FAILED, (e,))
 
-    def _check_rebalance_success_rate(self) -> Dict:
+    def _check_rebalance_success_rate(self, data: Dict, now: datetime) -> CheckResult:
         """Check rebalance success rate."""
         try:
-            metrics_file = Path("monitoring/metrics.json")
-            with open(metrics_file, 'r') as f:
-                data = json.load(f)
-
             total = data.get("rebalance_total", 0)
             success = data.get("rebalance_success", 0)
-            failed = data.get("rebalance_failed", 0)
 
             if total == 0:
-                return {"status": "healthy", "message": "No rebalances yet"}
+                return _NO_REBALANCES
 
             success_rate = (success / total) * 100
 
             if success_rate < 50:
-                return {
-                    "status": "critical",
-                    "message": f"Success rate: {success_rate:.1f}% ({success}/{total})"
-                }
+                status = "critical"
             elif success_rate < 80:
-                return {
-                    "status": "warning",
-                    "message": f"Success rate: {success_rate:.1f}% ({success}/{total})"
-                }
+                status = "warning"
             else:
-                return {
-                    "status": "healthy",
-                    "message": f"Success rate: {success_rate:.1f}% ({success}/{total})"
-                }
+                status = "healthy"
+            return CheckResult(status, _TMPL_SUCCESS_RATE, (success_rate, success, total))
 
         except Exception as e:
-            return {"status": "warning", "message": f"Check failed: {e}"}
+            return CheckResult("warning", _TMPL_FAILED, (e,))
 
-    def _check_circuit_breaker(self) -> Dict:
+    def _check_circuit_breaker(self, data: Dict, now: datetime) -> CheckResult:
         """Check if circuit breaker has triggered recently."""
         try:
-            metrics_file = Path("monitoring/metrics.json")
-            with open(metrics_file, 'r') as f:
-                data = json.load(f)
-
             triggered_count = data.get("circuit_breaker_triggered", 0)
 
             if triggered_count > 0:
-                return {
-                    "status": "critical",
-                    "message": f"Circuit breaker triggered {triggered_count} times"
-                }
+                return CheckResult("critical", _TMPL_CIRCUIT_BREAKER, (triggered_count,))
             else:
-                return {
-                    "status": "healthy",
-                    "message": "No circuit breaker activations"
-                }
+                return _NO_CIRCUIT_BREAKER
 
         except Exception as e:
-            return {"status": "warning", "message": f"Check failed: {e}"}
+            return CheckResult("warning", _TMPL_FAILED, (e,))
 
-    def _check_api_errors(self) -> Dict:
+    def _check_api_errors(self, data: Dict, now: datetime) -> CheckResult:
         """Check API error rate."""
         try:
-            metrics_file = Path("monitoring/metrics.json")
-            with open(metrics_file, 'r') as f:
-                data = json.load(f)
-
             api_errors = data.get("api_errors", 0)
             api_calls = data.get("api_calls_total", 1)  # Avoid division by zero
 
             error_rate = (api_errors / api_calls) * 100
 
             if error_rate > 10:
-                return {
-                    "status": "critical",
-                    "message": f"API error rate: {error_rate:.1f}% ({api_errors}/{api_calls})"
-                }
+                status = "critical"
             elif error_rate > 5:
-                return {
-                    "status": "warning",
-                    "message": f"API error rate: {error_rate:.1f}% ({api_errors}/{api_calls})"
-                }
+                status = "warning"
             else:
-                return {
-                    "status": "healthy",
-                    "message": f"API error rate: {error_rate:.1f}% ({api_errors}/{api_calls})"
-                }
+                status = "healthy"
+            return CheckResult(status, _TMPL_API_ERRORS, (error_rate, api_errors, api_calls))
 
         except Exception as e:
-            return {"status": "warning", "message": f"Check failed: {e}"}
+            return CheckResult("warning", _TMPL_FAILED, (e,))
 
-    def _check_drift(self) -> Dict:
+    def _check_drift(self, data: Dict, now: datetime) -> CheckResult:
         """Check portfolio drift."""
         try:
-            metrics_file = Path("monitoring/metrics.json")
-            with open(metrics_file, 'r') as f:
-                data = json.load(f)
-
             drift_max_pct = data.get("drift_max_pct", 0)
             days_since_rebalance = data.get("days_since_rebalance", 0)
 
             if drift_max_pct > 15:
-                return {
-                    "status": "warning",
-                    "message": f"Max drift: {drift_max_pct:.1f}% (should rebalance)"
-                }
+                return CheckResult("warning", _TMPL_DRIFT_HIGH, (drift_max_pct,))
             elif days_since_rebalance > 60:
-                return {
-                    "status": "warning",
-                    "message": f"{days_since_rebalance} days since last rebalance"
-                }
+                return CheckResult("warning", _TMPL_DRIFT_STALE, (days_since_rebalance,))
             else:
-                return {
-                    "status": "healthy",
-                    "message": f"Drift: {drift_max_pct:.1f}%, Last rebalance: {days_since_rebalance} days ago"
-                }
+                return CheckResult("healthy", _TMPL_DRIFT_OK, (drift_max_pct, days_since_rebalance))
 
         except Exception as e:
-            return {"status": "warning", "message": f"Check failed: {e}"}
+            return CheckResult("warning", _TMPL_FAILED, (e,))
 
 
 # Global instance
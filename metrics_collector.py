@@ -1,117 +1,455 @@
 """Metrics collection for Dalio Lite observability."""
 
+import atexit
+import functools
+import itertools
 import json
+import logging
+import os
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
-from threading import Lock
+from typing import Dict, Iterator, Optional, Union
+from threading import Event, Lock, Thread
 from collections import defaultdict
 
+import numpy as np
+from filelock import FileLock
+
+try:
+    import orjson  # C JSON encoder/decoder for the metrics file
+except ImportError:
+    orjson = None
+
+
+def _dumps_metrics(data: Dict) -> bytes:
+    """Serialize metrics as indented UTF-8 JSON (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, indent=2).encode()
+
+
+def _dumps_log_line(data: Dict) -> bytes:
+    """Serialize one compact, newline-terminated delta log entry"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, separators=(',', ':')).encode() + b"\n"
+
+
+def loads_metrics(payload: bytes) -> Dict:
+    """Parse metrics JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def read_metrics(metrics_file: Path) -> Dict:
+    """
+    Read the metrics snapshot with any newer delta log entries applied.
+
+    Entries are ordered by their log_seq, not wall-clock time (so clock or
+    DST changes can't reorder them). log_seq is shared by every process
+    writing this file: it is assigned under the metrics file lock. Entries
+    at or below the snapshot's log_seq were already folded in by a
+    compaction, so they are skipped; a torn final line (crash mid-append)
+    is ignored.
+
+    Raises:
+        FileNotFoundError: if no snapshot has been written yet
+    """
+    data = loads_metrics(metrics_file.read_bytes())
+    try:
+        with open(metrics_file.with_suffix('.log'), 'rb') as log:
+            for line in log:
+                try:
+                    entry = loads_metrics(line)
+                except ValueError:
+                    continue
+                if entry.get("log_seq", 0) > data.get("log_seq", 0):
+                    data.update(entry)
+    except FileNotFoundError:
+        pass
+    return data
+
+
+def _last_log_seq(log_file: Path) -> int:
+    """log_seq of the last complete entry in the delta log (0 if there is none)"""
+    try:
+        with open(log_file, 'rb') as log:
+            size = log.seek(0, os.SEEK_END)
+            log.seek(max(0, size - LOG_TAIL_BYTES))
+            tail = log.read()
+    except FileNotFoundError:
+        return 0
+    for line in reversed(tail.splitlines()):
+        try:
+            return loads_metrics(line).get("log_seq", 0)
+        except ValueError:
+            continue  # torn last line, or the partial first line of the tail
+    return 0
+
+
+def _write_fd(fd: int, payload: bytes) -> None:
+    """Write all of payload to fd with raw os.write (normally a single syscall)."""
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_all(path: Path, payload: bytes) -> None:
+    """Write payload to path, replacing its contents."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_fd(fd, payload)
+    finally:
+        os.close(fd)
+
+
+# Samples kept per histogram (oldest evicted first)
+HISTOGRAM_SIZE = 1000
+
+# Coalescing window for request_flush(): at most one write per interval
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# Delta log size that triggers compaction into a full metrics.json snapshot
+LOG_COMPACT_BYTES = 1024 * 1024
+
+# Bytes read from the end of the delta log to find its last log_seq (well
+# above the size of one entry, which holds at most every metric once)
+LOG_TAIL_BYTES = 64 * 1024
+
+# Seconds to wait for another process's metrics write
+FILE_LOCK_TIMEOUT = 10
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+class RingHist:
+    """
+    Fixed-capacity histogram samples in a packed float64 ring buffer.
+
+    Once full, each new sample overwrites the oldest one. Stats read the
+    filled region directly, since they don't depend on sample order.
+    """
+
+    __slots__ = ("buf", "n", "i")
+
+    def __init__(self, capacity: int = HISTOGRAM_SIZE):
+        self.buf = np.empty(capacity, dtype=np.float64)
+        self.n = 0  # samples held
+        self.i = 0  # next slot to write
+
+    def record(self, value: float):
+        """Add a sample, evicting the oldest when full."""
+        self.buf[self.i] = value
+        self.i = (self.i + 1) % self.buf.size
+        if self.n < self.buf.size:
+            self.n += 1
+
+    def samples(self) -> np.ndarray:
+        """View of the held samples (unordered once the buffer has wrapped)."""
+        return self.buf[:self.n]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, index: int) -> float:
+        """Sample by age: 0 is the oldest held sample, -1 the newest."""
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("histogram index out of range")
+        return float(self.buf[(self.i - self.n + index) % self.buf.size])
+
 
 class MetricsCollector:
     """
     Collects and persists operational metrics.
 
-    Thread-safe singleton for recording metrics from any part of the application.
-    Writes metrics to JSON file periodically for dashboard consumption.
-    """
+    Thread-safe; the application shares one instance via get_metrics()
+    (or the module-level `metrics`). Writes metrics to JSON file
+    periodically for dashboard consumption.
 
-    _instance = None
-    _lock = Lock()
-
-    def __new__(cls):
-        """Singleton pattern for global metrics collection."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self, metrics_file: str = "monitoring/metrics.json"):
-        """Initialize metrics collector (only once)."""
-        if getattr(self, '_initialized', False):
-            return
+    Several processes (dashboard, autopilot) may write the same file.
+    Writes are serialized by a file lock, and each writes only the metrics
+    it changed, so a compaction keeps the other processes' values. Values
+    are absolute: a metric changed by two processes is last-writer-wins.
+    """
 
+    def __init__(self, metrics_file: str = "monitoring/metrics.json",
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        """Initialize metrics collector."""
         self.metrics_file = Path(metrics_file)
         self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        self._temp_file = self.metrics_file.with_suffix('.tmp')
+        self.log_file = self.metrics_file.with_suffix('.log')
+        # Held around every append and snapshot, across processes
+        self._file_lock = FileLock(str(self.metrics_file.with_suffix('.lock')), timeout=FILE_LOCK_TIMEOUT)
 
         # Metrics storage
         self.counters: Dict[str, int] = defaultdict(int)
         self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, List[float]] = defaultdict(list)
-        self.timestamps: Dict[str, str] = {}
+        self.histograms: Dict[str, RingHist] = defaultdict(RingHist)
+        # time.time_ns() when set here; ISO strings as loaded from disk
+        self.timestamps: Dict[str, Union[int, str]] = {}
 
-        self._write_lock = Lock()
+        # Lock-free +1 counters: next() on itertools.count is a single C call,
+        # so it is atomic under the GIL. Each flush read also advances the
+        # count, so reads are tracked and subtracted.
+        self._unit_counts: Dict[str, Iterator[int]] = {}
+        self._unit_reads: Dict[str, int] = {}
+
+        # One lock per metric kind so producers of different kinds never
+        # contend; _flush_lock orders whole flushes (snapshot + write).
+        # Timestamps need none: a single dict store and dict() copy are
+        # each atomic under the GIL.
+        self._counter_lock = Lock()
+        self._gauge_lock = Lock()
+        self._hist_lock = Lock()
+        self._flush_lock = Lock()
+
+        # Deferred flushing (background thread started on first request_flush)
+        self.flush_interval = flush_interval
+        self._dirty = Event()
+        self._stop = Event()
+        self._flusher = None
+        self._flusher_start_lock = Lock()
+
+        # Append-only delta log used by deferred flushes. _persisted holds the
+        # last value this process wrote (snapshot or log) per metric, so each
+        # entry only carries what changed; values are absolute, so replay is
+        # last-wins. Entries are numbered by log_seq (see _next_seq); a
+        # snapshot records the last one it covers.
+        self._log_fd = None
+        self._log_bytes = 0
+        self._persisted: Dict = {}
 
         # Load existing metrics
         self._load_metrics()
 
-        self._initialized = True
-
     def increment(self, metric_name: str, value: int = 1):
-        """Increment a counter metric."""
-        with self._write_lock:
+        """Increment a counter metric (lock-free for the common +1 case)."""
+        if value == 1:
+            ticks = self._unit_counts.get(metric_name)
+            if ticks is None:
+                ticks = self._unit_counts.setdefault(metric_name, itertools.count())
+            next(ticks)
+            return
+
+        with self._counter_lock:
             self.counters[metric_name] += value
 
     def set_gauge(self, metric_name: str, value: float):
         """Set a gauge metric (current value)."""
-        with self._write_lock:
+        with self._gauge_lock:
             self.gauges[metric_name] = value
 
     def record_duration(self, metric_name: str, duration_seconds: float):
         """Record a duration measurement (histogram)."""
-        with self._write_lock:
-            self.histograms[metric_name].append(duration_seconds)
-            # Keep last 1000 measurements
-            if len(self.histograms[metric_name]) > 1000:
-                self.histograms[metric_name] = self.histograms[metric_name][-1000:]
+        with self._hist_lock:
+            # Ring buffer overwrites the oldest sample once HISTOGRAM_SIZE is reached
+            self.histograms[metric_name].record(duration_seconds)
 
     def set_timestamp(self, metric_name: str):
-        """Set a timestamp metric (ISO 8601)."""
-        with self._write_lock:
-            self.timestamps[metric_name] = datetime.now().isoformat()
+        """Set a timestamp metric (written as local ISO 8601 by flush)."""
+        self.timestamps[metric_name] = time.time_ns()
+
+    def set_epoch(self, metric_name: str, t: Optional[float] = None):
+        """Record a point in time as Unix epoch seconds (stored as gauge `<name>_epoch`)."""
+        with self._gauge_lock:
+            self.gauges[f"{metric_name}_epoch"] = time.time() if t is None else t
+
+    def _changed(self, values: Dict) -> Dict:
+        """Values that differ from what this process last wrote"""
+        persisted = self._persisted
+        return {
+            key: value for key, value in values.items()
+            if persisted.get(key, _MISSING) != value
+        }
+
+    def _snapshot(self, with_histograms: bool = True):
+        """
+        Copy the current metrics (caller holds _flush_lock).
+
+        Producer locks are held only while the dicts are copied.
+        """
+        with self._counter_lock, self._gauge_lock, self._hist_lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = {
+                name: hist.samples().copy()
+                for name, hist in self.histograms.items() if hist.n
+            } if with_histograms else {}
+        timestamps = {
+            name: value if isinstance(value, str) else datetime.fromtimestamp(value / 1e9).isoformat()
+            for name, value in dict(self.timestamps).items()
+        }
+
+        for name, ticks in self._unit_counts.copy().items():
+            reads = self._unit_reads.get(name, 0)
+            self._unit_reads[name] = reads + 1
+            counters[name] = counters.get(name, 0) + next(ticks) - reads
+
+        return counters, gauges, histograms, timestamps
 
     def flush(self):
-        """Write metrics to disk."""
-        with self._write_lock:
-            # Calculate histogram stats
+        """
+        Write a full metrics snapshot to disk.
+
+        This is also the delta log compaction: the snapshot folds in the
+        log (including other processes' entries) and the log is then
+        truncated, all under the file lock. Metrics this process hasn't
+        changed since its last write keep their on-disk values. Stats, JSON
+        encoding and the file write run on a copy, outside the producer
+        locks.
+        """
+        with self._flush_lock:
+            counters, gauges, histograms, timestamps = self._snapshot()
+            own = {**counters, **gauges, **timestamps}
+
+            # Calculate histogram stats (one packed array per histogram)
             histogram_stats = {}
-            for name, values in self.histograms.items():
-                if values:
-                    histogram_stats[f"{name}_avg"] = sum(values) / len(values)
-                    histogram_stats[f"{name}_p95"] = self._percentile(values, 95)
-                    histogram_stats[f"{name}_max"] = max(values)
-
-            # Combine all metrics
-            data = {
-                "last_updated": datetime.now().isoformat(),
-                **self.counters,
-                **self.gauges,
-                **histogram_stats,
-                **self.timestamps
-            }
-
-            # Write to file (atomic)
-            temp_file = self.metrics_file.with_suffix('.tmp')
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
-            temp_file.replace(self.metrics_file)
+            for name, arr in histograms.items():
+                histogram_stats[f"{name}_avg"] = float(arr.mean())
+                histogram_stats[f"{name}_p95"] = self._percentile(arr, 95)
+                histogram_stats[f"{name}_max"] = float(arr.max())
+
+            with self._file_lock:
+                try:
+                    on_disk = read_metrics(self.metrics_file)
+                except (FileNotFoundError, ValueError):
+                    on_disk = {}
+                on_disk.pop("last_updated", None)
+                log_seq = max(on_disk.pop("log_seq", 0), _last_log_seq(self.log_file))
+
+                # Combine all metrics
+                data = {
+                    "last_updated": datetime.now().isoformat(),
+                    "log_seq": log_seq,
+                    **own,
+                    **on_disk,
+                    **self._changed(own),
+                    **histogram_stats,
+                }
+
+                # Write to file (atomic): one pre-encoded payload, one write() call
+                _write_all(self._temp_file, _dumps_metrics(data))
+                os.replace(self._temp_file, self.metrics_file)
+
+                # Entries still in the log are at or below the snapshot's
+                # log_seq, so readers skip them even if we crash before truncating
+                if self._log_fd is not None:
+                    os.ftruncate(self._log_fd, 0)
+                elif self.log_file.exists():
+                    os.truncate(self.log_file, 0)
+                self._log_bytes = 0
+            self._persisted = own
+
+    def _append_changes(self):
+        """Append metrics changed since the last write to the delta log as one line."""
+        with self._flush_lock:
+            counters, gauges, _, timestamps = self._snapshot(with_histograms=False)
+
+            changed = self._changed({**counters, **gauges, **timestamps})
+            if not changed:
+                return
+
+            with self._file_lock:
+                line = _dumps_log_line({
+                    "log_seq": self._next_seq(),
+                    "last_updated": datetime.now().isoformat(),
+                    **changed
+                })
+                if self._log_fd is None:
+                    self._log_fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                _write_fd(self._log_fd, line)
+                # Size includes other processes' entries, so compaction sees them
+                self._log_bytes = os.fstat(self._log_fd).st_size
+            self._persisted.update(changed)
+
+    def _next_seq(self) -> int:
+        """
+        log_seq for a new delta log entry (caller holds _file_lock).
+
+        Read from disk rather than counted per process: another writer may
+        have appended, or compacted to a snapshot with a higher log_seq.
+        """
+        try:
+            snapshot_seq = loads_metrics(self.metrics_file.read_bytes()).get("log_seq", 0)
+        except (FileNotFoundError, ValueError):
+            snapshot_seq = 0
+        return max(snapshot_seq, _last_log_seq(self.log_file)) + 1
+
+    def _persist_deferred(self):
+        """Background write: append a delta line, compacting when the log is large."""
+        if self._log_bytes >= LOG_COMPACT_BYTES or not self.metrics_file.exists():
+            self.flush()
+        else:
+            self._append_changes()
+
+    def request_flush(self):
+        """
+        Ask for metrics to be written soon, without blocking on disk I/O.
+
+        Requests within flush_interval are coalesced into a single append
+        to the delta log on a background thread (compacted into metrics.json
+        once it passes LOG_COMPACT_BYTES). Anything still pending at
+        interpreter exit is written as a full snapshot by flush_pending().
+        """
+        self._dirty.set()
+        if self._flusher is None:
+            with self._flusher_start_lock:
+                if self._flusher is None:
+                    self._flusher = Thread(
+                        target=self._flusher_loop, name="metrics-flusher", daemon=True
+                    )
+                    self._flusher.start()
+                    atexit.register(self.flush_pending)
+
+    def flush_pending(self, timeout: float = 5.0):
+        """Stop the background flusher and write any requested-but-unwritten metrics."""
+        pending = self._dirty.is_set()
+        self._stop.set()
+        if self._flusher is not None:
+            self._dirty.set()  # wake the thread so it sees _stop
+            self._flusher.join(timeout)
+        if pending:
+            self._dirty.clear()
+            self.flush()
+
+    def _flusher_loop(self):
+        """Background thread: one flush per flush_interval while requests arrive."""
+        while not self._stop.is_set():
+            self._dirty.wait()
+            # Let further requests pile up before writing (returns early on stop)
+            if self._stop.wait(self.flush_interval):
+                return
+            self._dirty.clear()
+            try:
+                self._persist_deferred()
+            except OSError:
+                logger.warning("Deferred metrics flush failed; next request will retry", exc_info=True)
 
     def _load_metrics(self):
-        """Load existing metrics from disk."""
+        """Load existing metrics from disk (snapshot plus any newer delta log entries)."""
+        # Any leftover log is truncated by the next compaction
+        if self.log_file.exists():
+            self._log_bytes = self.log_file.stat().st_size
+
         if self.metrics_file.exists():
             try:
-                with open(self.metrics_file, 'r') as f:
-                    data = json.load(f)
+                data = read_metrics(self.metrics_file)
+                data.pop("last_updated", None)
+                data.pop("log_seq", None)
+                self._persisted = data
 
                 # Restore counters and gauges
                 for key, value in data.items():
                     if key.endswith('_total') or key.endswith('_success') or key.endswith('_failed'):
                         self.counters[key] = value
-                    elif key.endswith('_usd') or key.endswith('_pct') or key.endswith('_days'):
+                    elif key.endswith(('_usd', '_pct', '_days', '_epoch')):
                         self.gauges[key] = value
                     elif key.endswith('_last_run'):
                         self.timestamps[key] = value
@@ -120,14 +458,20 @@ class MetricsCollector:
                 pass  # Start fresh if corrupted
 
     @staticmethod
-    def _percentile(values: List[float], percentile: int) -> float:
-        """Calculate percentile of values."""
-        if not values:
+    def _percentile(values, percentile: int) -> float:
+        """Calculate percentile of values (O(n) selection, no full sort)."""
+        arr = np.asarray(values, dtype=np.float64)
+        if arr.size == 0:
             return 0.0
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * (percentile / 100.0))
-        return sorted_values[min(index, len(sorted_values) - 1)]
+        index = min(int(arr.size * (percentile / 100.0)), arr.size - 1)
+        return float(np.partition(arr, index)[index])
+
+
+@functools.lru_cache(maxsize=1)
+def get_metrics() -> MetricsCollector:
+    """Shared application collector (created once; imports are already thread-safe)."""
+    return MetricsCollector()
 
 
-# Global singleton instance
-metrics = MetricsCollector()
+# Global shared instance
+metrics = get_metrics()
@@ -13,43 +13,68 @@ Usage:
         # Show template to user
 """
 
+import functools
 import os
+import re
 from pathlib import Path
-from typing import Tuple, List
+from typing import Tuple
+
+_ENV_PATH = Path(".env")
+
+# Empty or template values for each key (bytes: keys are validated undecoded)
+_API_KEY_PLACEHOLDERS = (b"", b"your_api_key_here")
+_SECRET_KEY_PLACEHOLDERS = (b"", b"your_secret_key_here")
+
+_REQUIRED_ENV_KEYS = ("ALPACA_API_KEY", "ALPACA_SECRET_KEY", "ALPACA_PAPER")
+
+# A line assigning a required key (optional `export`, dotenv style)
+_ENV_KEY_RE = re.compile(
+    r'[ \t]*(?:export[ \t]+)?(' + '|'.join(_REQUIRED_ENV_KEYS) + r')[ \t]*='
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _missing_env_keys(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """Required keys absent from a .env file (mtime_ns/size key the cache so edits invalidate it)"""
+    found = set()
+    with open(path, 'r') as f:
+        # Stream lines and stop as soon as every required key has been seen
+        for line in f:
+            match = _ENV_KEY_RE.match(line)
+            if match:
+                found.add(match.group(1))
+                if len(found) == len(_REQUIRED_ENV_KEYS):
+                    break
+
+    return tuple(key for key in _REQUIRED_ENV_KEYS if key not in found)
 
 
 def check_env_file() -> Tuple[bool, str]:
     """
     Check if .env file exists and has required keys.
 
+    The scan is cached per file version, so repeated UI refreshes only
+    stat the file.
+
     Returns:
         Tuple of (exists: bool, message: str)
     """
-    env_file = Path(".env")
-
-    if not env_file.exists():
+    try:
+        st = _ENV_PATH.stat()
+    except FileNotFoundError:
         return False, ".env file not found. Create it in the root directory."
 
-    # Check for required keys
-    required_keys = ["ALPACA_API_KEY", "ALPACA_SECRET_KEY", "ALPACA_PAPER"]
-    missing_keys: List[str] = []
-
     try:
-        with open(env_file, 'r') as f:
-            content = f.read()
-
-        for key in required_keys:
-            if key not in content or f"{key}=" not in content:
-                missing_keys.append(key)
-
-        if missing_keys:
-            return False, f"Missing required keys: {', '.join(missing_keys)}"
-
-        return True, "All required keys present"
-
+        # Read errors raise out of the cache, so they are retried next call
+        missing_keys = _missing_env_keys(str(_ENV_PATH.resolve()), st.st_mtime_ns, st.st_size)
     except Exception as e:
         return False, f"Error reading .env file: {str(e)}"
 
+    if missing_keys:
+        return False, f"Missing required keys: {', '.join(missing_keys)}"
+
+    return True, "All required keys present"
+
 
 def generate_env_template() -> str:
     """
@@ -85,25 +110,41 @@ def validate_api_key_format(api_key: str, secret_key: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid: bool, message: str)
     """
+    return _validate_bytes(os.fsencode(api_key or ""), os.fsencode(secret_key or ""))
+
+
+def _validate_bytes(api_key: bytes, secret_key: bytes) -> Tuple[bool, str]:
+    """validate_api_key_format on raw bytes (keys are ASCII; each is stripped once)"""
+    # bytes.strip() and len() are only right for ASCII: a pasted U+00A0 or
+    # other Unicode whitespace would slip past them
+    if not api_key.isascii():
+        return False, "API key contains non-ASCII characters"
+
+    if not secret_key.isascii():
+        return False, "Secret key contains non-ASCII characters"
+
+    api_stripped = api_key.strip()
+    secret_stripped = secret_key.strip()
+
     # Check if keys are empty or just placeholders
-    if not api_key or api_key.strip() in ["", "your_api_key_here"]:
+    if api_stripped in _API_KEY_PLACEHOLDERS:
         return False, "API key is empty or contains placeholder text"
 
-    if not secret_key or secret_key.strip() in ["", "your_secret_key_here"]:
+    if secret_stripped in _SECRET_KEY_PLACEHOLDERS:
         return False, "Secret key is empty or contains placeholder text"
 
     # Check minimum length (Alpaca keys are typically 20+ characters)
-    if len(api_key.strip()) < 20:
+    if len(api_stripped) < 20:
         return False, "API key appears too short (should be 20+ characters)"
 
-    if len(secret_key.strip()) < 40:
+    if len(secret_stripped) < 40:
         return False, "Secret key appears too short (should be 40+ characters)"
 
     # Check for whitespace issues
-    if api_key != api_key.strip():
+    if api_key != api_stripped:
         return False, "API key contains leading or trailing whitespace"
 
-    if secret_key != secret_key.strip():
+    if secret_key != secret_stripped:
         return False, "Secret key contains leading or trailing whitespace"
 
     return True, "Format looks correct (connection test required for full validation)"
@@ -124,8 +165,7 @@ def get_setup_progress() -> dict:
     }
 
     # Check if .env exists
-    env_file = Path(".env")
-    progress["env_file_exists"] = env_file.exists()
+    progress["env_file_exists"] = _ENV_PATH.exists()
 
     if not progress["env_file_exists"]:
         progress["message"] = "Step 3: Create .env file"
@@ -141,10 +181,15 @@ def get_setup_progress() -> dict:
 
     # Try to validate key formats
     try:
-        api_key = os.getenv("ALPACA_API_KEY", "")
-        secret_key = os.getenv("ALPACA_SECRET_KEY", "")
-
-        is_valid, validation_msg = validate_api_key_format(api_key, secret_key)
+        # Validate the raw environment bytes (no decode/encode round trip)
+        if os.supports_bytes_environ:
+            api_key = os.environb.get(b"ALPACA_API_KEY", b"")
+            secret_key = os.environb.get(b"ALPACA_SECRET_KEY", b"")
+        else:
+            api_key = os.fsencode(os.getenv("ALPACA_API_KEY", ""))
+            secret_key = os.fsencode(os.getenv("ALPACA_SECRET_KEY", ""))
+
+        is_valid, validation_msg = _validate_bytes(api_key, secret_key)
         progress["keys_format_ok"] = is_valid
         progress["message"] = validation_msg if not is_valid else "Ready to connect"
     except Exception:
@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from health_check import health
+from metrics_collector import read_metrics
 
 # Import error handling and trust indicators
 from error_handler import translate_exception, handle_error_display
@@ -75,8 +76,7 @@ try:
     if not metrics_file.exists():
         st.warning("⚠️ No metrics data available yet. Metrics will appear after the first rebalance operation.")
     else:
-        with open(metrics_file, 'r') as f:
-            metrics_data = json.load(f)
+        metrics_data = read_metrics(metrics_file)
 
         # Last updated
         last_updated = metrics_data.get("last_updated", "Unknown")
@@ -25,8 +25,8 @@ def mock_alpaca_clients(mocker):
     mock_trading = MockTradingClient(api_key='test', secret_key='test', paper=True)
     mock_data = MockDataClient()
 
-    mocker.patch('dalio_lite.TradingClient', return_value=mock_trading)
-    mocker.patch('dalio_lite.StockHistoricalDataClient', return_value=mock_data)
+    mocker.patch('alpaca.trading.client.TradingClient', return_value=mock_trading)
+    mocker.patch('alpaca.data.historical.StockHistoricalDataClient', return_value=mock_data)
 
     return mock_trading, mock_data
 
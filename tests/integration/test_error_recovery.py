@@ -4,7 +4,8 @@ import pytest
 import json
 from pathlib import Path
 from unittest.mock import Mock
-from dalio_lite import DalioLite, OrderStatus, OrderSide
+from alpaca.trading.enums import OrderSide
+from dalio_lite import DalioLite, OrderStatus
 from alpaca.trading.requests import MarketOrderRequest
 from alpaca.trading.enums import OrderSide as AlpacaOrderSide
 
@@ -198,6 +199,29 @@ def test_reconciliation_detects_execution_mismatch(dalio_with_failing_api):
     assert 'failed' in notes.lower() or 'no execution' in notes.lower()
 
 
+@pytest.mark.integration
+def test_batch_quote_failure_falls_back_to_per_order_quotes(dalio_with_failing_api):
+    """Test that orders still execute if the batched quote request fails."""
+    dalio = dalio_with_failing_api
+    per_order_quote = dalio.data_client.get_stock_latest_quote.side_effect
+
+    def mock_quote_batch_fails(request):
+        if len(request.symbol_or_symbols) > 1:
+            raise Exception("503 Service Unavailable")
+        return per_order_quote(request)
+
+    dalio.data_client.get_stock_latest_quote.side_effect = mock_quote_batch_fails
+
+    def mock_submit_order(order_data):
+        order = Mock()
+        order.id = f"order_{order_data.symbol}_success"
+        return order
+
+    dalio.trading_client.submit_order.side_effect = mock_submit_order
+
+    assert dalio.execute_rebalance(dry_run=False) is True
+
+
 @pytest.mark.integration
 def test_exponential_backoff_timing(dalio_with_failing_api, mocker):
     """Test that retry logic uses exponential backoff."""
@@ -2,9 +2,11 @@
 
 import pytest
 import json
+import threading
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
+from alpaca.trading.enums import OrderSide
 from dalio_lite import DalioLite, OrderStatus
 from metrics_collector import metrics
 from transaction_log import TransactionLogger
@@ -182,10 +184,46 @@ def test_full_rebalance_flow_success(dalio_with_mocked_api):
     assert len(backup_files) >= 1, "At least one backup should exist"
 
     # Verify backup checksum exists
-    checksum_files = list(backup_dir.glob("*.sha256"))
+    checksum_files = list(backup_dir.glob("*.digest"))
     assert len(checksum_files) >= 1, "Backup checksums should exist"
 
 
+@pytest.mark.integration
+def test_rebalance_fetches_quotes_in_one_request(dalio_with_mocked_api):
+    """Test that all order quotes come from a single batched request."""
+    dalio = dalio_with_mocked_api
+
+    result = dalio.execute_rebalance(dry_run=False)
+
+    assert result is True
+    quote_calls = dalio.data_client.get_stock_latest_quote.call_args_list
+    assert len(quote_calls) == 1, "Quotes should be fetched once for all orders"
+
+    requested = set(quote_calls[0].args[0].symbol_or_symbols)
+    traded = {c.args[0].symbol for c in dalio.trading_client.submit_order.call_args_list}
+    assert traded <= requested
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize('parallel', [True, False])
+def test_sells_complete_before_buys(dalio_with_mocked_api, parallel):
+    """Test that the buy phase only starts once every sell has been submitted."""
+    dalio = dalio_with_mocked_api
+    dalio.config['rebalancing']['parallel_orders'] = parallel
+
+    assert dalio.execute_rebalance(dry_run=False) is True
+
+    sides = [c.args[0].side for c in dalio.trading_client.submit_order.call_args_list]
+    first_buy = sides.index(OrderSide.BUY)
+    assert OrderSide.SELL in sides
+    assert OrderSide.SELL not in sides[first_buy:]
+
+    # Transaction log keeps the planned order: largest sell first, then largest buy
+    tx_file = next(Path("state/transactions").glob("*.json"))
+    executed = json.loads(tx_file.read_text())['executed_orders']
+    assert [o['ticker'] for o in executed] == ['VTI', 'TLT', 'DBC']
+
+
 @pytest.mark.integration
 def test_rebalance_with_drift_threshold(dalio_with_mocked_api, mocker):
     """Test that rebalance only happens when drift exceeds threshold."""
@@ -352,3 +390,94 @@ def test_transaction_log_contains_all_details(dalio_with_mocked_api):
         assert 'amount_usd' in order
         assert 'status' in order
         assert 'timestamp' in order
+
+
+@pytest.mark.integration
+def test_broker_reads_cached_within_check(dalio_with_mocked_api):
+    """Test that account/positions are fetched once per check, not per step."""
+    dalio = dalio_with_mocked_api
+
+    with dalio._broker_read_cache():
+        dalio.get_current_positions()
+        dalio.calculate_drift()
+        dalio.calculate_rebalance_orders()
+
+    assert dalio.trading_client.get_account.call_count == 1
+    assert dalio.trading_client.get_all_positions.call_count == 1
+
+    # Outside a check every call goes to the broker
+    dalio.get_current_positions()
+    assert dalio.trading_client.get_all_positions.call_count == 2
+
+
+@pytest.mark.integration
+def test_broker_cache_is_per_thread(dalio_with_mocked_api):
+    """Test that one thread's check neither sees nor resets another thread's cache."""
+    dalio = dalio_with_mocked_api
+    entered, done = threading.Event(), threading.Event()
+
+    def other_session():
+        with dalio._broker_read_cache():
+            entered.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    entered.wait(5)
+    try:
+        # The other thread's open check doesn't cache reads made here
+        dalio.get_current_positions()
+        dalio.get_current_positions()
+        assert dalio.trading_client.get_all_positions.call_count == 2
+
+        with dalio._broker_read_cache():
+            dalio.get_current_positions()
+            done.set()
+            thread.join(5)
+            # ...and its exit doesn't turn off the cache this thread is using
+            dalio.get_current_positions()
+        assert dalio.trading_client.get_all_positions.call_count == 3
+    finally:
+        done.set()
+        thread.join(5)
+
+
+@pytest.mark.integration
+def test_daily_check_in_cooldown_skips_position_fetch(dalio_with_mocked_api):
+    """Test that a daily check inside the cooldown doesn't fetch positions."""
+    dalio = dalio_with_mocked_api
+    dalio.last_rebalance = datetime.now() - timedelta(days=1)
+
+    dalio.run_daily_check(dry_run=False)
+
+    dalio.trading_client.get_all_positions.assert_not_called()
+    dalio.trading_client.submit_order.assert_not_called()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize('parallel', [True, False])
+def test_metrics_flush_requested_per_order(dalio_with_mocked_api, mocker, parallel):
+    """Test that each completed order asks for a background metrics write."""
+    dalio = dalio_with_mocked_api
+    dalio.config['rebalancing']['parallel_orders'] = parallel
+    request_flush = mocker.patch.object(metrics, 'request_flush')
+
+    assert dalio.execute_rebalance(dry_run=False) is True
+
+    assert request_flush.call_count == dalio.trading_client.submit_order.call_count
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize('parallel', [True, False])
+def test_transaction_log_keeps_per_order_timestamps(dalio_with_mocked_api, mocker, parallel):
+    """Test that each logged order carries the time its own result was built."""
+    dalio = dalio_with_mocked_api
+    dalio.config['rebalancing']['parallel_orders'] = parallel
+    execute_order = mocker.spy(dalio, '_execute_order')
+
+    assert dalio.execute_rebalance(dry_run=False) is True
+
+    tx_file = next(Path("state/transactions").glob("*.json"))
+    executed = json.loads(tx_file.read_text())['executed_orders']
+    completed = {r.ticker: r.completed_at for r in execute_order.spy_return_list}
+    assert {o['ticker']: o['timestamp'] for o in executed} == completed
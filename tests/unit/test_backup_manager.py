@@ -0,0 +1,168 @@
+"""Unit tests for state file backups."""
+
+import hashlib
+import os
+import pytest
+from datetime import datetime, timedelta
+import backup_manager
+from backup_manager import BackupManager
+
+
+class _Clock(datetime):
+    """datetime whose now() is set by the test (backup names have 1s resolution)."""
+
+    current = datetime(2026, 3, 1, 12, 0, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze backup_manager's clock; advance it by assigning clock.current."""
+    monkeypatch.setattr(backup_manager, "datetime", _Clock)
+    _Clock.current = datetime(2026, 3, 1, 12, 0, 0)
+    return _Clock
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    """State file to back up."""
+    path = tmp_path / "last_rebalance.json"
+    path.write_text('{"last_rebalance": "2026-02-27T10:00:00"}')
+    return path
+
+
+def _backup(manager, state_file, clock, content, seconds):
+    """Write content to the state file and back it up at a given clock offset."""
+    state_file.write_text(content)
+    clock.current = datetime(2026, 3, 1, 12, 0, 0) + timedelta(seconds=seconds)
+    manager.backup_state_file(str(state_file))
+    return manager.backup_dir / f"{state_file.stem}_{clock.current:%Y-%m-%d_%H-%M-%S}.json"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("compress", [False, True])
+def test_backup_verify_restore_round_trip(tmp_path, state_file, clock, compress):
+    """Test that a backup verifies and restores the original bytes."""
+    if compress and backup_manager.zstandard is None:
+        pytest.skip("zstandard not installed")
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"), compress=compress)
+    original = state_file.read_bytes()
+
+    manager.backup_state_file(str(state_file))
+    backups = list(manager._iter_backups(state_file.stem))
+    assert len(backups) == 1
+    backup_path = manager.backup_dir / backups[0].name
+    assert backup_path.name.endswith(".json.zst" if compress else ".json")
+    assert manager._verify_checksum(backup_path)
+
+    state_file.write_text("corrupted")
+    assert manager.restore_from_backup(str(state_file)) is True
+    assert state_file.read_bytes() == original
+
+
+@pytest.mark.unit
+def test_untouched_backup_verifies_without_rehash(mocker, tmp_path, state_file, clock):
+    """Test that the sidecar's size/mtime/inode line skips hashing."""
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"))
+    backup_path = _backup(manager, state_file, clock, '{"v": 1}', 0)
+    file_digest = mocker.spy(backup_manager, "_file_digest")
+
+    assert manager._verify_checksum(backup_path)
+    assert file_digest.call_count == 0
+
+
+@pytest.mark.unit
+def test_legacy_sha256_sidecar_verifies(tmp_path, state_file, clock):
+    """Test that backups with a pre-.digest bare SHA-256 sidecar still verify."""
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"))
+    backup_path = manager.backup_dir / "last_rebalance_2025-01-01_00-00-00.json"
+    backup_path.write_bytes(state_file.read_bytes())
+    digest = hashlib.sha256(backup_path.read_bytes()).hexdigest()
+    backup_path.with_suffix(".json.sha256").write_text(digest)
+
+    assert manager._verify_checksum(backup_path)
+
+    backup_path.with_suffix(".json.sha256").write_text(hashlib.sha256(b"other").hexdigest())
+    assert not manager._verify_checksum(backup_path)
+
+
+@pytest.mark.unit
+def test_modified_backup_fails_verify(tmp_path, state_file, clock):
+    """Test that changed content is caught whether or not the size changes."""
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"))
+    grown = _backup(manager, state_file, clock, '{"v": 1}', 0)
+    same_size = _backup(manager, state_file, clock, '{"v": 2}', 1)
+
+    with open(grown, "a") as f:
+        f.write(" ")
+    assert not manager._verify_checksum(grown)
+
+    # Same length, so only the mtime tells the fast path to rehash
+    st = os.stat(same_size)
+    same_size.write_text('{"v": 9}')
+    os.utime(same_size, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not manager._verify_checksum(same_size)
+    assert manager.restore_from_backup(str(state_file)) is False
+
+
+@pytest.mark.unit
+def test_restore_latest_uses_index_after_cleanup(mocker, tmp_path, state_file, clock):
+    """Test that cleanup prunes expired backups from the index restore reads."""
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"), retention_days=30)
+    expired = _backup(manager, state_file, clock, '{"v": 1}', 0)
+    kept = _backup(manager, state_file, clock, '{"v": 2}', 1)
+    old = (datetime(2026, 3, 1) - timedelta(days=45)).timestamp()
+    os.utime(expired, (old, old))
+
+    _backup(manager, state_file, clock, '{"v": 3}', 2)  # triggers cleanup
+
+    assert not expired.exists()
+    assert not manager._checksum_path(expired).exists()
+    assert kept.exists()
+    index = manager._index_path(state_file.stem).read_text()
+    assert expired.name not in index
+    assert kept.name in index
+
+    iter_backups = mocker.spy(manager, "_iter_backups")
+    state_file.write_text("lost")
+    assert manager.restore_from_backup(str(state_file)) is True
+    assert state_file.read_text() == '{"v": 3}'
+    assert manager.restore_from_backup(str(state_file), "2026-03-01_12-00-01") is True
+    assert state_file.read_text() == '{"v": 2}'
+    assert iter_backups.call_count == 0
+
+    assert manager.restore_from_backup(str(state_file), "2026-03-01_12-00-00") is False
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("existing", [False, True])
+def test_write_atomic_rename_fallback(monkeypatch, tmp_path, existing):
+    """Test the temp file + rename path used when O_TMPFILE is unavailable."""
+    monkeypatch.delattr(os, "O_TMPFILE", raising=False)
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"))
+    target = tmp_path / "sidecar.digest"
+    if existing:
+        target.write_bytes(b"old contents")
+
+    manager._write_atomic(target, b"sha256:abc  file.json\n")
+
+    assert target.read_bytes() == b"sha256:abc  file.json\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["backups", "sidecar.digest"]
+
+
+@pytest.mark.unit
+def test_restore_without_index_picks_latest_by_name(tmp_path, state_file, clock):
+    """Test the directory-scan fallback used when the index is missing."""
+    manager = BackupManager(backup_dir=str(tmp_path / "backups"))
+    for seconds, version in ((5, 2), (0, 1), (9, 3)):
+        _backup(manager, state_file, clock, f'{{"v": {version}}}', seconds)
+    manager._index_path(state_file.stem).unlink()
+
+    state_file.write_text("lost")
+    assert manager.restore_from_backup(str(state_file)) is True
+    assert state_file.read_text() == '{"v": 3}'
+    assert manager.restore_from_backup(str(state_file), "2026-03-01_12-00-05") is True
+    assert state_file.read_text() == '{"v": 2}'
@@ -0,0 +1,31 @@
+"""Unit tests for broker client setup."""
+
+import pytest
+from dalio_lite import DalioLite
+
+
+@pytest.mark.unit
+def test_broker_clients_share_http_session(mocker, mock_env_vars, mock_alpaca_clients):
+    """Test that trading and data clients reuse one HTTP connection pool."""
+    mock_trading, mock_data = mock_alpaca_clients
+    mock_trading._session = object()
+    mock_data._session = object()
+    mocker.patch.object(DalioLite, '_load_last_rebalance_date', return_value=None)
+
+    dalio = DalioLite(config_path='tests/fixtures/config_test.yaml')
+
+    assert dalio.trading_client is mock_trading
+    assert dalio.data_client is mock_data
+    assert mock_trading._session is dalio._http_session
+    assert mock_data._session is dalio._http_session
+
+
+@pytest.mark.unit
+def test_broker_setup_requires_api_keys(mocker, monkeypatch, mock_alpaca_clients):
+    """Test that missing API keys raise a helpful error."""
+    monkeypatch.delenv('ALPACA_API_KEY', raising=False)
+    monkeypatch.delenv('ALPACA_SECRET_KEY', raising=False)
+    mocker.patch.object(DalioLite, '_load_last_rebalance_date', return_value=None)
+
+    with pytest.raises(ValueError, match="API keys not found"):
+        DalioLite(config_path='tests/fixtures/config_test.yaml')
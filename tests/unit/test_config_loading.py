@@ -0,0 +1,41 @@
+"""Unit tests for config loading and caching."""
+
+import os
+import shutil
+import pytest
+from dalio_lite import DalioLite
+
+
+@pytest.fixture
+def mock_dalio(mocker, mock_env_vars):
+    """Create DalioLite instance with mocked broker."""
+    mocker.patch.object(DalioLite, '_setup_broker')
+    mocker.patch.object(DalioLite, '_load_last_rebalance_date', return_value=None)
+    return DalioLite(config_path='tests/fixtures/config_test.yaml')
+
+
+@pytest.mark.unit
+def test_cached_config_is_independent_copy(mock_dalio):
+    """Test that mutating one loaded config doesn't leak into the next load."""
+    config = mock_dalio._load_config('tests/fixtures/config_test.yaml')
+    config['allocation']['VTI'] = 0.99
+
+    reloaded = mock_dalio._load_config('tests/fixtures/config_test.yaml')
+
+    assert reloaded['allocation']['VTI'] == 0.40
+
+
+@pytest.mark.unit
+def test_config_edit_invalidates_cache(mock_dalio, tmp_path):
+    """Test that editing the YAML file is picked up on next load."""
+    config_path = tmp_path / "config.yaml"
+    shutil.copy('tests/fixtures/config_test.yaml', config_path)
+
+    assert mock_dalio._load_config(str(config_path))['rebalancing']['min_trade_usd'] == 100
+
+    text = config_path.read_text().replace('min_trade_usd: 100', 'min_trade_usd: 250')
+    config_path.write_text(text)
+    st = os.stat(config_path)
+    os.utime(config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert mock_dalio._load_config(str(config_path))['rebalancing']['min_trade_usd'] == 250
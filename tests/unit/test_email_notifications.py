@@ -0,0 +1,76 @@
+"""Unit tests for email notifications."""
+
+import pytest
+import send_notification
+from dalio_lite import DalioLite
+
+
+@pytest.fixture
+def email_enabled(tmp_path, monkeypatch):
+    """Enable email notifications with a mocked SMTP server."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".notification_config").write_text(
+        "ENABLE_EMAIL=true\nUSER_EMAIL=investor@example.com\n"
+    )
+    monkeypatch.setenv('NOTIFICATION_PASSWORD', 'app_password')
+
+
+@pytest.mark.unit
+def test_notification_config_defaults_to_disabled(tmp_path, monkeypatch):
+    """Test that a missing config file disables email."""
+    monkeypatch.chdir(tmp_path)
+
+    assert send_notification.load_notification_config() == {"ENABLE_EMAIL": False, "USER_EMAIL": ""}
+
+
+@pytest.mark.unit
+def test_daily_summary_sends_email(mocker, email_enabled):
+    """Test that daily summaries go out over SMTP."""
+    smtp = mocker.patch('send_notification.smtplib.SMTP_SSL')
+
+    send_notification.send_daily_summary("healthy", 10000.0, 1.5, rebalanced=True)
+    send_notification.send_daily_summary("healthy", 10000.0, -0.5, rebalanced=False)
+
+    server = smtp.return_value.__enter__.return_value
+    assert server.send_message.call_count == 2
+    assert server.send_message.call_args_list[0][0][0]['To'] == 'investor@example.com'
+
+
+@pytest.mark.unit
+def test_circuit_breaker_alert_sends_email(mocker, email_enabled):
+    """Test that circuit breaker alerts go out over SMTP."""
+    smtp = mocker.patch('send_notification.smtplib.SMTP_SSL')
+
+    send_notification.send_circuit_breaker_alert("Daily loss exceeded")
+
+    server = smtp.return_value.__enter__.return_value
+    assert "CIRCUIT BREAKER" in server.send_message.call_args[0][0]['Subject']
+
+
+@pytest.mark.unit
+def test_send_email_requires_password(monkeypatch):
+    """Test that email isn't attempted without SMTP credentials."""
+    monkeypatch.delenv('NOTIFICATION_PASSWORD', raising=False)
+
+    assert send_notification.send_email("subject", "body", "investor@example.com") is False
+
+
+@pytest.mark.unit
+def test_notify_email_routes_by_message(mocker, mock_env_vars):
+    """Test that DalioLite picks the right email for each notification."""
+    mocker.patch.object(DalioLite, '_setup_broker')
+    mocker.patch.object(DalioLite, '_load_last_rebalance_date', return_value=None)
+    dalio = DalioLite(config_path='tests/fixtures/config_test.yaml')
+    dalio.config['notifications'] = {'enabled': True, 'method': 'email'}
+
+    account = mocker.Mock(portfolio_value='10000.00', equity='10100.00', last_equity='10000.00')
+    dalio.trading_client = mocker.Mock()
+    dalio.trading_client.get_account.return_value = account
+    summary = mocker.patch('dalio_lite.send_daily_summary')
+    alert = mocker.patch('dalio_lite.send_circuit_breaker_alert')
+
+    dalio._notify("Portfolio rebalanced successfully")
+    dalio._notify("Circuit breaker triggered: daily loss")
+
+    summary.assert_called_once_with("healthy", 10000.0, pytest.approx(1.0), rebalanced=True)
+    alert.assert_called_once()
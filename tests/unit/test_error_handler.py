@@ -146,6 +146,16 @@ class TestErrorTranslation:
         assert severity is not None
 
 
+    def test_fixed_responses_are_shared(self):
+        """Test that constant messages return the same ErrorResponse instance"""
+        first = translate_exception(MockAPIError("Unauthorized", status_code=401))
+        second = translate_exception(MockAPIError("Bad key", status_code=401))
+
+        assert first is second
+        assert first.message.startswith("🔐")
+        assert first.severity == ErrorSeverity.ERROR
+
+
 class TestErrorSeverityLevels:
     """Test that appropriate severity levels are assigned"""
 
@@ -213,3 +223,57 @@ class TestMessageQuality:
 
         # Should mention the error type for tech-savvy users
         assert "RuntimeError" in message or "error type" in message.lower()
+
+
+class TestSilentExecution:
+    """Test the silent execution paths that skip translation"""
+
+    def test_try_execute_returns_result(self):
+        """Test that try_execute passes through a successful result"""
+        assert error_handler.try_execute(lambda: 42, fallback=0) == 42
+
+    def test_try_execute_returns_fallback_on_error(self):
+        """Test that try_execute swallows the error and returns fallback"""
+        assert error_handler.try_execute(lambda: 1 / 0, fallback="n/a") == "n/a"
+
+    def test_safe_execute_silent_skips_translation(self, monkeypatch):
+        """Test that show_error=False never builds a user-facing message"""
+        def fail_translate(*args, **kwargs):
+            raise AssertionError("translate_exception should not be called")
+
+        monkeypatch.setattr(error_handler, "translate_exception", fail_translate)
+
+        result = error_handler.safe_execute(lambda: {}["missing"], fallback={}, show_error=False)
+        assert result == {}
+
+
+class TestErrorDisplay:
+    """Test Streamlit rendering of translated errors"""
+
+    @pytest.mark.parametrize("severity,method,icon", [
+        (ErrorSeverity.INFO, "info", "ℹ️"),
+        (ErrorSeverity.WARNING, "warning", "⚠️"),
+        (ErrorSeverity.ERROR, "error", "❌"),
+        (ErrorSeverity.CRITICAL, "error", "🚨"),
+    ])
+    def test_severity_selects_alert(self, monkeypatch, severity, method, icon):
+        """Test that each severity renders with its Streamlit alert and icon"""
+        from unittest.mock import MagicMock
+        fake_st = MagicMock()
+        monkeypatch.setattr(error_handler, "st", fake_st)
+
+        error_handler.handle_error_display("Something broke", severity)
+
+        getattr(fake_st, method).assert_any_call("Something broke", icon=icon)
+        assert fake_st.sidebar.__enter__.called == (severity == ErrorSeverity.CRITICAL)
+
+    def test_context_rendered_as_caption(self, monkeypatch):
+        """Test that context is shown above the alert, leaving the message untouched"""
+        from unittest.mock import MagicMock
+        fake_st = MagicMock()
+        monkeypatch.setattr(error_handler, "st", fake_st)
+
+        error_handler.handle_error_display("Something broke", ErrorSeverity.WARNING, context="Loading data")
+
+        fake_st.caption.assert_called_once_with("**Context:** Loading data")
+        fake_st.warning.assert_called_once_with("Something broke", icon="⚠️")
@@ -101,6 +101,33 @@ class TestGoalTrackerEdgeCases:
         # With $1500/month for 5 years, should reach goal
         assert projection["on_track"] is True or projection["shortfall"] < 5000
 
+    def test_batch_projection_matches_scalar(self, tmp_path):
+        """Test that the vectorized sweep agrees with calculate_projection"""
+        state_file = tmp_path / "test_goals.json"
+        tracker = GoalTracker(state_file=str(state_file))
+
+        contributions = [0, 250, 1000]
+        returns = [0.0, 0.05, 0.085]
+        batch = tracker.calculate_projection_batch(
+            current_amounts=25000,
+            years=15,
+            target_amounts=500000,
+            monthly_contributions=[[c] for c in contributions],
+            annual_returns=returns
+        )
+
+        for i, contribution in enumerate(contributions):
+            for j, annual_return in enumerate(returns):
+                tracker.goals["assumptions"]["annual_return_rate"] = annual_return
+                scalar = tracker.calculate_projection(
+                    current_amount=25000,
+                    years=15,
+                    target_amount=500000,
+                    monthly_contribution=contribution
+                )
+                for key, value in scalar.items():
+                    assert batch[key][i, j] == pytest.approx(value)
+
 
 class TestGoalManagement:
     """Test goal creation, updates, and persistence"""
@@ -123,6 +150,20 @@ class TestGoalManagement:
         assert goal["years_to_goal"] == 25
         assert "initial_projection" in goal
 
+    def test_unknown_goal_type_becomes_custom(self, tmp_path):
+        """Test that an unrecognized goal type falls back to a custom goal"""
+        state_file = tmp_path / "test_goals.json"
+        tracker = GoalTracker(state_file=str(state_file))
+
+        goal = tracker.set_primary_goal(
+            goal_type="yacht",
+            target_amount=250000,
+            target_year=datetime.now().year + 8
+        )
+
+        assert goal["goal_type"] == GoalType.CUSTOM.value
+        assert goal["goal_name"] == "Financial Goal"
+
     def test_goal_persistence(self, tmp_path):
         """Test that goals are saved and can be reloaded"""
         state_file = tmp_path / "test_goals.json"
@@ -146,6 +187,27 @@ class TestGoalManagement:
         assert all_goals["primary_goal"]["goal_type"] == "house"
         assert all_goals["primary_goal"]["target_amount"] == 500000
 
+    def test_cached_goals_are_independent_copies(self, tmp_path):
+        """Test that mutating one tracker's goals doesn't leak into the next load"""
+        state_file = tmp_path / "test_goals.json"
+        GoalTracker(state_file=str(state_file)).update_assumptions(monthly_contribution=500)
+
+        tracker1 = GoalTracker(state_file=str(state_file))
+        tracker1.goals["assumptions"]["monthly_contribution"] = 9999
+
+        tracker2 = GoalTracker(state_file=str(state_file))
+        assert tracker2.get_assumptions()["monthly_contribution"] == 500
+
+    def test_saved_goals_visible_to_new_tracker(self, tmp_path):
+        """Test that a save invalidates the cached parse of the goals file"""
+        state_file = tmp_path / "test_goals.json"
+        tracker1 = GoalTracker(state_file=str(state_file))
+        tracker1.update_assumptions(monthly_contribution=100)
+        assert GoalTracker(state_file=str(state_file)).get_assumptions()["monthly_contribution"] == 100
+
+        tracker1.update_assumptions(monthly_contribution=200)
+        assert GoalTracker(state_file=str(state_file)).get_assumptions()["monthly_contribution"] == 200
+
     def test_clear_primary_goal(self, tmp_path):
         """Test removing the primary goal"""
         state_file = tmp_path / "test_goals.json"
@@ -214,6 +276,31 @@ class TestGoalProjectionLogic:
         # Status should be positive (on_track, close, or progressing)
         assert progress["status"] in ["on_track", "close", "progressing"]
 
+    def test_repeated_progress_reuses_projection(self, tmp_path):
+        """Test that reruns with the same inputs hit the projection cache"""
+        from goal_tracker import _projection_core
+
+        state_file = tmp_path / "test_goals.json"
+        tracker = GoalTracker(state_file=str(state_file))
+        tracker.set_primary_goal(
+            goal_type="retirement",
+            target_amount=800000,
+            target_year=datetime.now().year + 20,
+            current_amount=40000
+        )
+
+        first = tracker.get_goal_progress(61234.56)
+        hits = _projection_core.cache_info().hits
+        second = tracker.get_goal_progress(61234.56)
+
+        assert _projection_core.cache_info().hits == hits + 1
+        assert second == first
+
+        # Assumptions are part of the key, so a change is never served stale
+        tracker.update_assumptions(monthly_contribution=3000)
+        updated = tracker.get_goal_progress(61234.56)
+        assert updated["projection"]["projected_amount"] > first["projection"]["projected_amount"]
+
     def test_behind_status(self, tmp_path):
         """Test behind status when progress is low"""
         state_file = tmp_path / "test_goals.json"
@@ -0,0 +1,118 @@
+"""Unit tests for health checks."""
+
+import json
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+from health_check import HealthChecker
+
+
+@pytest.fixture
+def metrics_path(tmp_path):
+    """Path for a temporary metrics.json."""
+    return tmp_path / "metrics.json"
+
+
+def _write_metrics(path, **data):
+    path.write_text(json.dumps(data))
+
+
+@pytest.mark.unit
+def test_healthy_metrics(metrics_path):
+    """Test that good metrics report healthy across all checks."""
+    _write_metrics(
+        metrics_path,
+        autopilot_last_run=(datetime.now() - timedelta(hours=3)).isoformat(),
+        rebalance_total=10,
+        rebalance_success=10,
+        api_errors=1,
+        api_calls_total=100,
+        drift_max_pct=4.0,
+        days_since_rebalance=12,
+    )
+
+    status, checks = HealthChecker(metrics_file=str(metrics_path)).check_all()
+
+    assert status == "healthy"
+    assert all(c["status"] == "healthy" for c in checks.values())
+
+
+@pytest.mark.unit
+def test_metrics_read_once_per_check_all(mocker, metrics_path):
+    """Test that all checks share a single read of metrics.json."""
+    _write_metrics(metrics_path, rebalance_total=4, rebalance_success=1, circuit_breaker_triggered=1)
+    read_bytes = mocker.spy(Path, "read_bytes")
+
+    status, checks = HealthChecker(metrics_file=str(metrics_path)).check_all()
+
+    assert read_bytes.call_count == 1
+    assert status == "critical"
+    assert checks["rebalance_success_rate"]["message"] == "Success rate: 25.0% (1/4)"
+
+
+@pytest.mark.unit
+def test_missing_metrics_file(metrics_path):
+    """Test that a missing metrics file degrades every check to a warning."""
+    status, checks = HealthChecker(metrics_file=str(metrics_path)).check_all()
+
+    assert status == "warning"
+    assert checks["autopilot"]["message"] == "No metrics file found"
+    assert checks["drift"]["message"].startswith("Check failed:")
+
+
+@pytest.mark.unit
+def test_slow_check_reported_as_timeout(mocker, metrics_path):
+    """Test that a hung check doesn't stall the report."""
+    import threading
+    import health_check
+
+    _write_metrics(metrics_path, rebalance_total=0)
+    release = threading.Event()
+    mocker.patch.object(health_check, "CHECK_TIMEOUT_SECONDS", 0.2)
+    mocker.patch.object(
+        HealthChecker, "_check_drift",
+        lambda self, data, now: release.wait(5) and {"status": "healthy", "message": ""}
+    )
+
+    try:
+        status, checks = HealthChecker(metrics_file=str(metrics_path)).check_all()
+    finally:
+        release.set()
+
+    assert checks["drift"]["status"] == "warning"
+    assert "timed out" in checks["drift"]["message"]
+    assert checks["circuit_breaker"]["status"] == "healthy"
+    assert list(checks) == [name for name, _ in HealthChecker._CHECKS]
+
+
+@pytest.mark.unit
+def test_autopilot_prefers_epoch_over_iso(metrics_path):
+    """Test that the epoch gauge is used when present, ISO string otherwise."""
+    import time
+
+    _write_metrics(
+        metrics_path,
+        autopilot_last_run=(datetime.now() - timedelta(hours=3)).isoformat(),
+        autopilot_last_run_epoch=time.time() - 50 * 3600,
+    )
+    checks = HealthChecker(metrics_file=str(metrics_path)).check_all()[1]
+    assert checks["autopilot"]["status"] == "critical"
+
+    _write_metrics(
+        metrics_path,
+        autopilot_last_run=(datetime.now() - timedelta(hours=40)).isoformat(),
+    )
+    checks = HealthChecker(metrics_file=str(metrics_path)).check_all()[1]
+    assert checks["autopilot"]["status"] == "warning"
+    assert checks["autopilot"]["message"].startswith("AutoPilot last ran 40.0 hours ago")
+
+
+@pytest.mark.unit
+def test_check_messages_rendered_from_templates(metrics_path):
+    """Test that check_all renders each result's template and args."""
+    _write_metrics(metrics_path, rebalance_total=10, rebalance_success=9, api_errors=20, api_calls_total=100)
+
+    status, checks = HealthChecker(metrics_file=str(metrics_path)).check_all()
+    assert status == "critical"
+    assert checks["api_errors"] == {"status": "critical", "message": "API error rate: 20.0% (20/100)"}
+    assert checks["circuit_breaker"]["message"] == "No circuit breaker activations"
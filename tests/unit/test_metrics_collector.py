@@ -0,0 +1,284 @@
+"""Unit tests for metrics collection."""
+
+import json
+import time
+import pytest
+import metrics_collector
+from metrics_collector import MetricsCollector, HISTOGRAM_SIZE, RingHist, read_metrics
+
+
+@pytest.fixture
+def collector(tmp_path):
+    """Fresh collector writing to a temp file (separate from the shared instance)."""
+    instance = MetricsCollector(metrics_file=str(tmp_path / "metrics.json"))
+    return instance
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("values,expected", [
+    ([], 0.0),
+    ([3.0], 3.0),
+    ([5.0, 1.0, 4.0, 2.0, 3.0], 5.0),
+    (list(range(100, 0, -1)), 96.0),
+])
+def test_percentile_matches_sorted_index(values, expected):
+    """Test that p95 picks the same element as indexing the sorted values."""
+    assert MetricsCollector._percentile(values, 95) == expected
+
+
+@pytest.mark.unit
+def test_histogram_keeps_most_recent_samples(collector):
+    """Test that histograms are capped and evict the oldest samples."""
+    for i in range(HISTOGRAM_SIZE + 250):
+        collector.record_duration("op_seconds", float(i))
+
+    samples = collector.histograms["op_seconds"]
+    assert len(samples) == HISTOGRAM_SIZE
+    assert samples[0] == 250.0
+
+    collector.flush()
+    data = json.loads(collector.metrics_file.read_text())
+    assert data["op_seconds_max"] == float(HISTOGRAM_SIZE + 249)
+
+
+@pytest.mark.unit
+def test_ring_hist_indexes_by_age():
+    """Test that ring buffer indexing is oldest-first before and after wrapping."""
+    hist = RingHist(capacity=4)
+    for v in (1.0, 2.0, 3.0):
+        hist.record(v)
+    assert (hist[0], hist[-1], len(hist)) == (1.0, 3.0, 3)
+
+    for v in (4.0, 5.0, 6.0):
+        hist.record(v)
+    assert [hist[i] for i in range(len(hist))] == [3.0, 4.0, 5.0, 6.0]
+    assert sorted(hist.samples()) == [3.0, 4.0, 5.0, 6.0]
+    with pytest.raises(IndexError):
+        hist[4]
+
+
+@pytest.mark.unit
+def test_concurrent_recording_during_flush(collector):
+    """Test that counters stay exact while other threads flush and record."""
+    import threading
+
+    def produce():
+        for _ in range(1000):
+            collector.increment("events_total")
+            collector.record_duration("op_seconds", 0.01)
+
+    def flush_repeatedly():
+        for _ in range(20):
+            collector.flush()
+
+    threads = [threading.Thread(target=produce) for _ in range(4)]
+    threads.append(threading.Thread(target=flush_repeatedly))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    collector.flush()
+    data = json.loads(collector.metrics_file.read_text())
+    assert data["events_total"] == 4000
+    assert data["op_seconds_max"] == 0.01
+
+
+@pytest.mark.unit
+def test_counter_totals_across_flushes(tmp_path):
+    """Test that unit and bulk increments add onto loaded values without double counting."""
+    metrics_file = tmp_path / "metrics.json"
+    metrics_file.write_text(json.dumps({"rebalance_total": 7}))
+    collector = MetricsCollector(metrics_file=str(metrics_file))
+
+    collector.increment("rebalance_total")
+    collector.increment("rebalance_total", 5)
+    collector.flush()
+    assert json.loads(metrics_file.read_text())["rebalance_total"] == 13
+
+    collector.increment("rebalance_total")
+    collector.flush()
+    collector.flush()
+    assert json.loads(metrics_file.read_text())["rebalance_total"] == 14
+
+
+@pytest.mark.unit
+def test_request_flush_coalesces_writes(mocker, tmp_path):
+    """Test that a burst of flush requests becomes a single background write."""
+    collector = MetricsCollector(metrics_file=str(tmp_path / "metrics.json"), flush_interval=0.2)
+    flush = mocker.spy(collector, "flush")
+
+    for _ in range(50):
+        collector.increment("events_total")
+        collector.request_flush()
+
+    time.sleep(0.6)
+
+    assert flush.call_count == 1
+    assert json.loads(collector.metrics_file.read_text())["events_total"] == 50
+
+
+@pytest.mark.unit
+def test_flush_pending_writes_outstanding_request(tmp_path):
+    """Test that shutdown writes a request the background thread hasn't handled yet."""
+    collector = MetricsCollector(metrics_file=str(tmp_path / "metrics.json"), flush_interval=60)
+
+    collector.increment("events_total")
+    collector.request_flush()
+    collector.flush_pending(timeout=1)
+
+    assert not collector._flusher.is_alive()
+    assert json.loads(collector.metrics_file.read_text())["events_total"] == 1
+
+
+@pytest.mark.unit
+def test_epoch_gauge_survives_reload(tmp_path):
+    """Test that set_epoch values are persisted and restored on startup."""
+    metrics_file = tmp_path / "metrics.json"
+    collector = MetricsCollector(metrics_file=str(metrics_file))
+
+    collector.set_epoch("autopilot_last_run", 1_700_000_000.5)
+    collector.flush()
+
+    reloaded = MetricsCollector(metrics_file=str(metrics_file))
+    assert reloaded.gauges["autopilot_last_run_epoch"] == 1_700_000_000.5
+
+
+@pytest.mark.unit
+def test_deferred_flush_appends_to_delta_log(collector):
+    """Test that deferred writes append changed metrics instead of rewriting the snapshot."""
+    collector.increment("events_total")
+    collector.flush()
+    snapshot = collector.metrics_file.read_bytes()
+
+    collector.increment("events_total")
+    collector.set_gauge("drift_max_pct", 3.5)
+    collector._persist_deferred()
+    collector._persist_deferred()  # nothing changed: no new line
+
+    assert collector.metrics_file.read_bytes() == snapshot
+    lines = collector.log_file.read_bytes().splitlines()
+    assert len(lines) == 1
+    assert set(json.loads(lines[0])) == {"log_seq", "last_updated", "events_total", "drift_max_pct"}
+
+    data = read_metrics(collector.metrics_file)
+    assert data["events_total"] == 2
+    assert data["drift_max_pct"] == 3.5
+
+    reloaded = MetricsCollector(metrics_file=str(collector.metrics_file))
+    assert reloaded.gauges["drift_max_pct"] == 3.5
+
+
+@pytest.mark.unit
+def test_large_delta_log_is_compacted(monkeypatch, collector):
+    """Test that the log is folded into metrics.json and truncated once it grows too big."""
+    monkeypatch.setattr(metrics_collector, "LOG_COMPACT_BYTES", 1)
+    collector.flush()
+
+    collector.increment("events_total")
+    collector._persist_deferred()
+    assert collector.log_file.stat().st_size > 0
+
+    collector.increment("events_total")
+    collector._persist_deferred()
+
+    assert collector.log_file.stat().st_size == 0
+    assert json.loads(collector.metrics_file.read_text())["events_total"] == 2
+
+
+@pytest.mark.unit
+def test_log_entries_older_than_snapshot_are_ignored(tmp_path):
+    """Test that compacted entries (crash before truncate) and torn lines aren't replayed."""
+    metrics_file = tmp_path / "metrics.json"
+    metrics_file.write_text(json.dumps({
+        "last_updated": "2026-11-01T01:30:00", "log_seq": 3, "rebalance_total": 9
+    }))
+    # Entry 5 has an earlier wall-clock stamp (DST fall-back) but is newer by sequence
+    (tmp_path / "metrics.log").write_bytes(
+        b'{"log_seq":3,"last_updated":"2026-11-01T01:20:00","rebalance_total":4}\n'
+        b'{"log_seq":4,"last_updated":"2026-11-01T01:50:00","rebalance_total":10}\n'
+        b'{"log_seq":5,"last_updated":"2026-11-01T01:05:00","rebalance_total":11}\n'
+        b'{"log_seq":6,"last_updat'
+    )
+
+    data = read_metrics(metrics_file)
+    assert data["rebalance_total"] == 11
+    assert data["log_seq"] == 5
+
+
+@pytest.mark.unit
+def test_get_metrics_returns_shared_instance(tmp_path):
+    """Test that the module instance is shared while direct construction is independent."""
+    assert metrics_collector.get_metrics() is metrics_collector.metrics
+    assert MetricsCollector(metrics_file=str(tmp_path / "metrics.json")) is not metrics_collector.metrics
+
+
+@pytest.mark.unit
+def test_timestamps_formatted_at_flush(tmp_path):
+    """Test that raw set_timestamp values are written as local ISO 8601 and loaded ones kept."""
+    from datetime import datetime
+
+    metrics_file = tmp_path / "metrics.json"
+    metrics_file.write_text(json.dumps({"backup_last_run": "2026-01-01T09:30:00"}))
+    collector = MetricsCollector(metrics_file=str(metrics_file))
+
+    collector.set_timestamp("autopilot_last_run")
+    assert isinstance(collector.timestamps["autopilot_last_run"], int)
+    collector.flush()
+
+    data = json.loads(metrics_file.read_text())
+    written = datetime.fromisoformat(data["autopilot_last_run"])
+    assert written.tzinfo is None
+    assert abs((datetime.now() - written).total_seconds()) < 60
+    assert data["backup_last_run"] == "2026-01-01T09:30:00"
+
+
+@pytest.mark.unit
+def test_sequence_continues_after_restart(collector):
+    """Test that a reloaded collector numbers new log entries after the old ones."""
+    collector.flush()
+    collector.increment("events_total")
+    collector._append_changes()
+
+    reloaded = MetricsCollector(metrics_file=str(collector.metrics_file))
+    reloaded.increment("events_total", 5)
+    reloaded._append_changes()
+
+    last = json.loads(collector.log_file.read_bytes().splitlines()[-1])
+    assert last["log_seq"] == 2
+    assert read_metrics(collector.metrics_file)["events_total"] == 6
+
+
+@pytest.mark.unit
+def test_two_writers_share_sequence_and_compaction(tmp_path):
+    """Test that entries from a second writer survive the other's compaction and stay ordered."""
+    metrics_file = tmp_path / "metrics.json"
+    dashboard = MetricsCollector(metrics_file=str(metrics_file))
+    dashboard.set_gauge("drift_max_pct", 1.0)
+    dashboard.flush()
+    autopilot = MetricsCollector(metrics_file=str(metrics_file))
+
+    # The dashboard appends a few entries, so its sequence runs ahead
+    for pct in (2.0, 3.0, 4.0):
+        dashboard.set_gauge("drift_max_pct", pct)
+        dashboard._append_changes()
+    autopilot.set_gauge("portfolio_value_usd", 10_000.0)
+    autopilot._append_changes()
+    assert read_metrics(metrics_file)["portfolio_value_usd"] == 10_000.0
+
+    # Compacting one writer keeps the other's values...
+    dashboard.flush()
+    data = read_metrics(metrics_file)
+    assert data["portfolio_value_usd"] == 10_000.0
+    assert data["drift_max_pct"] == 4.0
+
+    # ...and the other's later entries still sort after the snapshot
+    autopilot.set_gauge("portfolio_value_usd", 10_500.0)
+    autopilot._append_changes()
+    assert json.loads(metrics_file.with_suffix(".log").read_bytes())["log_seq"] > data["log_seq"]
+    assert read_metrics(metrics_file)["portfolio_value_usd"] == 10_500.0
+
+    autopilot.flush()
+    data = read_metrics(metrics_file)
+    assert data["drift_max_pct"] == 4.0
+    assert data["portfolio_value_usd"] == 10_500.0
@@ -0,0 +1,122 @@
+"""Unit tests for onboarding helpers."""
+
+import os
+import pytest
+import onboarding_helpers
+from onboarding_helpers import check_env_file, get_setup_progress, validate_api_key_format
+
+
+VALID_ENV = "ALPACA_API_KEY=abc\nALPACA_SECRET_KEY=def\nALPACA_PAPER=true\n"
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    """Run from a temp directory so .env is isolated."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_missing_env_file(env_dir):
+    """Test that a missing .env is reported."""
+    exists, message = check_env_file()
+
+    assert exists is False
+    assert "not found" in message
+
+
+@pytest.mark.unit
+def test_env_file_with_all_keys(env_dir):
+    """Test that a complete .env passes."""
+    (env_dir / ".env").write_text(VALID_ENV)
+
+    assert check_env_file() == (True, "All required keys present")
+
+
+@pytest.mark.unit
+def test_env_file_missing_keys(env_dir):
+    """Test that missing keys are listed in order."""
+    (env_dir / ".env").write_text("ALPACA_API_KEY=abc\n")
+
+    exists, message = check_env_file()
+
+    assert exists is False
+    assert message == "Missing required keys: ALPACA_SECRET_KEY, ALPACA_PAPER"
+
+
+@pytest.mark.unit
+def test_env_edit_invalidates_cache(env_dir):
+    """Test that editing .env is picked up on the next check."""
+    env_file = env_dir / ".env"
+    env_file.write_text("ALPACA_API_KEY=abc\n")
+    assert check_env_file()[0] is False
+
+    env_file.write_text(VALID_ENV)
+    st = os.stat(env_file)
+    os.utime(env_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert check_env_file()[0] is True
+
+
+@pytest.mark.unit
+def test_unchanged_env_is_not_reread(env_dir):
+    """Test that repeated checks of an unchanged .env reuse the cached scan."""
+    (env_dir / ".env").write_text(VALID_ENV)
+    check_env_file()
+    hits = onboarding_helpers._missing_env_keys.cache_info().hits
+
+    check_env_file()
+
+    assert onboarding_helpers._missing_env_keys.cache_info().hits == hits + 1
+
+
+@pytest.mark.unit
+def test_commented_out_key_counts_as_missing(env_dir):
+    """Test that only real assignments satisfy a required key."""
+    (env_dir / ".env").write_text(
+        "export ALPACA_API_KEY=abc\n"
+        "ALPACA_SECRET_KEY = def\n"
+        "# ALPACA_PAPER=true\n"
+    )
+
+    assert check_env_file() == (False, "Missing required keys: ALPACA_PAPER")
+
+
+@pytest.mark.unit
+def test_scan_stops_once_all_keys_found(env_dir):
+    """Test that the rest of .env is not read after the required keys are seen."""
+    (env_dir / ".env").write_bytes(
+        VALID_ENV.encode() + b"# padding\n" * 10_000 + b"JUNK=\xff\xfe\n"
+    )
+
+    assert check_env_file() == (True, "All required keys present")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("api_key,secret_key,expected", [
+    ("", "s" * 40, "API key is empty or contains placeholder text"),
+    (None, "s" * 40, "API key is empty or contains placeholder text"),
+    ("a" * 20, " your_secret_key_here ", "Secret key is empty or contains placeholder text"),
+    ("a" * 19, "s" * 40, "API key appears too short (should be 20+ characters)"),
+    ("a" * 20, "s" * 39 + " ", "Secret key appears too short (should be 40+ characters)"),
+    (" " + "a" * 20, "s" * 40, "API key contains leading or trailing whitespace"),
+    ("a" * 20 + "\u00a0", "s" * 40, "API key contains non-ASCII characters"),
+    ("a" * 20, "s" * 40 + "\u2003", "Secret key contains non-ASCII characters"),
+])
+def test_invalid_key_formats(api_key, secret_key, expected):
+    """Test each key format rejection message."""
+    assert validate_api_key_format(api_key, secret_key) == (False, expected)
+
+
+@pytest.mark.unit
+def test_setup_progress_reads_keys_from_environment(env_dir, monkeypatch):
+    """Test that setup progress validates the keys set in the environment."""
+    (env_dir / ".env").write_text(VALID_ENV)
+    monkeypatch.setenv("ALPACA_API_KEY", "a" * 20)
+    monkeypatch.setenv("ALPACA_SECRET_KEY", "s" * 40)
+
+    progress = get_setup_progress()
+
+    assert progress["env_file_valid"] is True
+    assert progress["keys_format_ok"] is True
+    assert progress["message"] == "Ready to connect"
@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime, timedelta
+import dalio_lite
 from dalio_lite import DalioLite
 
 
@@ -62,3 +63,26 @@ def test_needs_rebalancing_too_soon_after_last(mock_dalio, mocker):
     assert needs_rebal is False
     assert '10' in reason
     assert ('30' in reason or 'min' in reason.lower())
+
+
+@pytest.mark.unit
+def test_direct_rebalance_flushes_buffered_logs(mock_dalio, mocker):
+    """Test that a dashboard-style direct rebalance writes its log lines out."""
+    mocker.patch.object(DalioLite, '_execute_rebalance_impl', return_value=True)
+    mocker.patch('dalio_lite.metrics.flush')
+    flush_logs = mocker.patch.object(DalioLite, '_flush_logs')
+
+    assert mock_dalio.execute_rebalance(dry_run=True) is True
+    flush_logs.assert_called_once()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("indent", [False, True])
+def test_json_fallback_matches_orjson_bytes(monkeypatch, indent):
+    """Test that state/report bytes don't depend on whether orjson is installed."""
+    pytest.importorskip("orjson")
+    data = {"timestamp": "2026-03-01T12:00:00", "drift": {"VTI": 0.12, "TLT": -0.05}, "note": "✅ ok", "orders": [1, 2]}
+    expected = dalio_lite._json_dumps(data, indent=indent)
+
+    monkeypatch.setattr(dalio_lite, "orjson", None)
+    assert dalio_lite._json_dumps(data, indent=indent) == expected
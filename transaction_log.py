@@ -83,14 +83,31 @@ class TransactionLogger:
             transaction_id: Transaction UUID
             order_result: Result of order execution (dict format)
         """
+        self.record_orders_batch(transaction_id, [order_result])
+
+    def record_orders_batch(
+        self,
+        transaction_id: str,
+        order_results: List[Dict]
+    ):
+        """
+        Record several executed orders with a single log rewrite.
+
+        Args:
+            transaction_id: Transaction UUID
+            order_results: Results of order execution (dict format); a
+                'timestamp' already set on a result is kept
+        """
+        if not order_results:
+            return
+
         entry = self._load_log(transaction_id)
 
-        # Append order result with timestamp
-        order_with_timestamp = {
-            **order_result,
-            'timestamp': datetime.now().isoformat()
-        }
-        entry.executed_orders.append(order_with_timestamp)
+        # Append order results, keeping each order's own completion timestamp
+        timestamp = datetime.now().isoformat()
+        entry.executed_orders.extend(
+            {'timestamp': timestamp, **order_result} for order_result in order_results
+        )
 
         self._save_log(entry)
 